@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+
+"""
+Agendador de Etapas - TransDevs Data Analysis
+
+Este módulo executa as etapas do pipeline de `analysis.py` como um pequeno
+grafo de dependências. Cada etapa recebe como argumentos os resultados das
+etapas das quais depende; etapas independentes (como a leitura e a
+normalização de cada arquivo bruto) rodam ao mesmo tempo em um pool de
+threads ou de processos, e cada etapa é medida por `metricas.executar_medindo`
+(tempo de parede e de CPU, pico de memória e linhas de entrada e de saída).
+Com um `CacheEtapas`, etapas cujas entradas não mudaram são reaproveitadas
+do disco em vez de executadas.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from metricas import executar_medindo, ExecucaoMetricas
+
+logger = logging.getLogger(__name__)
+
+# Tipos de pool aceitos por `executar_grafo`.
+EXECUTORES = {'threads': ThreadPoolExecutor, 'processos': ProcessPoolExecutor}
+
+
+class Etapa:
+    """Uma etapa do pipeline e as etapas das quais ela depende.
+
+    Args:
+        nome (str): Nome único da etapa, usado nas dependências e nos tempos.
+        funcao (callable): Função executada pela etapa. Com o pool de processos,
+                           precisa ser definida no nível do módulo.
+        dependencias (tuple): Nomes das etapas cujos resultados são passados,
+                              nessa ordem, como primeiros argumentos de `funcao`.
+        argumentos (tuple): Argumentos fixos passados depois dos resultados das dependências.
+        cacheavel (bool): Se True, o resultado pode ser reaproveitado do cache.
+        entradas (tuple): Arquivos lidos pela etapa; o conteúdo deles entra na chave do cache.
+        parametros (tuple): Outros valores que entram na chave do cache, como tabelas
+                            de mapeamento ou funções auxiliares (pelo código-fonte).
+        saidas (tuple): Arquivos gravados pela etapa; se mudarem, a entrada do cache
+                        deixa de valer.
+        guardar (bool): Se False, o resultado não é gravado no cache (para resultados
+                        grandes ou sensíveis, como os arquivos brutos); a etapa é
+                        executada de novo se outra etapa precisar dele.
+    """
+
+    def __init__(self, nome: str, funcao, dependencias: tuple = (), argumentos: tuple = (), cacheavel: bool = False,
+                 entradas: tuple = (), parametros: tuple = (), saidas: tuple = (), guardar: bool = True):
+        self.nome = nome
+        self.funcao = funcao
+        self.dependencias = tuple(dependencias)
+        self.argumentos = tuple(argumentos)
+        self.cacheavel = cacheavel
+        self.entradas = tuple(entradas)
+        self.parametros = tuple(parametros)
+        self.saidas = tuple(saidas)
+        self.guardar = guardar
+
+
+def ordenar_etapas(etapas: list) -> list:
+    """Retorna as etapas em uma ordem em que cada uma vem depois das suas dependências."""
+    por_nome = {etapa.nome: etapa for etapa in etapas}
+    for etapa in etapas:
+        faltantes = [d for d in etapa.dependencias if d not in por_nome]
+        if faltantes:
+            raise ValueError(f"Etapa '{etapa.nome}' depende de etapas inexistentes: {faltantes}")
+    ordem, vistas, pendentes = [], set(), list(etapas)
+    while pendentes:
+        prontas = [e for e in pendentes if all(d in vistas for d in e.dependencias)]
+        if not prontas:
+            raise ValueError(f"Dependência circular entre as etapas: {[e.nome for e in pendentes]}")
+        for etapa in prontas:
+            ordem.append(etapa)
+            vistas.add(etapa.nome)
+            pendentes.remove(etapa)
+    return ordem
+
+
+def selecionar_etapas(etapas: list, alvos: tuple) -> list:
+    """Retorna as etapas `alvos` e todas as etapas das quais elas dependem, na ordem original.
+
+    Args:
+        etapas (list): Lista de `Etapa`.
+        alvos (tuple): Nomes das etapas cujo resultado é desejado.
+
+    Returns:
+        list: As etapas necessárias para produzir os alvos.
+    """
+    por_nome = {etapa.nome: etapa for etapa in etapas}
+    faltantes = [alvo for alvo in alvos if alvo not in por_nome]
+    if faltantes:
+        raise ValueError(f"Etapas inexistentes: {faltantes}")
+    necessarias, pendentes = set(), list(alvos)
+    while pendentes:
+        nome = pendentes.pop()
+        if nome not in necessarias and nome in por_nome:
+            necessarias.add(nome)
+            pendentes.extend(por_nome[nome].dependencias)
+    return [etapa for etapa in etapas if etapa.nome in necessarias]
+
+
+def planejar_cache(etapas: list, cache) -> tuple[dict, set, set]:
+    """Decide quais etapas executar e quais reaproveitar do cache.
+
+    Args:
+        etapas (list): Etapas em ordem topológica.
+        cache (CacheEtapas): O cache de etapas.
+
+    Returns:
+        tuple[dict, set, set]: A chave de cada etapa cacheável, os nomes das
+                               etapas a executar e os nomes das etapas cujo
+                               resultado deve ser lido do cache.
+    """
+    por_nome = {etapa.nome: etapa for etapa in etapas}
+    chaves = {}
+    for etapa in etapas:
+        if etapa.cacheavel and all(d in chaves for d in etapa.dependencias):
+            chaves[etapa.nome] = cache.chave(etapa, [chaves[d] for d in etapa.dependencias])
+    # A invalidação forçada de uma etapa se propaga para as que dependem dela.
+    validas, forcadas = set(), set()
+    for etapa in etapas:
+        if cache.invalidada(etapa) or any(d in forcadas for d in etapa.dependencias):
+            forcadas.add(etapa.nome)
+        elif etapa.nome in chaves and cache.valida(etapa, chaves[etapa.nome]):
+            validas.add(etapa.nome)
+
+    # Uma etapa válida cujo resultado não foi guardado precisa ser executada se
+    # alguma etapa executada depender dela.
+    executar = {etapa.nome for etapa in etapas if etapa.nome not in validas}
+    alterou = True
+    while alterou:
+        alterou = False
+        for nome in list(executar):
+            for dependencia in por_nome[nome].dependencias:
+                if dependencia not in executar and not por_nome[dependencia].guardar:
+                    executar.add(dependencia)
+                    alterou = True
+    ler = {d for nome in executar for d in por_nome[nome].dependencias if d not in executar}
+    return chaves, executar, ler
+
+
+def executar_grafo(etapas: list, workers: int = 1, executor: str = 'threads', cache=None,
+                   metricas: ExecucaoMetricas | None = None) -> tuple[dict, dict]:
+    """Executa as etapas respeitando as dependências.
+
+    Uma etapa é enviada ao pool assim que todas as suas dependências terminam.
+    Com `workers=1` as etapas rodam em sequência no próprio processo. Se uma
+    etapa falhar, as etapas ainda não iniciadas são canceladas e a exceção é
+    propagada. Com `cache`, etapas válidas no cache não são executadas e as
+    etapas executadas têm o resultado gravado nele. O resultado de uma etapa
+    da qual outras dependem é descartado assim que todas elas terminam, para
+    que as tabelas intermediárias (como os arquivos brutos) não fiquem na
+    memória até o fim do grafo.
+
+    Args:
+        etapas (list): Lista de `Etapa`.
+        workers (int): Número máximo de etapas executadas ao mesmo tempo.
+        executor (str): 'threads' ou 'processos'.
+        cache (CacheEtapas, optional): Cache de etapas.
+        metricas (ExecucaoMetricas, optional): Registro que recebe as medidas de
+                                               cada etapa executada e as etapas
+                                               reaproveitadas do cache.
+
+    Returns:
+        tuple[dict, dict]: O resultado das etapas finais (das quais nenhuma outra
+                           depende) e o tempo de parede (em segundos) de cada
+                           etapa executada, indexados pelo nome. Etapas
+                           reaproveitadas do cache sem que seu resultado fosse
+                           necessário não aparecem nos resultados.
+    """
+    etapas = ordenar_etapas(etapas)
+    metricas = metricas or ExecucaoMetricas()
+    # Com threads em paralelo, o pico de memória e o tempo de CPU do processo não são só de uma etapa.
+    isolada = workers <= 1 or executor == 'processos'
+    if cache is not None:
+        chaves, executar, ler = planejar_cache(etapas, cache)
+    else:
+        chaves, executar, ler = {}, {etapa.nome for etapa in etapas}, set()
+
+    resultados, tempos = {}, {}
+    for etapa in etapas:
+        if etapa.nome in ler:
+            resultados[etapa.nome] = cache.carregar(etapa, chaves[etapa.nome])
+        if etapa.nome not in executar:
+            metricas.registrar(etapa.nome, {}, origem='cache')
+            logger.info(f"Etapa '{etapa.nome}' reaproveitada do cache")
+    if cache is not None:
+        logger.info(f"Cache de etapas: {len(etapas) - len(executar)} de {len(etapas)} etapas reaproveitadas.")
+
+    # Número de etapas ainda não concluídas que usam o resultado de cada etapa.
+    pendencias = {etapa.nome: 0 for etapa in etapas}
+    for etapa in etapas:
+        if etapa.nome in executar:
+            for dependencia in etapa.dependencias:
+                pendencias[dependencia] += 1
+
+    def argumentos_de(etapa):
+        return tuple(resultados[d] for d in etapa.dependencias) + etapa.argumentos
+
+    def registrar(etapa, resultado, medida):
+        resultados[etapa.nome] = resultado
+        for dependencia in etapa.dependencias:
+            pendencias[dependencia] -= 1
+            if pendencias[dependencia] == 0:
+                resultados.pop(dependencia, None)
+        tempos[etapa.nome] = medida['segundos']
+        metricas.registrar(etapa.nome, medida)
+        if etapa.nome in chaves:
+            cache.gravar(etapa, chaves[etapa.nome], resultado)
+        logger.info(f"Etapa '{etapa.nome}' concluída em {medida['segundos']:.2f}s (CPU: {medida['cpu_s']:.2f}s, "
+                    f"pico de memória: {medida['pico_rss_mb']:.0f} MB)")
+
+    pendentes = [etapa for etapa in etapas if etapa.nome in executar]
+    if workers <= 1:
+        for etapa in pendentes:
+            registrar(etapa, *executar_medindo(etapa.funcao, argumentos_de(etapa), metricas.opcoes(etapa.nome, isolada)))
+        return resultados, tempos
+
+    with EXECUTORES[executor](max_workers=workers) as pool:
+        em_execucao = {}
+        while pendentes or em_execucao:
+            for etapa in [e for e in pendentes if all(d in resultados for d in e.dependencias)]:
+                em_execucao[pool.submit(executar_medindo, etapa.funcao, argumentos_de(etapa), metricas.opcoes(etapa.nome, isolada))] = etapa
+                pendentes.remove(etapa)
+            concluidas, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+            for futuro in concluidas:
+                etapa = em_execucao.pop(futuro)
+                try:
+                    registrar(etapa, *futuro.result())
+                except Exception:
+                    for restante in em_execucao:
+                        restante.cancel()
+                    logger.error(f"Etapa '{etapa.nome}' falhou.")
+                    raise
+    return resultados, tempos
+
+
+def resumir_tempos(tempos: dict, total: float) -> str:
+    """Formata os tempos por etapa e o tempo total para o log."""
+    linhas = [f"  {nome}: {segundos:.2f}s" for nome, segundos in sorted(tempos.items(), key=lambda item: -item[1])]
+    return "\n".join([f"Tempo total: {total:.2f}s (soma das etapas: {sum(tempos.values()):.2f}s)"] + linhas)
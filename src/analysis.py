@@ -13,20 +13,37 @@ Autor: [Seu Nome] & Smith (Mentor)
 Data: 02/10/2025
 """
 
+import argparse
 import logging
+import sys
+import pickle
+import time
 import pandas as pd
 import os
-from datetime import datetime
-import re
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler, OneHotEncoder
-from sklearn.compose import ColumnTransformer
-from sklearn.pipeline import Pipeline
+from datetime import datetime, date
 import numpy as np
+from normalizacao import NormalizadorCategorias, ResolvedorCidades
+from leitura_datas import LeitorDatas
+import leitura_datas
+import incremental
+import normalizacao
+from identidade import chave_pessoa, chave_hash
+from armazenamento import salvar_tabela, salvar_csv, carregar_tabela, existe_tabela, concatenar_tabelas, arquivos_tabela, compactar_tabela, compactar_coluna
+from ingestao import AreaSpill, ler_em_chunks, TAMANHO_CHUNK_PADRAO
+from agendador import Etapa, executar_grafo, selecionar_etapas, resumir_tempos, EXECUTORES
+from cache_etapas import CacheEtapas
+import clustering
+from clustering import (ajustar_modelo_personas, comparar_com_kmeans, matriz_features, varrer_k, escolher_k,
+                        salvar_grafico_cotovelo, ConfiguracaoPersonas, MOTORES_CLUSTERING, K_PADRAO, K_CANDIDATOS_PADRAO)
+import tags
+from tags import ArmazemTags, primeira_tag, arquivos_armazem
+import cubo
+from cubo import montar_cubo, ORDEM_CATEGORIAS
+import crescimento
+from crescimento import MotorCrescimento, ConfiguracaoCrescimento, GRANULARIDADES, JANELA_PADRAO, IDADES_COORTE_PADRAO
+import metricas
+from metricas import ExecucaoMetricas, PERFILADORES
 
-# Configuração do sistema de logging para registrar eventos e erros.
-# As mensagens serão salvas em 'analysis.log' e também exibidas no console.
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S', handlers=[logging.FileHandler("analysis.log", mode='w'), logging.StreamHandler()])
 logger = logging.getLogger(__name__)
 
 # Define o caminho raiz do projeto para localizar os arquivos de dados e relatórios.
@@ -42,21 +59,105 @@ STATES_COORDS_PATH = os.path.join(PROJECT_ROOT, 'data', 'raw', 'brazil_states_co
 
 # Caminhos para os arquivos de dados processados e relatórios.
 PROCESSED_FINAL_PATH = os.path.join(PROJECT_ROOT, 'data', 'processed', 'dados_consolidados_comunidade.csv')
+FATO_INSCRICOES_PATH = os.path.join(PROJECT_ROOT, 'data', 'processed', 'fato_inscricoes.csv')
+DIMENSAO_PESSOAS_PATH = os.path.join(PROJECT_ROOT, 'data', 'processed', 'dim_pessoas.csv')
+CUBO_PATH = os.path.join(PROJECT_ROOT, 'data', 'processed', 'cubo_contagens.csv') # Contagens lidas pelo dashboard.
 PERSONA_SUMMARY_PATH = os.path.join(PROJECT_ROOT, 'reports', 'persona_summary_refinado.csv')
 PERSONA_DETAILS_PATH = os.path.join(PROJECT_ROOT, 'reports', 'persona_details_refinado.csv')
 ATUACAO_COUNT_PATH = os.path.join(PROJECT_ROOT, 'reports', 'atuacao_voluntariado_counts.csv')
-CRESCIMENTO_PATH = os.path.join(PROJECT_ROOT, 'reports', 'crescimento_mensal.csv')
+CRESCIMENTO_PATHS = {g: os.path.join(PROJECT_ROOT, 'reports', f'crescimento_{nome}.csv') for g, nome in GRANULARIDADES.items()}
+CRESCIMENTO_PATH = CRESCIMENTO_PATHS['M'] # Relatório mensal, lido pelo dashboard.
+RETENCAO_PATHS = {g: os.path.join(PROJECT_ROOT, 'reports', f'retencao_coortes_{nome}.csv') for g, nome in GRANULARIDADES.items()}
 CIDADES_PATH = os.path.join(PROJECT_ROOT, 'data', 'raw', 'cities.csv') # Duplicado, manter um.
 MAP_SUMMARY_PATH = os.path.join(PROJECT_ROOT, 'reports', 'mapa_resumo_estados.csv')
+COMPARACAO_CLUSTERING_PATH = os.path.join(PROJECT_ROOT, 'reports', 'comparacao_clustering.csv')
+COTOVELO_PATH = os.path.join(PROJECT_ROOT, 'reports', 'ml_elbow_method.csv')
+COTOVELO_FIGURA_PATH = os.path.join(PROJECT_ROOT, 'reports', 'figures', 'ml_elbow_method.png')
 
+# Estado persistido para o modo incremental (watermark, registros de pessoas e modelo de personas).
+ESTADO_INCREMENTAL_DIR = os.path.join(PROJECT_ROOT, 'data', 'processed', 'incremental')
+MODELO_PERSONAS_PATH = os.path.join(ESTADO_INCREMENTAL_DIR, 'modelo_personas.pkl')
 
-def carregar_dados(caminho_arquivo: str) -> pd.DataFrame:
+# Cache das etapas do pipeline completo.
+CACHE_DIR = os.path.join(PROJECT_ROOT, 'data', 'processed', 'cache')
+
+# Matrizes esparsas de tags (tecnologias, ferramentas e atuação) das linhas do consolidado.
+TAGS_DIR = os.path.join(PROJECT_ROOT, 'data', 'processed', 'tags')
+
+# Matriz de features pré-processada das personas, reaproveitada pela varredura de K.
+MATRIZ_PERSONAS_DIR = os.path.join(CACHE_DIR, 'matriz_personas')
+
+# Diretório temporário com as partes processadas no modo streaming.
+SPILL_DIR = os.path.join(PROJECT_ROOT, 'data', 'processed', 'spill')
+
+# Manifestos, perfis e tabelas acumuladas de medidas de cada execução.
+EXECUCOES_DIR = os.path.join(PROJECT_ROOT, 'data', 'processed', 'execucoes')
+
+# Log das execuções, acrescentado a cada execução.
+LOG_PATH = os.path.join(PROJECT_ROOT, 'analysis.log')
+
+# Colunas numéricas das inscrições brutas; no modo streaming as demais são lidas como texto.
+TIPOS_INSCRICOES = {'computador': 'float64', 'conhecimento': 'float64'}
+
+# Colunas das inscrições brutas que nenhuma etapa usa; com `economizar_memoria`, nem são carregadas.
+COLUNAS_SEM_USO_INSCRICOES = ('id', 'nome_completo', 'nome_primeiro', 'nome_ultimo', 'telefone', 's_link')
+
+# Colunas que descrevem a pessoa, e não uma inscrição específica: as demográficas
+# (criadas por `processar_dados_inscricoes`), as de perfil e as de voluntariado.
+# Com as colunas criadas no merge e a persona, formam a dimensão de pessoas.
+COLUNAS_DEMOGRAFICAS = ['computador_acesso', 'estado_padronizado', 'cidade_padronizada', 'regiao', 'etnia_padronizada', 'genero_padronizado', 'idade', 'faixa_etaria']
+COLUNAS_PERFIL = ['professional_level_padronizado', 'professional_area', 'professional_technologies', 'professional_tools', 'working', 'schooling']
+COLUNAS_VOLUNTARIADO = ['is_volunteer', 'atuacao_principal', 'atuacao']
+COLUNAS_PESSOA = ['person_id', *COLUNAS_DEMOGRAFICAS, *COLUNAS_PERFIL, *COLUNAS_VOLUNTARIADO, 'perfil_aluno', 'persona']
+
+# Features usadas pelo clustering de personas.
+FEATURES_PERSONAS = ['faixa_etaria', 'professional_level_padronizado', 'working', 'idade']
+
+# Etapas finais de cada subcomando da linha de comando; as demais etapas do
+# pipeline completo só são executadas se um desses alvos depender delas.
+COMANDOS = {
+    'tudo': ('crescimento', 'saidas', 'estado_incremental'),
+    'crescimento': ('crescimento',),
+    'normalizar': ('consolidado',),
+    'personas': ('personas',),
+    'mapa': ('mapa',),
+}
+
+
+# Mapa reverso de cidades para estados, usado para validar se uma cidade pertence
+# a um estado específico. Construído uma única vez na importação do módulo.
+CIDADE_MAP_REVERSO = {v.lower(): k for k, v_list in {'SP': ['são paulo', 'sp', 'sao paulo', 'sãopaulo', 'osasco', 'jaú', 'jau', 'itapecerica da serra', 'sumaré', 'suzano', 'campinas', 'guarulhos', 'ribeirão preto', 'ribeirao preto', 'ribeirão preto/sp', 'mauá', 'maua', 'itaquaquetuba', 'presidente prudente', 'sertãozinho', 'vila sônia', 'são bernardo do campo', 'sao bernardo do campo', 'rio claro', 'taubaté', 'atibaia', 'embu das artes', 'embú das artes', 'santo andré', 'santo andre', 'piracicaba', 'votorantim', 'são vicente', 'são caetano do sul', 'ribeirão pires', 'barueri', 'sorocaba', 'bauru', 'mongaguá', 'jundiaí', 'jundiai', 'itupeva', 'santos', 'jales', 'cosmópolis', 'carapicuíba', 'carapicuiba', 'agudos', 'paulínia', 'santo amaro', 'mogi mirim', 'aruja', 'diadema', 'praia grande', 'mairiporã', 'lorena', 'limeira', 'matão', 'guarujá', 'são joão da boa vista', 'araraquara', 'campo limpo paulista', 'várzea paulista', 'francisco morato', 'são josé do rio preto', 'americana', 'marilia', 'ibiporã', 'catanduva', 'piratininga', 'franco da rocha', 'são carlos', 'assis', 'mogi das cruzes', 'santana de parnaíba', 'vargem grande paulista', 'mirassol', 'tuiuti', 'araçatuba', 'itápolis', 'ibiúna', 'itararé', 'campos novos paulista', 'piedade', 'são jose dos campos', 'ituverava', 'indaiatuba', 'pindamonhangaba', 'franca', 'itatiba', 'santa bárbara d’oeste', "santa bárbara d'oeste"], 'RJ': ['rio de janeiro', 'rj', 'eio de janeiro', 'rio de janeieo', 'angra dos reis', 'nova iguaçu', 'cachoeirinhas', 'duque de caxias', 'são joão de meriti', 'resende', 'campos dos goytacazes', 'caompos dos goytacazes', 'nilópolis', 'araruama', 'teresópolis', 'teresopolis', 'barra mansa', 'niterói', 'niteroi', 'rio de janeiro niteroi', 'paracambi', 'rio das pedras', 'belford roxo', 'magé', 'magé - rj', 'três rios', 'maricá', 'marica', 'itaboraí', 'queimados', 'ramos', 'seropédica', 'são gonçalo', 'sao goncalo'], 'MG': ['minas gerais', 'mg', 'minaa gerais', 'bh', 'belo horizonte', 'malacacheta', 'sabará', 'vitória da conquista', 'juiz de fora', 'betim', 'são joão del rei', 'alfenas', 'diamantina', 'nova lima', 'três corações', 'ituiutaba', 'joão monlevade', 'uberlândia', 'uberlandia', 'uberaba', 'vespasiano', 'ponte nova', 'contagem', 'montes claros', 'curvelo', 'divinópolis', 'ipatinga', 'patrocínio', 'brasília de minas', 'lavras', 'itajubá'], 'BA': ['bahia', 'ba', 'salvador', 'senhor do bonfim', 'trancoso', 'porto seguro', 'ilhéus', 'camaçari', 'são francisco do conde', 'barreiro', 'santo antônio de jesus', 'bom jesus da lapa', 'lauro de freitas', 'alagoinhas', 'simões filho', 'juazeiro', 'guanambi', 'feira de santana'], 'CE': ['ceará', 'ce', 'ceara', 'fortaleza', 'maracanaú', 'jaguaruana', 'canindé', 'sobral', 'crateús', 'ipu', 'camocim', 'itapipoca', 'russas', 'caucaia', 'campos sales'], 'PE': ['pernambuco', 'pe', 'recife', 'paulista', 'olinda', 'abreu e lima', 'carpina', 'jaboatão dos guararapes', 'jaboatao dos guararapes', 'camaragibe', 'são lourenço da mata', 'igarassu', 'caruaru', 'petrolina'], 'PR': ['paraná', 'pr', 'parana', 'curitiba', 'guarapuava', 'araucária', 'maringá', 'prudentópolis', 'mandirituba', 'paranaguá', 'piraquara', 'ponta grossa', 'ponta grossa - pr', 'goioerê', 'londrina', 'bandeirantes', 'pinhais', 'sarandi', 'imbituva', 'campo mourão', 'campo mourão / pr', 'cornélio procópio', 'toledo', 'pitanga', 'nova prata do iguaçu', 'laranjeiras do sul'], 'RS': ['rio grande do sul', 'rs', 'porto alegre', 'três passos', 'triunfo', 'sapiranga', 'são leopoldo', 'sao leopoldo', 'canoas', 'santa maria', 'pelotas', 'viamão', 'ijuí', 'guaíba', 'caxias do sul', 'rio grande', 'bage', 'alvorada', 'novo hamburgo', 'esteio', 'sapucaia do sul', 'campo bom', 'passo fundo', 'cacequi', 'coração de maría'], 'SC': ['santa catarina', 'sc', 'florianopolis', 'florianópolis', 'joinville', 'santa luzia', 'brusque', 'capivari de baixo', 'garopaba', 'balneário camburiú', 'são josé', 'tubarão', 'itajai', 'palhoça', 'lages', 'são francisco do sul', 'biguaçu', 'canoinhas', 'navegantes'], 'GO': ['goiás', 'go', 'goias', 'goiânia', 'valparaiso', 'anápolis', 'planaltina', 'águas lindas', 'águas lindas de goiás', 'valparaíso de goiás', 'senador canedo', 'aparecida de goiânia'], 'DF': ['distrito federal', 'df', 'brasília', 'brasilia', 'brasília - df', 'paranoá', 'taguatinga norte', 'cidade ocidental', 'recanto das emas', 'gama'], 'AM': ['amazonas', 'manaus', 'manaus - am'], 'RO': ['rondônia', 'porto velho', 'cacoal'], 'RN': ['rio grande do norte', 'rn', 'natal', 'são gonçalo do amarante', 'mossoró', 'são josé de mipibu', 'parnamirim', 'jucurutu'], 'AL': ['alagoas', 'maceió', 'maceio', 'delmiro gouveia'], 'ES': ['espirito santo', 'esporo santo', 'es', 'vitoria', 'vitória', 'vila velha', 'cariacica', 'serra', 'guarapari', 'viana'], 'PA': ['pará', 'para', 'belém', 'belem', 'ananindeua', 'marabá', 'castanhal', 'augusto corrêa', 'parauapebas'], 'MA': ['maranhão', 'ma', 'são luís', 'sao luis'], 'SE': ['sergipe', 'aracaju'], 'PI': ['piauí', 'piaui', 'teresina', 'parnaíba', 'miguel alves'], 'MS': ['mato grosso do sul', 'ms', 'campo grande', 'dourados'], 'MT': ['mato grosso', 'mt', 'cuiabá', 'várzea grande', 'nova mutum', 'rondonópolis'], 'PB': ['paraíba', 'paraiba', 'joão pessoa', 'joao pessoa', 'campina grande', 'cabedelo', 'mamanguape', 'mamanaguape', 'remígio'], 'AC': ['acre', 'rio branco', 'sena madureira'], 'TO': ['tocantins', 'palmas', 'araguaína'], 'RR': ['roraima', 'boa vista'], 'Internacional': ['internacional', 'portugal', 'lisboa', 'porto', 'espanha', 'oizumi', 'gunma', 'murcia', 'amadora', 'matosinhos']}.items() for v in v_list}
+
+# Lista de "lixo" para filtrar valores inválidos ou genéricos no campo de cidade.
+CIDADES_INVALIDAS = ['Rj', 'Sp', 'Mg', 'Ba', 'Sc', 'Rs', 'Paraná', 'Df', 'Es', 'Ma', 'Mt', 'Rn', 'fasdfasd', 'asfa', 'sdfasd', 'afsdfasdfdsa', 'Prefiro Não Informar', 'Solteiro(A)', 'Solteiro (A)', 'Casado', 'Solteiro', 'Solteira']
+
+# Resolvedor de cidades compartilhado por todas as chamadas de processar_dados_inscricoes.
+RESOLVEDOR_CIDADES = ResolvedorCidades(CIDADE_MAP_REVERSO, CIDADES_INVALIDAS)
+
+# Leitores das colunas de data (formatos misturados), com cache dos textos já lidos.
+LEITOR_NASCIMENTO = LeitorDatas()
+LEITOR_DATA_INSCRICAO = LeitorDatas()
+
+
+def configurar_logging(caminho: str = LOG_PATH):
+    """Configura o logging das execuções do pipeline.
+
+    As mensagens são acrescentadas a `caminho` e também exibidas no console.
+    A configuração é feita pelos pontos de entrada, e não na importação do
+    módulo, para que importar o `analysis` não apague nem crie o log.
+    """
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S',
+                        handlers=[logging.FileHandler(caminho, mode='a', encoding='utf-8'), logging.StreamHandler()])
+
+
+def carregar_dados(caminho_arquivo: str, colunas_descartadas: tuple = ()) -> pd.DataFrame:
     """Carrega dados de um arquivo CSV em um DataFrame do Pandas.
 
     Registra informações sobre o carregamento e manipula erros de arquivo não encontrado.
 
     Args:
         caminho_arquivo (str): O caminho completo para o arquivo CSV.
+        colunas_descartadas (tuple): Colunas que não são lidas do arquivo.
 
     Returns:
         pd.DataFrame: Um DataFrame contendo os dados do arquivo, ou um DataFrame vazio
@@ -67,7 +168,7 @@ def carregar_dados(caminho_arquivo: str) -> pd.DataFrame:
         if not os.path.exists(caminho_arquivo):
             logger.warning(f"Arquivo não encontrado: {caminho_arquivo}")
             return pd.DataFrame()  # Retorna DataFrame vazio se o arquivo não existir
-        df = pd.read_csv(caminho_arquivo)
+        df = pd.read_csv(caminho_arquivo, usecols=(lambda coluna: coluna not in colunas_descartadas) if colunas_descartadas else None)
         logger.info(f"Dados carregados com sucesso. Shape: {df.shape}")
         return df
     except Exception as e:
@@ -89,37 +190,16 @@ def padronizar_categorias(series: pd.Series, mapa_variacoes: dict, padrao: str)
                       ou se o valor for nulo.
 
     Returns:
-        pd.Series: A série com os valores padronizados.
+        pd.Series: A série categórica com os valores padronizados.
     """
-    # Cria um mapa direto de variações para categorias padronizadas.
-    # Ex: {'sao paulo': 'SP', 'sp': 'SP'}
-    mapa_direto = {v: k for k, l in mapa_variacoes.items() for v in l}
-
-    def mapear_valor(valor):
-        """Função interna para mapear um único valor."""
-        if pd.isna(valor):
-            return padrao  # Retorna o padrão para valores nulos
-        
-        # Limpa o texto do valor, removendo caracteres especiais e convertendo para minúsculas.
-        texto_limpo = re.sub(r'\[|\]|"|etnia_|identidade_', '', str(valor).lower().strip())
-        
-        # Tenta encontrar uma correspondência exata no mapa direto.
-        if texto_limpo in mapa_direto:
-            return mapa_direto[texto_limpo]
-        
-        # Se não houver correspondência exata, verifica se a variação está contida no texto limpo.
-        for v, p in mapa_direto.items():
-            if v in texto_limpo:
-                return p
-        
-        # Se nenhuma correspondência for encontrada, retorna o padrão.
-        return padrao
-    
-    # Aplica a função de mapeamento a cada elemento da série.
-    return series.apply(mapear_valor)
+    # Normaliza apenas os valores distintos da série e devolve um Categorical
+    # com o mesmo índice, evitando aplicar uma função Python por linha.
+    resultado = NormalizadorCategorias(mapa_variacoes, padrao)(series)
+    metricas.registrar_normalizacao(series.name, series, resultado, padrao)
+    return resultado
 
 
-def processar_dados_inscricoes(df: pd.DataFrame) -> pd.DataFrame:
+def processar_dados_inscricoes(df: pd.DataFrame, data_referencia: date | None = None, economizar_memoria: bool = False) -> pd.DataFrame:
     """Processa e padroniza os dados de inscrições.
 
     Realiza anonimização de e-mails, cria um ID de pessoa, padroniza
@@ -128,59 +208,35 @@ def processar_dados_inscricoes(df: pd.DataFrame) -> pd.DataFrame:
 
     Args:
         df (pd.DataFrame): DataFrame contendo os dados brutos de inscrições.
+        data_referencia (date, optional): Data em relação à qual a idade é
+                                          calculada (padrão: hoje).
+        economizar_memoria (bool): Se True, as colunas de texto repetitivas saem
+                                   como categorias e as numéricas no menor tipo exato.
 
     Returns:
         pd.DataFrame: DataFrame processado com colunas padronizadas e enriquecidas.
     """
     logger.info("--- Processando Dados de Inscrições ---")
-    df_anon = df.copy()
+    if df.empty:
+        return pd.DataFrame() # Retorna DataFrame vazio se o input for vazio
+    
+    # Cópia rasa: as colunas novas não alteram `df` e as existentes não são duplicadas.
+    df_anon = df.copy(deep=False)
 
-    # Anonimiza o e-mail e gera um 'person_id' único para cada e-mail.
-    df_anon['email'] = df['email'].str.lower().str.strip()
-    df_anon['person_id'] = pd.factorize(df_anon['email'])[0] + 1
+    # Anonimiza o e-mail com a chave de pessoa compartilhada entre as fontes.
+    df_anon['person_id'] = chave_pessoa(df['email'])
 
     # Mapeia valores numéricos de 'computador' para strings descritivas.
     computador_map = {1.0: 'Sim', 0.0: 'Não'}
     df_anon['computador_acesso'] = df_anon['computador'].map(computador_map).fillna('Não Respondeu')
-    
-    # Coluna temporária para processamento da data de nascimento.
-    df_anon['nascdt_temp'] = df['nascdt']
 
     # Define as variações de nomes de estados para padronização.
     estado_variacoes = {'SP': ['são paulo', 'sp'], 'RJ': ['rio de janeiro', 'rj'], 'MG': ['minas gerais', 'mg', 'bh'], 'BA': ['bahia', 'ba'], 'CE': ['ceará', 'ce', 'ceara'], 'PE': ['pernambuco', 'pe'], 'PR': ['paraná', 'pr', 'parana'], 'RS': ['rio grande do sul', 'rs'], 'SC': ['santa catarina', 'sc'], 'GO': ['goiás', 'go', 'goias'], 'DF': ['distrito federal', 'df'], 'AM': ['amazonas'], 'RO': ['rondônia'], 'RN': ['rio grande do norte', 'rn'], 'AL': ['alagoas'], 'ES': ['espirito santo', 'es'], 'PA': ['pará', 'para'], 'MA': ['maranhão', 'ma'], 'SE': ['sergipe'], 'PI': ['piauí', 'piaui'], 'MS': ['mato grosso do sul', 'ms'], 'MT': ['mato grosso', 'mt'], 'PB': ['paraíba', 'paraiba'], 'AC': ['acre'], 'TO': ['tocantins'], 'RR': ['roraima'], 'Internacional': ['portugal', 'lisboa', 'espanha', 'oizumi', 'gunma', 'murcia', 'amadora', 'matosinhos']}
     df_anon['estado_padronizado'] = padronizar_categorias(df_anon['estado'], estado_variacoes, 'Inválido')
 
-    # Define um mapa reverso de cidades para estados para ajudar na padronização da cidade.
-    # Este mapa é usado para validar se uma cidade pertence a um estado específico.
-    cidade_map_reverso = {v.lower(): k for k, v_list in {'SP': ['são paulo', 'sp', 'sao paulo', 'sãopaulo', 'osasco', 'jaú', 'jau', 'itapecerica da serra', 'sumaré', 'suzano', 'campinas', 'guarulhos', 'ribeirão preto', 'ribeirao preto', 'ribeirão preto/sp', 'mauá', 'maua', 'itaquaquetuba', 'presidente prudente', 'sertãozinho', 'vila sônia', 'são bernardo do campo', 'sao bernardo do campo', 'rio claro', 'taubaté', 'atibaia', 'embu das artes', 'embú das artes', 'santo andré', 'santo andre', 'piracicaba', 'votorantim', 'são vicente', 'são caetano do sul', 'ribeirão pires', 'barueri', 'sorocaba', 'bauru', 'mongaguá', 'jundiaí', 'jundiai', 'itupeva', 'santos', 'jales', 'cosmópolis', 'carapicuíba', 'carapicuiba', 'agudos', 'paulínia', 'santo amaro', 'mogi mirim', 'aruja', 'diadema', 'praia grande', 'mairiporã', 'lorena', 'limeira', 'matão', 'guarujá', 'são joão da boa vista', 'araraquara', 'campo limpo paulista', 'várzea paulista', 'francisco morato', 'são josé do rio preto', 'americana', 'marilia', 'ibiporã', 'catanduva', 'piratininga', 'franco da rocha', 'são carlos', 'assis', 'mogi das cruzes', 'santana de parnaíba', 'vargem grande paulista', 'mirassol', 'tuiuti', 'araçatuba', 'itápolis', 'ibiúna', 'itararé', 'campos novos paulista', 'piedade', 'são jose dos campos', 'ituverava', 'indaiatuba', 'pindamonhangaba', 'franca', 'itatiba', 'santa bárbara d’oeste', "santa bárbara d'oeste"], 'RJ': ['rio de janeiro', 'rj', 'eio de janeiro', 'rio de janeieo', 'angra dos reis', 'nova iguaçu', 'cachoeirinhas', 'duque de caxias', 'são joão de meriti', 'resende', 'campos dos goytacazes', 'caompos dos goytacazes', 'nilópolis', 'araruama', 'teresópolis', 'teresopolis', 'barra mansa', 'niterói', 'niteroi', 'rio de janeiro niteroi', 'paracambi', 'rio das pedras', 'belford roxo', 'magé', 'magé - rj', 'três rios', 'maricá', 'marica', 'itaboraí', 'queimados', 'ramos', 'seropédica', 'são gonçalo', 'sao goncalo'], 'MG': ['minas gerais', 'mg', 'minaa gerais', 'bh', 'belo horizonte', 'malacacheta', 'sabará', 'vitória da conquista', 'juiz de fora', 'betim', 'são joão del rei', 'alfenas', 'diamantina', 'nova lima', 'três corações', 'ituiutaba', 'joão monlevade', 'uberlândia', 'uberlandia', 'uberaba', 'vespasiano', 'ponte nova', 'contagem', 'montes claros', 'curvelo', 'divinópolis', 'ipatinga', 'patrocínio', 'brasília de minas', 'lavras', 'itajubá'], 'BA': ['bahia', 'ba', 'salvador', 'senhor do bonfim', 'trancoso', 'porto seguro', 'ilhéus', 'camaçari', 'são francisco do conde', 'barreiro', 'santo antônio de jesus', 'bom jesus da lapa', 'lauro de freitas', 'alagoinhas', 'simões filho', 'juazeiro', 'guanambi', 'feira de santana'], 'CE': ['ceará', 'ce', 'ceara', 'fortaleza', 'maracanaú', 'jaguaruana', 'canindé', 'sobral', 'crateús', 'ipu', 'camocim', 'itapipoca', 'russas', 'caucaia', 'campos sales'], 'PE': ['pernambuco', 'pe', 'recife', 'paulista', 'olinda', 'abreu e lima', 'carpina', 'jaboatão dos guararapes', 'jaboatao dos guararapes', 'camaragibe', 'são lourenço da mata', 'igarassu', 'caruaru', 'petrolina'], 'PR': ['paraná', 'pr', 'parana', 'curitiba', 'guarapuava', 'araucária', 'maringá', 'prudentópolis', 'mandirituba', 'paranaguá', 'piraquara', 'ponta grossa', 'ponta grossa - pr', 'goioerê', 'londrina', 'bandeirantes', 'pinhais', 'sarandi', 'imbituva', 'campo mourão', 'campo mourão / pr', 'cornélio procópio', 'toledo', 'pitanga', 'nova prata do iguaçu', 'laranjeiras do sul'], 'RS': ['rio grande do sul', 'rs', 'porto alegre', 'três passos', 'triunfo', 'sapiranga', 'são leopoldo', 'sao leopoldo', 'canoas', 'santa maria', 'pelotas', 'viamão', 'ijuí', 'guaíba', 'caxias do sul', 'rio grande', 'bage', 'alvorada', 'novo hamburgo', 'esteio', 'sapucaia do sul', 'campo bom', 'passo fundo', 'cacequi', 'coração de maría'], 'SC': ['santa catarina', 'sc', 'florianopolis', 'florianópolis', 'joinville', 'santa luzia', 'brusque', 'capivari de baixo', 'garopaba', 'balneário camburiú', 'são josé', 'tubarão', 'itajai', 'palhoça', 'lages', 'são francisco do sul', 'biguaçu', 'canoinhas', 'navegantes'], 'GO': ['goiás', 'go', 'goias', 'goiânia', 'valparaiso', 'anápolis', 'planaltina', 'águas lindas', 'águas lindas de goiás', 'valparaíso de goiás', 'senador canedo', 'aparecida de goiânia'], 'DF': ['distrito federal', 'df', 'brasília', 'brasilia', 'brasília - df', 'paranoá', 'taguatinga norte', 'cidade ocidental', 'recanto das emas', 'gama'], 'AM': ['amazonas', 'manaus', 'manaus - am'], 'RO': ['rondônia', 'porto velho', 'cacoal'], 'RN': ['rio grande do norte', 'rn', 'natal', 'são gonçalo do amarante', 'mossoró', 'são josé de mipibu', 'parnamirim', 'jucurutu'], 'AL': ['alagoas', 'maceió', 'maceio', 'delmiro gouveia'], 'ES': ['espirito santo', 'esporo santo', 'es', 'vitoria', 'vitória', 'vila velha', 'cariacica', 'serra', 'guarapari', 'viana'], 'PA': ['pará', 'para', 'belém', 'belem', 'ananindeua', 'marabá', 'castanhal', 'augusto corrêa', 'parauapebas'], 'MA': ['maranhão', 'ma', 'são luís', 'sao luis'], 'SE': ['sergipe', 'aracaju'], 'PI': ['piauí', 'piaui', 'teresina', 'parnaíba', 'miguel alves'], 'MS': ['mato grosso do sul', 'ms', 'campo grande', 'dourados'], 'MT': ['mato grosso', 'mt', 'cuiabá', 'várzea grande', 'nova mutum', 'rondonópolis'], 'PB': ['paraíba', 'paraiba', 'joão pessoa', 'joao pessoa', 'campina grande', 'cabedelo', 'mamanguape', 'mamanaguape', 'remígio'], 'AC': ['acre', 'rio branco', 'sena madureira'], 'TO': ['tocantins', 'palmas', 'araguaína'], 'RR': ['roraima', 'boa vista'], 'Internacional': ['internacional', 'portugal', 'lisboa', 'porto', 'espanha', 'oizumi', 'gunma', 'murcia', 'amadora', 'matosinhos']}.items() for v in v_list}
-    
-    def padronizar_cidade_final(row):
-        """Função interna para padronizar o nome da cidade."""
-        cidade_str = row['cidade']
-        estado_sigla = row['estado_padronizado']
-        
-        if pd.isna(cidade_str):
-            return 'Não Informado'
-        
-        # Limpa o nome da cidade.
-        cidade_limpa = re.split(r'/|,|-', str(cidade_str).lower().strip())[0].strip()
-        
-        # Verifica se a cidade limpa está no mapa reverso e se o estado corresponde.
-        if cidade_limpa in cidade_map_reverso:
-            estado_cidade_mapeada = cidade_map_reverso[cidade_limpa]
-            if estado_cidade_mapeada == estado_sigla:
-                return cidade_limpa.title() # Capitaliza a primeira letra
-        
-        # Lista de "lixo" para filtrar valores inválidos ou genéricos.
-        lixo = ['Rj', 'Sp', 'Mg', 'Ba', 'Sc', 'Rs', 'Paraná', 'Df', 'Es', 'Ma', 'Mt', 'Rn', 'fasdfasd', 'asfa', 'sdfasd', 'afsdfasdfdsa', 'Prefiro Não Informar', 'Solteiro(A)', 'Solteiro (A)', 'Casado', 'Solteiro', 'Solteira']
-        
-        # Se a cidade está na lista de lixo ou é apenas dígitos, considera inválida.
-        if cidade_limpa in [l.lower() for l in lixo] or cidade_limpa.isdigit():
-            return 'Inválido'
-        
-        return cidade_limpa.title()
-
-    df_anon['cidade_padronizada'] = df_anon.apply(padronizar_cidade_final, axis=1)
+    # Resolve a cidade sobre os pares distintos (cidade, estado) com o mapa pré-construído.
+    df_anon['cidade_padronizada'] = RESOLVEDOR_CIDADES(df_anon['cidade'], df_anon['estado_padronizado'])
+    metricas.registrar_normalizacao('cidade', df_anon['cidade'], df_anon['cidade_padronizada'], 'Inválido')
 
     # Mapeia estados padronizados para regiões geográficas do Brasil.
     regiao_map = {'AC': 'Norte', 'AP': 'Norte', 'AM': 'Norte', 'PA': 'Norte', 'RO': 'Norte', 'RR': 'Norte', 'TO': 'Norte','AL': 'Nordeste', 'BA': 'Nordeste', 'CE': 'Nordeste', 'MA': 'Nordeste', 'PB': 'Nordeste', 'PE': 'Nordeste', 'PI': 'Nordeste', 'RN': 'Nordeste', 'SE': 'Nordeste','DF': 'Centro-Oeste', 'GO': 'Centro-Oeste', 'MT': 'Centro-Oeste', 'MS': 'Centro-Oeste','ES': 'Sudeste', 'MG': 'Sudeste', 'RJ': 'Sudeste', 'SP': 'Sudeste','PR': 'Sul', 'RS': 'Sul', 'SC': 'Sul'}
@@ -194,23 +250,23 @@ def processar_dados_inscricoes(df: pd.DataFrame) -> pd.DataFrame:
     genero_variacoes = {'Pessoa Trans': ['trans', 'transgenero', 'transsexual', 'transmasculino'], 'Mulher Trans': ['mulher trans'], 'Homem Trans': ['homem trans'], 'Não-Binárie': ['nao binarie', 'nao-binario', 'nao-binarie', 'agênero'], 'Travesti': ['travesti'], 'Cisgênero': ['cis', 'cisgenere', 'homem', 'mulher'], 'Queer': ['queer'], 'Outra identidade': ['outro', 'intersexo'], 'Preferiu não informar': ['nao_sei', 'nao_quero_responder', '[]']}
     df_anon['genero_padronizado'] = padronizar_categorias(df_anon['genero'], genero_variacoes, 'Preferiu não informar')
     
-    # Converte a data de nascimento para datetime, calcula a idade e cria faixas etárias.
-    df_anon['nascdt_dt'] = pd.to_datetime(df_anon['nascdt_temp'], errors='coerce', dayfirst=True)
-    df_anon['idade'] = (datetime.now() - df_anon['nascdt_dt']).dt.days / 365.25
+    # Converte a data de nascimento para datetime, calcula a idade na data de referência e cria faixas etárias.
+    nascimento = LEITOR_NASCIMENTO(df['nascdt'])
+    df_anon['idade'] = (pd.Timestamp(data_referencia or date.today()) - nascimento).dt.days / 365.25
     bins = [0, 17, 24, 34, 44, 54, 64, 150]
-    labels = ['Menor de 18', '18-24 anos', '25-34 anos', '35-44 anos', '45-54 anos', '55-64 anos', '65+ anos']
+    labels = ORDEM_CATEGORIAS['faixa_etaria']
     df_anon['faixa_etaria'] = pd.cut(df_anon['idade'], bins=bins, labels=labels, right=False)
 
     # Define as colunas a serem mantidas e removidas para o DataFrame final.
     # Garante que 'person_id' e as colunas padronizadas sejam mantidas.
-    colunas_a_manter = list(dict.fromkeys([col for col in df.columns] + ['person_id', 'computador_acesso', 'estado_padronizado', 'cidade_padronizada', 'regiao', 'etnia_padronizada', 'genero_padronizado', 'idade', 'faixa_etaria']))
-    colunas_a_remover = ['nascdt_temp', 'nascdt_dt', 'estado', 'etnia', 'genero', 'email', 'id', 'nome_completo', 'nascdt', 'telefone', 'nome_primeiro', 'nome_ultimo', 's_link', 'computador', 'cidade']
+    colunas_a_manter = list(dict.fromkeys([col for col in df.columns] + ['person_id', *COLUNAS_DEMOGRAFICAS]))
+    colunas_a_remover = ['estado', 'etnia', 'genero', 'email', 'nascdt', 'computador', 'cidade', *COLUNAS_SEM_USO_INSCRICOES]
     colunas_a_manter = [col for col in colunas_a_manter if col not in colunas_a_remover]
     
-    return df_anon[colunas_a_manter]
+    return compactar_tabela(df_anon[colunas_a_manter]) if economizar_memoria else df_anon[colunas_a_manter]
 
 
-def processar_dados_perfil(df_profile: pd.DataFrame) -> pd.DataFrame:
+def processar_dados_perfil(df_profile: pd.DataFrame, economizar_memoria: bool = False) -> pd.DataFrame:
     """Processa e padroniza os dados de perfil profissional.
 
     Anonimiza e-mails, gera 'person_id', padroniza o nível profissional
@@ -218,6 +274,7 @@ def processar_dados_perfil(df_profile: pd.DataFrame) -> pd.DataFrame:
 
     Args:
         df_profile (pd.DataFrame): DataFrame contendo os dados brutos de perfil.
+        economizar_memoria (bool): Se True, as colunas de texto repetitivas saem como categorias.
 
     Returns:
         pd.DataFrame: DataFrame processado com nível profissional padronizado.
@@ -226,34 +283,34 @@ def processar_dados_perfil(df_profile: pd.DataFrame) -> pd.DataFrame:
     if df_profile.empty:
         return pd.DataFrame() # Retorna DataFrame vazio se o input for vazio
     
-    df_processado = df_profile.copy()
-    # Anonimiza o e-mail e gera um 'person_id' único.
-    df_processado['email'] = df_processado['email'].str.lower().str.strip()
-    df_processado['person_id'] = pd.factorize(df_processado['email'])[0] + 1
+    df_processado = df_profile.copy(deep=False)
+    # Anonimiza o e-mail com a chave de pessoa compartilhada entre as fontes.
+    df_processado['person_id'] = chave_pessoa(df_processado['email'])
     
     # Define as variações de níveis profissionais para padronização.
     level_variacoes = {'Iniciante': ['iniciante'], 'Estagiário': ['estagiário', 'estagiario'], 'Júnior': ['júnior', 'junior'], 'Pleno': ['pleno'], 'Sênior': ['sênior', 'senior'], 'Especialista': ['especialista'], 'Liderança': ['liderança', 'lideranca', 'c-level'], 'Outro': ['outro']}
     df_processado['professional_level_padronizado'] = padronizar_categorias(df_processado['professional_level'], level_variacoes, 'Não informado')
     
     # Define a ordem categórica para o nível profissional padronizado.
-    ordem_nivel = ['Iniciante', 'Estagiário', 'Júnior', 'Pleno', 'Sênior', 'Especialista', 'Liderança', 'Outro', 'Não informado']
+    ordem_nivel = ORDEM_CATEGORIAS['professional_level_padronizado']
     df_processado['professional_level_padronizado'] = pd.Categorical(df_processado['professional_level_padronizado'], categories=ordem_nivel, ordered=True)
     
     # Seleciona as colunas profissionais a serem mantidas.
-    colunas_profissionais = ['person_id', 'professional_level_padronizado', 'professional_area', 'professional_technologies', 'professional_tools', 'working', 'schooling']
-    colunas_a_manter = [col for col in colunas_profissionais if col in df_processado.columns]
+    colunas_a_manter = [col for col in ['person_id', *COLUNAS_PERFIL] if col in df_processado.columns]
     
-    return df_processado[colunas_a_manter]
+    return compactar_tabela(df_processado[colunas_a_manter]) if economizar_memoria else df_processado[colunas_a_manter]
 
 
-def processar_dados_voluntariado(df_voluntariado: pd.DataFrame) -> pd.DataFrame:
+def processar_dados_voluntariado(df_voluntariado: pd.DataFrame, economizar_memoria: bool = False) -> pd.DataFrame:
     """Processa e padroniza os dados de voluntariado.
 
-    Anonimiza e-mails, gera 'person_id', adiciona uma flag de voluntário,
-    extrai tags de atuação e identifica a atuação principal.
+    Anonimiza e-mails, gera 'person_id', adiciona uma flag de voluntário e
+    identifica a atuação principal. A lista de atuações é mantida como texto
+    categórico; as tags são separadas uma única vez no `ArmazemTags`.
 
     Args:
         df_voluntariado (pd.DataFrame): DataFrame contendo os dados brutos de voluntariado.
+        economizar_memoria (bool): Se True, as colunas de texto repetitivas saem como categorias.
 
     Returns:
         pd.DataFrame: DataFrame processado com informações de voluntariado.
@@ -262,36 +319,42 @@ def processar_dados_voluntariado(df_voluntariado: pd.DataFrame) -> pd.DataFrame:
     if df_voluntariado.empty:
         return pd.DataFrame() # Retorna DataFrame vazio se o input for vazio
     
-    df_processado = df_voluntariado.copy()
-    # Anonimiza o e-mail e gera um 'person_id' único.
-    df_processado['email'] = df_processado['email'].str.lower().str.strip()
-    df_processado['person_id'] = pd.factorize(df_processado['email'])[0] + 1
+    df_processado = df_voluntariado.copy(deep=False)
+    # Anonimiza o e-mail com a chave de pessoa compartilhada entre as fontes.
+    df_processado['person_id'] = chave_pessoa(df_processado['email'])
     
     # Adiciona uma coluna indicando se a pessoa é voluntária.
     df_processado['is_volunteer'] = 'Sim'
     
-    # Limpa e divide a coluna 'atuacao' em tags individuais.
-    df_processado['atuacao_tags'] = df_processado['atuacao'].str.lower().str.replace(r'\[|\]|"', '', regex=True).str.split(',').apply(lambda x: [tag.strip() for tag in x] if isinstance(x, list) else [])
-    
-    # Extrai a primeira tag como atuação principal.
-    df_processado['atuacao_principal'] = df_processado['atuacao_tags'].apply(lambda x: x[0] if x else 'Não informado')
+    # Extrai a primeira tag de atuação como atuação principal (cada texto distinto é separado uma única vez).
+    if 'atuacao' in df_processado.columns:
+        df_processado['atuacao'] = df_processado['atuacao'].astype('category')
+        df_processado['atuacao_principal'] = primeira_tag(df_processado['atuacao'])
     
     # Seleciona as colunas relevantes de voluntariado.
-    colunas_relevantes = ['person_id', 'is_volunteer', 'atuacao_principal', 'atuacao_tags']
-    colunas_a_manter = [col for col in colunas_relevantes if col in df_processado.columns]
+    colunas_a_manter = [col for col in ['person_id', *COLUNAS_VOLUNTARIADO] if col in df_processado.columns]
     
-    return df_processado[colunas_a_manter]
+    return compactar_tabela(df_processado[colunas_a_manter]) if economizar_memoria else df_processado[colunas_a_manter]
 
 
-def descobrir_personas_com_clustering(df: pd.DataFrame) -> pd.DataFrame:
+def descobrir_personas_com_clustering(df: pd.DataFrame, exportar_csv: bool = True,
+                                      config: ConfiguracaoPersonas | None = None, armazem_tags: ArmazemTags | None = None) -> pd.DataFrame:
     """Aplica o algoritmo K-Means para descobrir personas de usuários.
 
     Utiliza as features 'faixa_etaria', 'professional_level_padronizado',
     'working' e 'idade' para agrupar os usuários em 'K_IDEAL' clusters.
+    K_IDEAL é fixo ou escolhido pelo método do cotovelo a partir de uma
+    varredura de candidatos, que também grava a curva do cotovelo.
     Gera relatórios de resumo e detalhes das personas.
 
     Args:
         df (pd.DataFrame): DataFrame consolidado com dados processados.
+        exportar_csv (bool): Se True, também grava os relatórios em CSV.
+        config (ConfiguracaoPersonas, optional): Motor de clustering, K e
+                                                 varredura (padrão: K-Means
+                                                 completo com K_PADRAO).
+        armazem_tags (ArmazemTags, optional): Tags das linhas de `df`, usadas nas
+                                              tecnologias de cada persona.
 
     Returns:
         pd.DataFrame: O DataFrame original com uma nova coluna 'persona'
@@ -299,11 +362,8 @@ def descobrir_personas_com_clustering(df: pd.DataFrame) -> pd.DataFrame:
     """
     logger.info("="*50 + "\n== INICIANDO FASE DE MACHINE LEARNING (FINAL) ==" + "\n" + "="*50)
     
-    # Define as features a serem usadas para o clustering.
-    features = ['faixa_etaria', 'professional_level_padronizado', 'working', 'idade']
-    
     # Cria uma cópia do DataFrame apenas com as linhas que possuem todas as features.
-    df_model = df.dropna(subset=features)
+    df_model = df.dropna(subset=FEATURES_PERSONAS)
     
     # Verifica se há dados suficientes para realizar o clustering.
     if df_model.shape[0] < 10:
@@ -314,80 +374,250 @@ def descobrir_personas_com_clustering(df: pd.DataFrame) -> pd.DataFrame:
     categorical_features = ['faixa_etaria', 'professional_level_padronizado', 'working']
     numerical_features = ['idade']
     
-    # Cria um pré-processador usando ColumnTransformer.
-    # Numéricas: padronizadas com StandardScaler.
-    # Categóricas: transformadas com OneHotEncoder (ignora categorias desconhecidas).
-    preprocessor = ColumnTransformer(
-        transformers=[
-            ('num', StandardScaler(), numerical_features),
-            ('cat', OneHotEncoder(handle_unknown='ignore'), categorical_features)
-        ])
+    config = config or ConfiguracaoPersonas()
+    motor = config.motor
     
-    # Define o número ideal de clusters e inicializa o modelo KMeans.
-    K_IDEAL = 4
-    kmeans_final = KMeans(n_clusters=K_IDEAL, random_state=42, n_init=10) # n_init para maior robustez
+    # Define o número ideal de clusters: fixo ou pelo cotovelo da varredura de K.
+    K_IDEAL = config.k
+    if config.k is None or config.varrer:
+        k_cotovelo = escolher_k_personas(df_model, categorical_features, numerical_features, config, exportar_csv)
+        if config.k is None:
+            K_IDEAL = k_cotovelo
     
-    # Cria um pipeline para pré-processamento e clustering.
-    pipeline_final = Pipeline(steps=[('preprocessor', preprocessor), ('cluster', kmeans_final)])
+    # Ajusta o pipeline (pré-processamento + clustering) com o motor escolhido.
+    logger.info(f"Ajustando {K_IDEAL} personas com o motor '{motor}' ({df_model.shape[0]} amostras)...")
+    pipeline_final, rotulos = ajustar_modelo_personas(df_model, categorical_features, numerical_features, K_IDEAL, motor)
     
-    # Aplica o pipeline aos dados e atribui o cluster (persona) a cada usuário.
+    # Atribui o cluster (persona) a cada usuário.
     # Os IDs de persona são incrementados em 1 para começar de 1, não de 0.
-    df.loc[df_model.index, 'persona'] = pipeline_final.fit_predict(df_model) + 1
+    df.loc[df_model.index, 'persona'] = rotulos + 1
+    
+    # Compara a qualidade do motor com a do K-Means completo nos mesmos dados.
+    if config.comparar and motor != 'kmeans':
+        comparacao = comparar_com_kmeans(df_model, pipeline_final, rotulos, categorical_features, numerical_features, K_IDEAL, motor)
+        salvar_tabela(comparacao, COMPARACAO_CLUSTERING_PATH, exportar_csv)
+        logger.info(f"Comparação com o K-Means completo salva em {COMPARACAO_CLUSTERING_PATH}")
+    
+    # Salva o pipeline ajustado para que execuções incrementais apenas prevejam as personas.
+    os.makedirs(os.path.dirname(MODELO_PERSONAS_PATH), exist_ok=True)
+    with open(MODELO_PERSONAS_PATH, 'wb') as f:
+        pickle.dump(pipeline_final, f)
     
     logger.info("--- Gerando Resumo das Personas ---")
     
-    # Agrupa o DataFrame pelas personas para gerar um resumo estatístico.
-    summary = df.groupby('persona').agg(
-        regiao_moda=('regiao', lambda x: x.mode().get(0, 'N/A')),
-        faixa_etaria_moda=('faixa_etaria', lambda x: x.mode().get(0, 'N/A')),
-        nivel_profissional_moda=('professional_level_padronizado', lambda x: x.mode().get(0, 'N/A')),
-        acesso_computador_moda=('computador_acesso', lambda x: x.mode().get(0, 'N/A')),
-        idade_media=('idade', 'mean'),
-        n_de_pessoas=('persona', 'size')
-    ).reset_index()
-    
-    # Formata as colunas 'persona' e 'idade_media'.
-    summary['persona'] = summary['persona'].astype(int)
-    summary['idade_media'] = summary['idade_media'].round(1)
-    
-    # Salva o resumo das personas em um arquivo CSV.
-    summary.to_csv(PERSONA_SUMMARY_PATH, index=False)
+    # Resume cada persona (modas, idade média e tamanho) e salva em Parquet (e CSV, se habilitado).
+    summary = resumir_personas(df)
+    salvar_tabela(summary, PERSONA_SUMMARY_PATH, exportar_csv)
     logger.info(f"Resumo principal das personas salvo em {PERSONA_SUMMARY_PATH}")
     
-    # Gera detalhes mais aprofundados para cada persona.
-    details_list = []
-    for persona_id in sorted(df['persona'].dropna().unique()):
-        df_persona = df[df['persona'] == persona_id]
-        
-        # Processa e conta as tecnologias mais citadas por cada persona.
-        tech_tags = df_persona['professional_technologies'].dropna().str.lower().str.replace(r'\[|\]|"', '', regex=True).str.split(',').explode()
-        top_3_tech = tech_tags.str.strip().value_counts(normalize=True).nlargest(3) * 100
-        
-        # Constrói o dicionário de detalhes para a persona atual.
-        details = {
-            'persona': int(persona_id),
-            'top_schooling': [f"{idx}: {val:.1f}%" for idx, val in (df_persona['schooling'].value_counts(normalize=True).nlargest(3) * 100).items()],
-            'top_technologies': [f"{idx}: {val:.1f}%" for idx, val in top_3_tech.items()],
-            'level_distribution': [f"{idx}: {val:.1f}%" for idx, val in (df_persona['professional_level_padronizado'].value_counts(normalize=True) * 100).items()]
-        }
-        details_list.append(details)
-    
-    # Converte a lista de detalhes em um DataFrame e salva em CSV.
-    df_details = pd.DataFrame(details_list)
-    df_details.to_csv(PERSONA_DETAILS_PATH, index=False)
+    # Gera detalhes mais aprofundados para cada persona e salva em Parquet (e CSV, se habilitado).
+    df_details = detalhar_personas(df, armazem_tags=armazem_tags)
+    salvar_tabela(df_details, PERSONA_DETAILS_PATH, exportar_csv)
     logger.info(f"Detalhes das personas salvos em {PERSONA_DETAILS_PATH}")
     
     return df
 
 
-def gerar_analise_de_crescimento(df_inscricoes: pd.DataFrame):
-    """Gera uma análise mensal do crescimento da comunidade.
+def contagens_por_persona(personas: pd.Series, valores: pd.Series) -> pd.DataFrame:
+    """Conta os valores de uma coluna em cada persona, em uma única passada pelos códigos categóricos.
+
+    Args:
+        personas (pd.Series): Coluna 'persona' (NaN para linhas sem persona).
+        valores (pd.Series): Coluna contada; se não for categórica, é convertida.
+
+    Returns:
+        pd.DataFrame: Uma linha por persona (em ordem) e uma coluna por
+                      categoria (na ordem das categorias), inclusive as
+                      categorias sem nenhuma ocorrência.
+    """
+    if not isinstance(valores.dtype, pd.CategoricalDtype):
+        valores = valores.astype('category')
+    ids = np.sort(personas.dropna().unique())
+    linhas = np.searchsorted(ids, personas.to_numpy())
+    codigos = valores.cat.codes.to_numpy()
+    validas = personas.notna().to_numpy() & (codigos >= 0)
+    n_categorias = len(valores.cat.categories)
+    contagens = np.bincount(linhas[validas] * n_categorias + codigos[validas], minlength=len(ids) * n_categorias)
+    return pd.DataFrame(contagens.reshape(len(ids), n_categorias), index=ids, columns=valores.cat.categories)
+
+
+def _primeiras_ocorrencias_por_persona(personas: pd.Series, valores: pd.Series) -> np.ndarray:
+    """Posição da primeira linha de cada valor em cada persona, no formato de `contagens_por_persona`.
+
+    Serve para desempatar valores com a mesma contagem na ordem em que
+    aparecem, como o `value_counts` de uma coluna não categórica.
+
+    Args:
+        personas (pd.Series): Coluna 'persona' (NaN para linhas sem persona).
+        valores (pd.Series): Coluna contada; se não for categórica, é convertida.
+
+    Returns:
+        np.ndarray: Uma linha por persona e uma coluna por categoria, com a
+                    posição da primeira ocorrência (o número de linhas se não houver).
+    """
+    if not isinstance(valores.dtype, pd.CategoricalDtype):
+        valores = valores.astype('category')
+    ids = np.sort(personas.dropna().unique())
+    linhas = np.searchsorted(ids, personas.to_numpy())
+    codigos = valores.cat.codes.to_numpy()
+    validas = personas.notna().to_numpy() & (codigos >= 0)
+    primeiras = np.full((len(ids), len(valores.cat.categories)), len(valores), dtype=np.int64)
+    np.minimum.at(primeiras, (linhas[validas], codigos[validas]), np.flatnonzero(validas))
+    return primeiras
+
+
+def _moda_por_persona(contagens: pd.DataFrame) -> np.ndarray:
+    """Moda de cada linha de `contagens` ('N/A' sem ocorrências); empates ficam com a primeira categoria."""
+    valores = contagens.to_numpy()
+    modas = contagens.columns.to_numpy()[valores.argmax(axis=1)]
+    return np.where(valores.sum(axis=1) > 0, modas, 'N/A')
+
+
+def _distribuicao_por_persona(contagens: pd.DataFrame, top: int | None = None, omitir_zeros: bool = False,
+                              desempate: np.ndarray | None = None) -> list:
+    """Formata as participações de cada categoria por persona, da maior para a menor.
+
+    Empates seguem `desempate` (menor primeiro), se informado, ou a ordem das
+    colunas (a das categorias, como em `value_counts` de uma coluna categórica,
+    ou a alfabética das tags). Com `omitir_zeros`, colunas sem ocorrências na
+    persona não são listadas.
+    """
+    valores = contagens.to_numpy()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        percentuais = valores / valores.sum(axis=1, keepdims=True) * 100
+    if desempate is None:
+        ordem = np.argsort(-valores, axis=1, kind='stable')[:, :top]
+    else:
+        ordem = np.lexsort((desempate, -valores), axis=1)[:, :top]
+    nomes = contagens.columns.to_numpy()
+    return [[f"{nomes[j]}: {percentuais[i, j]:.1f}%" for j in ordem_persona if valores[i, j] > 0 or not omitir_zeros]
+            for i, ordem_persona in enumerate(ordem)]
+
+
+def resumir_personas(df: pd.DataFrame) -> pd.DataFrame:
+    """Resume cada persona: modas de região, faixa etária, nível e acesso a computador, idade média e tamanho.
+
+    Args:
+        df (pd.DataFrame): DataFrame consolidado com a coluna 'persona'.
+
+    Returns:
+        pd.DataFrame: Uma linha por persona, em ordem.
+    """
+    modas = {'regiao_moda': 'regiao', 'faixa_etaria_moda': 'faixa_etaria',
+             'nivel_profissional_moda': 'professional_level_padronizado', 'acesso_computador_moda': 'computador_acesso'}
+    summary = pd.DataFrame({nome: _moda_por_persona(contagens_por_persona(df['persona'], df[coluna])) for nome, coluna in modas.items()})
+    por_persona = df.groupby('persona')
+    summary.insert(0, 'persona', por_persona.size().index.astype(int))
+    summary['idade_media'] = por_persona['idade'].mean().round(1).to_numpy()
+    summary['n_de_pessoas'] = por_persona.size().to_numpy()
+    return summary
+
+
+def detalhar_personas(df: pd.DataFrame, top: int = 3, armazem_tags: ArmazemTags | None = None) -> pd.DataFrame:
+    """Monta os detalhes de cada persona: escolaridade e tecnologias mais frequentes e distribuição de nível.
+
+    Escolaridades e tecnologias sem ocorrências na persona não são listadas.
+    Empates entre escolaridades seguem a ordem de aparição nas linhas da
+    persona; entre tecnologias, a ordem alfabética das tags; a distribuição de
+    nível lista todos os níveis, na ordem de `cubo.ORDEM_CATEGORIAS`.
+
+    Args:
+        df (pd.DataFrame): DataFrame consolidado com a coluna 'persona'.
+        top (int): Número de escolaridades e tecnologias listadas por persona.
+        armazem_tags (ArmazemTags, optional): Tags das linhas de `df`; se ausente,
+                                              é montado a partir de `df`.
+
+    Returns:
+        pd.DataFrame: Uma linha por persona, em ordem, com listas de textos
+                      "valor: xx.x%".
+    """
+    niveis = contagens_por_persona(df['persona'], df['professional_level_padronizado'])
+    details = pd.DataFrame({
+        'persona': niveis.index.astype(int),
+        # Só as escolaridades presentes na persona, com empates na ordem de aparição (como no `value_counts`).
+        'top_schooling': _distribuicao_por_persona(contagens_por_persona(df['persona'], df['schooling']), top, omitir_zeros=True,
+                                                   desempate=_primeiras_ocorrencias_por_persona(df['persona'], df['schooling'])),
+    })
+    
+    # As tecnologias mais citadas vêm da soma das linhas de cada persona na matriz de tags.
+    armazem_tags = armazem_tags or ArmazemTags.de_tabela(df, ('professional_technologies',))
+    tecnologias = armazem_tags.somar_por_grupo('professional_technologies', df['persona']).reindex(niveis.index, fill_value=0)
+    details['top_technologies'] = _distribuicao_por_persona(tecnologias, top, omitir_zeros=True)
+    
+    details['level_distribution'] = _distribuicao_por_persona(niveis)
+    return details
+
+
+def escolher_k_personas(df_model: pd.DataFrame, categorical_features: list, numerical_features: list,
+                        config: ConfiguracaoPersonas, exportar_csv: bool = True) -> int:
+    """Varre os candidatos de K e grava os dados e o gráfico do cotovelo.
+
+    A matriz de features é pré-processada uma única vez (e reaproveitada
+    entre execuções enquanto as features não mudam) e os candidatos são
+    ajustados em paralelo.
+
+    Args:
+        df_model (pd.DataFrame): Linhas com todas as features preenchidas.
+        categorical_features (list): Nomes das features categóricas.
+        numerical_features (list): Nomes das features numéricas.
+        config (ConfiguracaoPersonas): Candidatos de K e número de processos.
+        exportar_csv (bool): Se True, também grava os dados do cotovelo em CSV.
+
+    Returns:
+        int: O K escolhido pelo método do cotovelo, ou K_PADRAO se nenhum
+             candidato couber no número de linhas (nesse caso o cotovelo não é gravado).
+    """
+    candidatos = [k for k in config.candidatos if 2 <= k < df_model.shape[0]]
+    if not candidatos:
+        logger.warning(f"Nenhum candidato de K entre 2 e {df_model.shape[0] - 1} (número de linhas - 1) em {list(config.candidatos)}; "
+                       f"usando K = {K_PADRAO} sem varredura.")
+        return K_PADRAO
+    _, caminho_matriz = matriz_features(df_model, categorical_features, numerical_features, MATRIZ_PERSONAS_DIR)
+    varredura = varrer_k(caminho_matriz, candidatos, config.workers)
+    k_cotovelo = escolher_k(varredura)
+    varredura['escolhido'] = varredura['k'] == k_cotovelo
+    logger.info("Varredura de K:\n" + varredura.to_string(index=False))
+    logger.info(f"K escolhido pelo método do cotovelo: {k_cotovelo}")
+    
+    salvar_tabela(varredura, COTOVELO_PATH, exportar_csv)
+    salvar_grafico_cotovelo(varredura, k_cotovelo, COTOVELO_FIGURA_PATH)
+    logger.info(f"Dados e gráfico do cotovelo salvos em {COTOVELO_PATH} e {COTOVELO_FIGURA_PATH}")
+    return k_cotovelo
+
+
+def atribuir_personas(df: pd.DataFrame) -> pd.DataFrame:
+    """Atribui personas usando o modelo salvo pela última execução completa.
+
+    Args:
+        df (pd.DataFrame): DataFrame consolidado com as features das personas.
+
+    Returns:
+        pd.DataFrame: O DataFrame com a coluna 'persona' preenchida para as
+                      linhas que possuem todas as features.
+    """
+    df['persona'] = np.nan
+    if not os.path.exists(MODELO_PERSONAS_PATH):
+        logger.warning("Modelo de personas não encontrado. Personas não atribuídas.")
+        return df
+    with open(MODELO_PERSONAS_PATH, 'rb') as f:
+        pipeline_final = pickle.load(f)
+    df_model = df.dropna(subset=[c for c in FEATURES_PERSONAS if c in df.columns])
+    if not df_model.empty and all(c in df.columns for c in FEATURES_PERSONAS):
+        df.loc[df_model.index, 'persona'] = pipeline_final.predict(df_model) + 1
+    return df
+
+
+def gerar_analise_de_crescimento(df_inscricoes: pd.DataFrame, exportar_csv: bool = True, config: ConfiguracaoCrescimento | None = None):
+    """Gera as análises de crescimento da comunidade.
 
-    Calcula o número de novas pessoas que se inscreveram a cada mês
-    e o total acumulado de pessoas na comunidade.
+    Monta o motor de crescimento com a data de cada inscrição válida, grava o
+    estado dele para o modo incremental e salva os relatórios de crescimento
+    e de retenção por coorte.
 
     Args:
         df_inscricoes (pd.DataFrame): DataFrame contendo os dados brutos de inscrições.
+        exportar_csv (bool): Se True, também grava os relatórios em CSV.
+        config (ConfiguracaoCrescimento, optional): Granularidades, janela móvel e idades das coortes.
     """
     logger.info("--- Gerando Análise de Crescimento da Comunidade ---")
     
@@ -396,113 +626,875 @@ def gerar_analise_de_crescimento(df_inscricoes: pd.DataFrame):
         logger.warning("DataFrame de inscrições vazio ou sem coluna 'data'. Análise de crescimento pulada.")
         return
     
-    df_growth = df_inscricoes[['email', 'data']].copy()
-    
-    # Anonimiza o e-mail e gera um 'person_id' único.
-    df_growth['email'] = df_growth['email'].str.lower().str.strip()
-    df_growth['person_id'] = pd.factorize(df_growth['email'])[0] + 1
-    
-    # Converte a coluna 'data' para formato datetime e remove linhas com datas inválidas.
-    df_growth['data_inscricao'] = pd.to_datetime(df_growth['data'], errors='coerce')
-    df_growth = df_growth.dropna(subset=['data_inscricao'])
+    # Anonimiza o e-mail com a chave de pessoa compartilhada entre as fontes;
+    # datas inválidas são descartadas pelo motor.
+    motor = MotorCrescimento.de_eventos(chave_pessoa(df_inscricoes['email']), LEITOR_DATA_INSCRICAO(df_inscricoes['data']))
+    motor.salvar(ESTADO_INCREMENTAL_DIR)
+    salvar_analise_de_crescimento(motor, exportar_csv, config)
+
+
+def salvar_analise_de_crescimento(motor: MotorCrescimento, exportar_csv: bool = True, config: ConfiguracaoCrescimento | None = None):
+    """Salva os relatórios de crescimento e de retenção de cada granularidade.
+
+    Args:
+        motor (MotorCrescimento): Pares pessoa × dia de todas as inscrições válidas.
+        exportar_csv (bool): Se True, também grava os relatórios em CSV.
+        config (ConfiguracaoCrescimento, optional): Granularidades, janela móvel e idades das coortes.
+    """
+    config = config or ConfiguracaoCrescimento()
+    for granularidade in config.granularidades:
+        # Novas pessoas, total acumulado, pessoas que retornam e janelas móveis por período.
+        salvar_tabela(motor.crescimento(granularidade, config.janela), CRESCIMENTO_PATHS[granularidade], exportar_csv)
+        # Fração de cada coorte de entrada ativa nos períodos seguintes.
+        salvar_tabela(motor.retencao(granularidade, config.idades_coorte), RETENCAO_PATHS[granularidade], exportar_csv)
+        logger.info(f"Análise de crescimento ({GRANULARIDADES[granularidade]}) salva em: {CRESCIMENTO_PATHS[granularidade]}")
+
+
+def arquivos_crescimento(config: ConfiguracaoCrescimento | None = None, exportar_csv: bool = True) -> list:
+    """Lista os arquivos gravados por `gerar_analise_de_crescimento`."""
+    config = config or ConfiguracaoCrescimento()
+    relatorios = [caminho for g in config.granularidades for caminho in (CRESCIMENTO_PATHS[g], RETENCAO_PATHS[g])]
+    arquivos = [c for relatorio in relatorios for c in arquivos_tabela(relatorio, exportar_csv)]
+    return arquivos + [os.path.join(ESTADO_INCREMENTAL_DIR, crescimento.ARQUIVO_ATIVIDADE)]
+
+
+def consolidar_dados(df_demografico: pd.DataFrame, df_profissional: pd.DataFrame, df_voluntario: pd.DataFrame,
+                     economizar_memoria: bool = False) -> pd.DataFrame:
+    """Mescla os dados demográficos, profissionais e de voluntariado.
+
+    Os merges com perfil e voluntariado são 'left merges' para manter todas as
+    inscrições, feitos contra as fontes indexadas e ordenadas por 'person_id'
+    (a ordem das linhas de uma mesma pessoa é preservada). Também preenche a flag de voluntariado e identifica alunos
+    matriculados a partir de 'turma_slug'.
+
+    Args:
+        df_demografico (pd.DataFrame): Saída de `processar_dados_inscricoes`.
+        df_profissional (pd.DataFrame): Saída de `processar_dados_perfil`.
+        df_voluntario (pd.DataFrame): Saída de `processar_dados_voluntariado`.
+        economizar_memoria (bool): Se True, as colunas criadas aqui saem como categorias.
+
+    Returns:
+        pd.DataFrame: DataFrame consolidado com uma linha por combinação de
+                      inscrição, perfil e voluntariado da mesma pessoa.
+    """
+    if df_demografico.empty:
+        return df_demografico
+    df_final = df_demografico
+    # Fontes vazias (arquivo ausente ou sem linhas no delta) não participam do merge.
+    for df_fonte in (df_profissional, df_voluntario):
+        if 'person_id' in df_fonte.columns:
+            df_fonte = df_fonte.set_index('person_id').sort_index(kind='stable')
+            df_final = df_final.join(df_fonte, on='person_id', how='left').reset_index(drop=True)
     
-    # Identifica a primeira inscrição para cada 'person_id' (para contar novas pessoas).
-    primeira_inscricao = df_growth.loc[df_growth.groupby('person_id')['data_inscricao'].idxmin()]
-    primeira_inscricao['periodo'] = primeira_inscricao['data_inscricao'].dt.to_period('M')
+    # Preenche valores NaN na coluna 'is_volunteer' com 'Não' (que precisa ser uma categoria, se a coluna for categórica).
+    if 'is_volunteer' in df_final.columns:
+        voluntario = df_final['is_volunteer']
+        if isinstance(voluntario.dtype, pd.CategoricalDtype) and 'Não' not in voluntario.cat.categories:
+            voluntario = voluntario.cat.add_categories('Não')
+        df_final['is_volunteer'] = voluntario.fillna('Não')
+    else:
+        df_final['is_volunteer'] = 'Não'
     
-    # Conta o número de novas pessoas por mês.
-    novas_pessoas_por_mes = primeira_inscricao.groupby('periodo').size().reset_index(name='novas_pessoas')
-    novas_pessoas_por_mes['periodo'] = novas_pessoas_por_mes['periodo'].astype(str)
+    # Adiciona a identificação de alunos.
+    # Se a coluna 'turma_slug' existe, identifica quem está matriculado.
+    # Caso contrário, categoriza todos como 'Em espera'.
+    if 'turma_slug' in df_final.columns:
+        alunos_ids = df_final.loc[df_final['turma_slug'].notna(), 'person_id'].unique()
+        df_final['perfil_aluno'] = np.where(df_final['person_id'].isin(alunos_ids), 'Matriculado', 'Em espera')
+    else:
+        df_final['perfil_aluno'] = 'Em espera'
+    if economizar_memoria:
+        for coluna in ('is_volunteer', 'perfil_aluno'):
+            df_final[coluna] = compactar_coluna(df_final[coluna])
+    return df_final
+
+
+def montar_fato_inscricoes(df_demografico: pd.DataFrame) -> pd.DataFrame:
+    """Monta a tabela fato de inscrições, com uma linha por inscrição.
+
+    Mantém o 'person_id' e as colunas da própria inscrição (data, turma, curso
+    e as respostas do formulário); as colunas demográficas ficam na dimensão
+    de pessoas, que é ligada à fato pelo 'person_id'.
+
+    Args:
+        df_demografico (pd.DataFrame): Saída de `processar_dados_inscricoes`.
+
+    Returns:
+        pd.DataFrame: A tabela fato, na ordem das inscrições.
+    """
+    if 'person_id' not in df_demografico.columns:
+        return df_demografico
+    colunas = ['person_id'] + [col for col in df_demografico.columns if col != 'person_id' and col not in COLUNAS_DEMOGRAFICAS]
+    return df_demografico[colunas]
+
+
+def montar_dimensao_pessoas(df_final: pd.DataFrame) -> pd.DataFrame:
+    """Monta a dimensão de pessoas, com uma linha por 'person_id'.
+
+    O consolidado repete a pessoa em cada combinação de inscrição, perfil e
+    voluntariado; a dimensão guarda apenas a última linha de cada pessoa (a
+    inscrição, o perfil e o voluntariado mais recentes nos arquivos), com as
+    colunas de `COLUNAS_PESSOA`. As linhas são ordenadas pelo 'person_id'.
+
+    Args:
+        df_final (pd.DataFrame): Saída de `consolidar_dados`, com ou sem a coluna 'persona'.
+
+    Returns:
+        pd.DataFrame: A dimensão de pessoas.
+    """
+    if 'person_id' not in df_final.columns:
+        return df_final
+    colunas = [col for col in COLUNAS_PESSOA if col in df_final.columns]
+    pessoas = df_final.loc[~df_final['person_id'].duplicated(keep='last'), colunas]
+    return pessoas.sort_values('person_id', kind='stable').reset_index(drop=True)
+
+
+def contar_tags_atuacao(df_final: pd.DataFrame, armazem_tags: ArmazemTags | None = None) -> pd.Series:
+    """Conta as tags de atuação das linhas de pessoas voluntárias.
+
+    Args:
+        df_final (pd.DataFrame): DataFrame consolidado com a coluna 'atuacao'.
+        armazem_tags (ArmazemTags, optional): Tags das linhas de `df_final`; se
+                                              ausente, é montado a partir dela.
+
+    Returns:
+        pd.Series: Contagem de cada tag, em ordem decrescente.
+    """
+    armazem_tags = armazem_tags or ArmazemTags.de_tabela(df_final, ('atuacao',))
+    return armazem_tags.somar('atuacao', (df_final['is_volunteer'] == 'Sim').to_numpy())
+
+
+def contar_pessoas_por_estado(df_pessoas: pd.DataFrame) -> pd.Series:
+    """Conta as pessoas (linhas da dimensão de pessoas) de cada estado padronizado válido para o resumo do mapa."""
+    return df_pessoas[df_pessoas['estado_padronizado'] != 'Inválido'].groupby('estado_padronizado', observed=True)['person_id'].count()
+
+
+def gerar_resumo_mapa(contagem_estados: pd.Series, df_states_coords: pd.DataFrame) -> pd.DataFrame:
+    """Monta o resumo do mapa de estados a partir da contagem por estado.
+
+    Args:
+        contagem_estados (pd.Series): Número de pessoas indexado pelo estado padronizado.
+        df_states_coords (pd.DataFrame): Coordenadas dos estados (colunas 'uf', 'latitude', 'longitude').
+
+    Returns:
+        pd.DataFrame: Resumo com coordenadas e a métrica de tamanho 'size_sqrt'.
+    """
+    map_summary = contagem_estados.rename('n_de_pessoas').rename_axis('estado_padronizado').reset_index()
+    map_summary['estado_padronizado'] = map_summary['estado_padronizado'].astype(str)
+    # Mescla com as coordenadas dos estados.
+    map_summary_final = pd.merge(map_summary, df_states_coords, left_on='estado_padronizado', right_on='uf', how='left')
+    # Calcula uma métrica de tamanho (raiz quadrada do número de pessoas) para o mapa.
+    map_summary_final['size_sqrt'] = np.sqrt(map_summary_final['n_de_pessoas'])
+    return map_summary_final
+
+
+def salvar_estado_incremental(df_inscricoes_raw: pd.DataFrame, df_profile_raw: pd.DataFrame, df_voluntariado_raw: pd.DataFrame,
+                              data_referencia: date):
+    """Grava o estado usado pelas execuções com `--incremental`.
+
+    Registra a watermark da coluna 'data' e, para cada arquivo bruto, o
+    registro de pessoas com seus ids e assinaturas de conteúdo.
+
+    Args:
+        df_inscricoes_raw (pd.DataFrame): Inscrições brutas já processadas nesta execução.
+        df_profile_raw (pd.DataFrame): Perfis brutos já processados nesta execução.
+        df_voluntariado_raw (pd.DataFrame): Voluntariado bruto já processado nesta execução.
+        data_referencia (date): Data de referência da idade usada nesta execução.
+    """
+    if df_inscricoes_raw.empty:
+        return
+    datas = LEITOR_DATA_INSCRICAO(df_inscricoes_raw['data'])
+    ids = chave_pessoa(df_inscricoes_raw['email'])
+    registro = incremental.registrar_pessoas(incremental.registro_vazio(), ids)
+    registros = {'inscricoes': incremental.atualizar_registro(registro, primeiras=datas.groupby(ids.to_numpy()).min())}
     
-    # Calcula o total acumulado de pessoas ao longo do tempo.
-    novas_pessoas_por_mes['total_acumulado'] = novas_pessoas_por_mes['novas_pessoas'].cumsum()
+    for nome, df_raw in (('perfil', df_profile_raw), ('voluntariado', df_voluntariado_raw)):
+        if df_raw.empty:
+            continue
+        ids = chave_pessoa(df_raw['email'])
+        registro = incremental.registrar_pessoas(incremental.registro_vazio(), ids)
+        registros[nome] = incremental.atualizar_registro(registro, assinaturas=incremental.assinaturas_por_pessoa(df_raw, ids))
     
-    # Salva o relatório de crescimento em um arquivo CSV.
-    novas_pessoas_por_mes.to_csv(CRESCIMENTO_PATH, index=False)
-    logger.info(f"Análise de crescimento salva em: {CRESCIMENTO_PATH}")
+    gravar_estado_incremental(registros, datas.max(), len(df_inscricoes_raw), data_referencia)
+
+
+def gravar_estado_incremental(registros: dict, watermark, linhas_inscricoes: int, data_referencia: date):
+    """Grava os registros de pessoas e o arquivo de estado do modo incremental.
+
+    Args:
+        registros (dict): Registro de pessoas de cada fonte ('inscricoes', 'perfil', 'voluntariado').
+        watermark (pd.Timestamp): Maior 'data' de inscrição já processada.
+        linhas_inscricoes (int): Número de linhas do arquivo de inscrições.
+        data_referencia (date): Data de referência da idade, reaproveitada pelas execuções incrementais.
+    """
+    for nome, registro in registros.items():
+        incremental.salvar_registro(ESTADO_INCREMENTAL_DIR, nome, registro)
+    incremental.salvar_estado(ESTADO_INCREMENTAL_DIR, {'versao': incremental.VERSAO_ESTADO, 'watermark': watermark, 'linhas_inscricoes': linhas_inscricoes,
+                                                       'data_referencia': data_referencia.isoformat(), 'atualizado_em': datetime.now()})
+    logger.info(f"Estado incremental salvo em: {ESTADO_INCREMENTAL_DIR} (watermark: {watermark})")
+
 
+def arquivos_estado_incremental() -> list:
+    """Lista os arquivos gravados por `gravar_estado_incremental`."""
+    nomes = [incremental.ESTADO_ARQUIVO] + [f'registro_{fonte}.csv' for fonte in ('inscricoes', 'perfil', 'voluntariado')]
+    return [os.path.join(ESTADO_INCREMENTAL_DIR, nome) for nome in nomes]
 
-def main():
-    """Função principal que orquestra todo o pipeline de análise de dados.
+
+def executar_pipeline_completo(exportar_csv: bool = True, workers: int = 1, executor: str = 'threads', cache: CacheEtapas | None = None,
+                               personas: ConfiguracaoPersonas | None = None, opcoes_crescimento: ConfiguracaoCrescimento | None = None,
+                               data_referencia: date | None = None, execucao: ExecucaoMetricas | None = None,
+                               alvos: tuple = COMANDOS['tudo'], economizar_memoria: bool = False):
+    """Executa o pipeline completo, reprocessando todos os arquivos brutos.
 
     Carrega os dados brutos, os processa e padroniza, mescla os DataFrames,
     aplica clustering para descobrir personas, gera relatórios de crescimento
-    e de distribuição geográfica, e salva o DataFrame final processado.
+    e de distribuição geográfica, salva o DataFrame final processado (e, a
+    partir dele, a tabela fato de inscrições e a dimensão de pessoas) e o
+    estado para execuções incrementais. As etapas independentes (leituras,
+    crescimento e normalização de cada fonte; depois, relatórios e estado)
+    rodam em paralelo pelo agendador de etapas.
+
+    Com `cache`, cada etapa é reaproveitada se o seu código, seus parâmetros
+    (inclusive as tabelas de mapeamento) e o conteúdo dos arquivos de que
+    depende não mudaram desde a última execução. Os arquivos brutos nunca são
+    gravados no cache: só as saídas já anonimizadas da normalização.
+
+    Com `alvos`, só essas etapas e as etapas das quais elas dependem são
+    executadas: o subcomando `mapa`, por exemplo, lê e normaliza os arquivos
+    (ou os reaproveita do cache) e grava apenas o resumo do mapa.
+
+    Com `economizar_memoria`, as colunas de inscrições sem uso não são lidas,
+    as saídas da normalização têm as colunas de texto repetitivas como
+    categorias e as numéricas no menor tipo exato; os valores gravados são os
+    mesmos.
+
+    Args:
+        exportar_csv (bool): Se True, grava as saídas também em CSV além do Parquet.
+        workers (int): Número máximo de etapas executadas ao mesmo tempo.
+        executor (str): Tipo de pool usado pelo agendador ('threads' ou 'processos').
+        cache (CacheEtapas, optional): Cache de etapas; sem ele, tudo é executado.
+        personas (ConfiguracaoPersonas, optional): Opções do clustering de personas.
+        opcoes_crescimento (ConfiguracaoCrescimento, optional): Opções dos relatórios de crescimento.
+        data_referencia (date, optional): Data em relação à qual a idade é calculada (padrão: hoje).
+        execucao (ExecucaoMetricas, optional): Registro das medidas de cada etapa.
+        alvos (tuple): Nomes das etapas finais a executar (padrão: todos os relatórios e o estado incremental).
+        economizar_memoria (bool): Se True, reduz o pico de memória com as conversões de tipo descritas acima.
     """
     logger.info("="*50 + "\n==  INICIANDO PIPELINE DE DADOS COMPLETO (FINAL)  ==" + "\n" + "="*50)
-    
-    # Carrega os dados brutos de inscrições, perfil, voluntariado, cidades e coordenadas de estados.
-    df_inscricoes_raw = carregar_dados(RAW_INSCRICOES_PATH)
-    df_profile_raw = carregar_dados(RAW_PROFILE_PATH)
-    df_voluntariado_raw = carregar_dados(RAW_VOLUNTARIADO_PATH)
-    df_cidades = carregar_dados(CIDADES_PATH) # Embora carregado, df_cidades não é usado neste script. Pode ser removido se não for necessário.
-    df_states_coords = carregar_dados(STATES_COORDS_PATH)
+    inicio = time.perf_counter()
     
     # Interrompe o pipeline se o arquivo de inscrições principal não for encontrado.
-    if df_inscricoes_raw.empty:
+    if not os.path.exists(RAW_INSCRICOES_PATH):
         logger.error("Arquivo de inscrições não encontrado. Pipeline interrompido.")
         return
     
-    # Gera a análise de crescimento da comunidade antes de outros processamentos.
-    gerar_analise_de_crescimento(df_inscricoes_raw)
+    # Parâmetros que entram na chave do cache além do código de cada etapa: a chave
+    # do hash de pessoa, o motor e as tabelas de normalização e os formatos de data.
+    # A data de referência da idade é um argumento explícito das etapas que a usam.
+    data_referencia = data_referencia or date.today()
+    identidade_pessoa = (chave_pessoa, chave_hash())
+    normalizacao_comum = (padronizar_categorias, normalizacao, compactar_tabela, compactar_coluna, *identidade_pessoa)
+    descartadas = COLUNAS_SEM_USO_INSCRICOES if economizar_memoria else ()
+    relatorios_personas = [PERSONA_SUMMARY_PATH, PERSONA_DETAILS_PATH, PROCESSED_FINAL_PATH, DIMENSAO_PESSOAS_PATH, CUBO_PATH]
+    personas = personas or ConfiguracaoPersonas()
+    if personas.comparar and personas.motor != 'kmeans':
+        relatorios_personas.append(COMPARACAO_CLUSTERING_PATH)
+    if personas.k is None or personas.varrer:
+        relatorios_personas.append(COTOVELO_PATH)
+    saidas_personas = [c for t in relatorios_personas for c in arquivos_tabela(t, exportar_csv)]
+    if personas.k is None or personas.varrer:
+        saidas_personas.append(COTOVELO_FIGURA_PATH)
+    saidas_personas += arquivos_armazem(TAGS_DIR) + [MODELO_PERSONAS_PATH]
+    saidas_mapa = arquivos_tabela(MAP_SUMMARY_PATH, exportar_csv)
     
-    # Processa individualmente cada conjunto de dados.
-    df_demografico = processar_dados_inscricoes(df_inscricoes_raw)
-    df_profissional = processar_dados_perfil(df_profile_raw)
-    df_voluntario = processar_dados_voluntariado(df_voluntariado_raw)
+    # Leitura, crescimento e normalização: cada fonte é um ramo independente até o merge;
+    # depois dele, os relatórios rodam em paralelo com o estado incremental.
+    etapas = [
+        Etapa('carregar_inscricoes', carregar_dados, argumentos=(RAW_INSCRICOES_PATH, descartadas), cacheavel=True, entradas=(RAW_INSCRICOES_PATH,), guardar=False),
+        Etapa('carregar_perfil', carregar_dados, argumentos=(RAW_PROFILE_PATH,), cacheavel=True, entradas=(RAW_PROFILE_PATH,), guardar=False),
+        Etapa('carregar_voluntariado', carregar_dados, argumentos=(RAW_VOLUNTARIADO_PATH,), cacheavel=True, entradas=(RAW_VOLUNTARIADO_PATH,), guardar=False),
+        Etapa('carregar_coordenadas', carregar_dados, argumentos=(STATES_COORDS_PATH,), cacheavel=True, entradas=(STATES_COORDS_PATH,)),
+        Etapa('crescimento', gerar_analise_de_crescimento, ('carregar_inscricoes',), (exportar_csv, opcoes_crescimento), cacheavel=True,
+              parametros=(salvar_analise_de_crescimento, crescimento, leitura_datas, *identidade_pessoa),
+              saidas=arquivos_crescimento(opcoes_crescimento, exportar_csv), guardar=False),
+        Etapa('processar_inscricoes', processar_dados_inscricoes, ('carregar_inscricoes',), (data_referencia, economizar_memoria), cacheavel=True,
+              parametros=(*normalizacao_comum, leitura_datas, CIDADE_MAP_REVERSO, CIDADES_INVALIDAS)),
+        Etapa('processar_perfil', processar_dados_perfil, ('carregar_perfil',), (economizar_memoria,), cacheavel=True, parametros=normalizacao_comum),
+        Etapa('processar_voluntariado', processar_dados_voluntariado, ('carregar_voluntariado',), (economizar_memoria,), cacheavel=True,
+              parametros=normalizacao_comum),
+        Etapa('consolidar', consolidar_dados, ('processar_inscricoes', 'processar_perfil', 'processar_voluntariado'), (economizar_memoria,), cacheavel=True,
+              parametros=(compactar_coluna,), guardar=False),
+        Etapa('fato_inscricoes', salvar_fato_inscricoes, ('processar_inscricoes',), (exportar_csv,), cacheavel=True,
+              parametros=(montar_fato_inscricoes, COLUNAS_DEMOGRAFICAS), saidas=arquivos_tabela(FATO_INSCRICOES_PATH, exportar_csv), guardar=False),
+        Etapa('saidas', gerar_saidas, ('consolidar', 'fato_inscricoes', 'carregar_coordenadas'), (exportar_csv, personas), cacheavel=True,
+              parametros=(descobrir_personas_com_clustering, clustering, tags, resumir_personas, detalhar_personas, contagens_por_persona,
+                          _primeiras_ocorrencias_por_persona, _moda_por_persona, _distribuicao_por_persona, salvar_armazem_tags,
+                          salvar_contagem_atuacao, contar_tags_atuacao,
+                          salvar_dimensao_pessoas, montar_dimensao_pessoas, cubo, salvar_resumo_mapa, contar_pessoas_por_estado,
+                          gerar_resumo_mapa, FEATURES_PERSONAS, COLUNAS_PESSOA),
+              saidas=saidas_personas + saidas_mapa + arquivos_tabela(ATUACAO_COUNT_PATH, exportar_csv), guardar=False),
+        Etapa('estado_incremental', salvar_estado_incremental, ('carregar_inscricoes', 'carregar_perfil', 'carregar_voluntariado'), (data_referencia,),
+              cacheavel=True, parametros=(gravar_estado_incremental, incremental, leitura_datas, *identidade_pessoa), saidas=arquivos_estado_incremental(),
+              guardar=False),
+        # Etapas usadas apenas pelos subcomandos que regeneram um único relatório.
+        Etapa('pessoas', montar_dimensao_pessoas, ('consolidar',), cacheavel=True, parametros=(COLUNAS_PESSOA,), guardar=False),
+        Etapa('mapa', salvar_resumo_mapa, ('pessoas', 'carregar_coordenadas'), (exportar_csv,), cacheavel=True,
+              parametros=(contar_pessoas_por_estado, gerar_resumo_mapa), saidas=saidas_mapa, guardar=False),
+        Etapa('personas', gerar_relatorio_personas, ('consolidar', 'fato_inscricoes'), (exportar_csv, personas), cacheavel=True,
+              parametros=(descobrir_personas_com_clustering, clustering, tags, resumir_personas, detalhar_personas, contagens_por_persona,
+                          _primeiras_ocorrencias_por_persona, _moda_por_persona, _distribuicao_por_persona, salvar_armazem_tags,
+                          salvar_dimensao_pessoas, montar_dimensao_pessoas,
+                          cubo, FEATURES_PERSONAS, COLUNAS_PESSOA),
+              saidas=saidas_personas, guardar=False),
+        Etapa('consolidado', salvar_consolidado, ('consolidar', 'fato_inscricoes'), (exportar_csv,), cacheavel=True, entradas=(MODELO_PERSONAS_PATH,),
+              parametros=(atribuir_personas, salvar_armazem_tags, tags, salvar_dimensao_pessoas, montar_dimensao_pessoas, cubo,
+                          FEATURES_PERSONAS, COLUNAS_PESSOA),
+              saidas=[c for t in (PROCESSED_FINAL_PATH, DIMENSAO_PESSOAS_PATH, CUBO_PATH) for c in arquivos_tabela(t, exportar_csv)]
+              + arquivos_armazem(TAGS_DIR), guardar=False),
+    ]
+    tempos = executar_grafo(selecionar_etapas(etapas, alvos), workers, executor, cache, execucao)[1]
+    logger.info(resumir_tempos(tempos, time.perf_counter() - inicio))
+    logger.info("Pipeline completo finalizado com sucesso.")
+
+
+def gerar_saidas(df_final: pd.DataFrame, df_fato: pd.DataFrame, df_states_coords: pd.DataFrame, exportar_csv: bool = True,
+                 personas: ConfiguracaoPersonas | None = None) -> pd.DataFrame:
+    """Gera os relatórios e o arquivo consolidado a partir dos dados mesclados.
+
+    Monta e grava o armazém de tags, conta as tags de atuação, descobre as
+    personas, grava a dimensão de pessoas e o cubo de contagens, monta a
+    partir da dimensão o resumo do mapa e salva o DataFrame final.
+
+    Args:
+        df_final (pd.DataFrame): Saída de `consolidar_dados`.
+        df_fato (pd.DataFrame): Tabela fato de inscrições, para o cubo de contagens.
+        df_states_coords (pd.DataFrame): Coordenadas dos estados para o resumo do mapa.
+        exportar_csv (bool): Se True, grava as saídas também em CSV além do Parquet.
+        personas (ConfiguracaoPersonas, optional): Opções do clustering de personas.
+
+    Returns:
+        pd.DataFrame: O DataFrame consolidado com a coluna 'persona'.
+    """
+    if df_final.empty:
+        logger.error("Nenhuma inscrição para consolidar. Relatórios não gerados.")
+        return df_final
     
-    logger.info("Iniciando merges...")
+    # Separa as tags de tecnologias, ferramentas e atuação uma única vez e grava as matrizes.
+    armazem_tags = salvar_armazem_tags(df_final)
+    salvar_contagem_atuacao(df_final, armazem_tags, exportar_csv)
     
-    # Realiza os merges dos DataFrames processados utilizando 'person_id'.
-    # O merge com df_profissional e df_voluntario é um 'left merge' para manter
-    # todos os inscritos e adicionar informações de perfil/voluntariado onde disponíveis.
-    df_consolidado = pd.merge(df_demografico, df_profissional, on='person_id', how='left')
-    df_final = pd.merge(df_consolidado, df_voluntario, on='person_id', how='left')
+    # Descobre e atribui personas aos usuários.
+    df_final = descobrir_personas_com_clustering(df_final, exportar_csv, personas, armazem_tags)
+    df_pessoas = salvar_dimensao_pessoas(df_final, exportar_csv)
+    salvar_cubo(df_pessoas, df_fato, exportar_csv)
+    salvar_resumo_mapa(df_pessoas, df_states_coords, exportar_csv)
     
-    # Preenche valores NaN na coluna 'is_volunteer' com 'Não'.
-    df_final['is_volunteer'] = df_final['is_volunteer'].fillna('Não')
+    # Salva o DataFrame final, consolidado e enriquecido, em Parquet (e CSV, se habilitado).
+    salvar_tabela(df_final, PROCESSED_FINAL_PATH, exportar_csv)
+    logger.info(f"Dados consolidados e enriquecidos (com personas) salvos em: {PROCESSED_FINAL_PATH}")
+    return df_final
+
+
+def salvar_armazem_tags(df_final: pd.DataFrame) -> ArmazemTags:
+    """Monta o armazém de tags do consolidado e o grava em TAGS_DIR."""
+    armazem_tags = ArmazemTags.de_tabela(df_final)
+    armazem_tags.salvar(TAGS_DIR)
+    logger.info(f"Armazém de tags ({len(armazem_tags.vocabulario)} tags) salvo em {TAGS_DIR}")
+    return armazem_tags
+
+
+def salvar_contagem_atuacao(df_final: pd.DataFrame, armazem_tags: ArmazemTags, exportar_csv: bool = True):
+    """Grava a contagem de tags de atuação dos voluntários, se a coluna 'atuacao' existir (vinda do voluntariado)."""
+    if 'atuacao' in df_final.columns:
+        atuacao_counts = contar_tags_atuacao(df_final, armazem_tags).reset_index()
+        atuacao_counts.columns = ['atuacao', 'count']
+        salvar_tabela(atuacao_counts, ATUACAO_COUNT_PATH, exportar_csv)
+        logger.info(f"Contagem de tags de atuação salva em {ATUACAO_COUNT_PATH}")
+
+
+def salvar_fato_inscricoes(df_demografico: pd.DataFrame, exportar_csv: bool = True) -> pd.DataFrame:
+    """Monta e grava a tabela fato de inscrições (ver `montar_fato_inscricoes`) e a retorna."""
+    df_fato = montar_fato_inscricoes(df_demografico)
+    if not df_fato.empty:
+        salvar_tabela(df_fato, FATO_INSCRICOES_PATH, exportar_csv)
+        logger.info(f"Tabela fato de inscrições salva em: {FATO_INSCRICOES_PATH}")
+    return df_fato
+
+
+def salvar_dimensao_pessoas(df_final: pd.DataFrame, exportar_csv: bool = True) -> pd.DataFrame:
+    """Monta e grava a dimensão de pessoas (ver `montar_dimensao_pessoas`) e a retorna."""
+    df_pessoas = montar_dimensao_pessoas(df_final)
+    salvar_tabela(df_pessoas, DIMENSAO_PESSOAS_PATH, exportar_csv)
+    logger.info(f"Dimensão de pessoas ({len(df_pessoas)} pessoas) salva em: {DIMENSAO_PESSOAS_PATH}")
+    return df_pessoas
+
+
+def salvar_cubo(df_pessoas: pd.DataFrame, df_fato: pd.DataFrame, exportar_csv: bool = True):
+    """Monta e grava o cubo de contagens do dashboard (ver `cubo.montar_cubo`)."""
+    df_cubo = montar_cubo(df_pessoas, df_fato)
+    salvar_tabela(df_cubo, CUBO_PATH, exportar_csv)
+    logger.info(f"Cubo de contagens ({len(df_cubo)} células) salvo em: {CUBO_PATH}")
+
+
+def salvar_resumo_mapa(df_pessoas: pd.DataFrame, df_states_coords: pd.DataFrame, exportar_csv: bool = True):
+    """Grava o resumo do mapa de estados a partir da dimensão de pessoas, se houver estados padronizados e coordenadas carregadas."""
+    if 'estado_padronizado' in df_pessoas.columns and not df_states_coords.empty:
+        logger.info("Gerando resumo para o mapa de estados...")
+        map_summary_final = gerar_resumo_mapa(contar_pessoas_por_estado(df_pessoas), df_states_coords)
+        salvar_tabela(map_summary_final, MAP_SUMMARY_PATH, exportar_csv)
+        logger.info(f"Resumo do mapa (com coordenadas) salvo em: {MAP_SUMMARY_PATH}")
+
+
+def gerar_relatorio_personas(df_final: pd.DataFrame, df_fato: pd.DataFrame, exportar_csv: bool = True,
+                             personas: ConfiguracaoPersonas | None = None) -> pd.DataFrame:
+    """Reajusta as personas e grava os relatórios delas, o armazém de tags, o consolidado, a dimensão de pessoas e o cubo.
+
+    Usada pelo subcomando `personas`, que não regrava os demais relatórios.
+
+    Args:
+        df_final (pd.DataFrame): Saída de `consolidar_dados`.
+        df_fato (pd.DataFrame): Tabela fato de inscrições, para o cubo de contagens.
+        exportar_csv (bool): Se True, grava as saídas também em CSV além do Parquet.
+        personas (ConfiguracaoPersonas, optional): Opções do clustering de personas.
+
+    Returns:
+        pd.DataFrame: O DataFrame consolidado com a coluna 'persona'.
+    """
+    if df_final.empty:
+        logger.error("Nenhuma inscrição para consolidar. Personas não geradas.")
+        return df_final
+    armazem_tags = salvar_armazem_tags(df_final)
+    df_final = descobrir_personas_com_clustering(df_final, exportar_csv, personas, armazem_tags)
+    salvar_cubo(salvar_dimensao_pessoas(df_final, exportar_csv), df_fato, exportar_csv)
+    salvar_tabela(df_final, PROCESSED_FINAL_PATH, exportar_csv)
+    logger.info(f"Dados consolidados (com personas) salvos em: {PROCESSED_FINAL_PATH}")
+    return df_final
+
+
+def salvar_consolidado(df_final: pd.DataFrame, df_fato: pd.DataFrame, exportar_csv: bool = True) -> pd.DataFrame:
+    """Grava o consolidado, a dimensão de pessoas, o cubo e o armazém de tags, com as personas previstas pelo modelo salvo.
+
+    Usada pelo subcomando `normalizar`: o clustering não é reajustado, como no
+    modo incremental.
+
+    Args:
+        df_final (pd.DataFrame): Saída de `consolidar_dados`.
+        df_fato (pd.DataFrame): Tabela fato de inscrições, para o cubo de contagens.
+        exportar_csv (bool): Se True, grava as saídas também em CSV além do Parquet.
+
+    Returns:
+        pd.DataFrame: O DataFrame consolidado com a coluna 'persona'.
+    """
+    if df_final.empty:
+        logger.error("Nenhuma inscrição para consolidar. Consolidado não gravado.")
+        return df_final
+    salvar_armazem_tags(df_final)
+    df_final = atribuir_personas(df_final)
+    salvar_cubo(salvar_dimensao_pessoas(df_final, exportar_csv), df_fato, exportar_csv)
+    salvar_tabela(df_final, PROCESSED_FINAL_PATH, exportar_csv)
+    logger.info(f"Dados consolidados salvos em: {PROCESSED_FINAL_PATH}")
+    return df_final
+
+
+def ingerir_inscricoes_em_blocos(spill: AreaSpill, caminho_arquivo: str, tamanho_chunk: int, data_referencia: date) -> dict:
+    """Normaliza as inscrições bloco a bloco e grava as partes na área de spill.
+
+    Args:
+        spill (AreaSpill): Área onde as partes normalizadas são gravadas.
+        caminho_arquivo (str): Caminho do CSV bruto de inscrições.
+        tamanho_chunk (int): Número máximo de linhas lidas por bloco.
+        data_referencia (date): Data em relação à qual a idade é calculada.
+
+    Returns:
+        dict: Registro de pessoas ('registro'), primeira inscrição por pessoa
+              ('primeiras'), motor de crescimento ('motor'), maior 'data'
+              ('watermark'), número de linhas ('linhas') e se a coluna 'data'
+              existe ('tem_data').
+    """
+    registro = incremental.registro_vazio()
+    primeiras = pd.Series(dtype='datetime64[ns]')
+    motores = []
+    maximos_data = []
+    linhas = 0
+    tem_data = False
+    for chunk in ler_em_chunks(caminho_arquivo, tamanho_chunk, TIPOS_INSCRICOES):
+        ids = chave_pessoa(chunk['email'])
+        registro = incremental.registrar_pessoas(registro, ids)
+        if 'data' in chunk.columns:
+            tem_data = True
+            datas = LEITOR_DATA_INSCRICAO(chunk['data'])
+            primeiras = pd.concat([primeiras, datas.groupby(ids.to_numpy()).min()]).groupby(level=0).min()
+            motores.append(MotorCrescimento.de_eventos(ids, datas))
+            maximos_data.append(datas.max())
+        spill.gravar('inscricoes', processar_dados_inscricoes(chunk, data_referencia))
+        linhas += len(chunk)
+    watermark = pd.Series(maximos_data, dtype='datetime64[ns]').max()
+    return {'registro': registro, 'primeiras': primeiras, 'motor': MotorCrescimento.unir(motores), 'watermark': watermark,
+            'linhas': linhas, 'tem_data': tem_data}
+
+
+def ingerir_fonte_em_blocos(spill: AreaSpill, nome: str, caminho_arquivo: str, processar, tamanho_chunk: int) -> pd.DataFrame | None:
+    """Normaliza perfil ou voluntariado bloco a bloco e grava as partes na área de spill.
+
+    Args:
+        spill (AreaSpill): Área onde as partes normalizadas são gravadas.
+        nome (str): Nome da fonte ('perfil' ou 'voluntariado').
+        caminho_arquivo (str): Caminho do CSV bruto.
+        processar (callable): `processar_dados_perfil` ou `processar_dados_voluntariado`.
+        tamanho_chunk (int): Número máximo de linhas lidas por bloco.
+
+    Returns:
+        pd.DataFrame or None: Registro de pessoas com as assinaturas somadas por
+                              pessoa, ou None se o arquivo não tiver linhas.
+    """
+    registro = incremental.registro_vazio()
+    assinaturas = pd.Series(dtype='int64')
+    for chunk in ler_em_chunks(caminho_arquivo, tamanho_chunk):
+        ids = chave_pessoa(chunk['email'])
+        registro = incremental.registrar_pessoas(registro, ids)
+        assinaturas = pd.concat([assinaturas, incremental.assinaturas_por_pessoa(chunk, ids)]).groupby(level=0).sum()
+        spill.gravar(nome, processar(chunk))
+    if registro.empty:
+        return None
+    return incremental.atualizar_registro(registro, assinaturas=assinaturas)
+
+
+def executar_pipeline_streaming(exportar_csv: bool = True, tamanho_chunk: int = TAMANHO_CHUNK_PADRAO, workers: int = 1, executor: str = 'threads',
+                                personas: ConfiguracaoPersonas | None = None, opcoes_crescimento: ConfiguracaoCrescimento | None = None,
+                                data_referencia: date | None = None, execucao: ExecucaoMetricas | None = None):
+    """Executa o pipeline completo lendo os arquivos brutos em blocos.
+
+    Cada bloco de inscrições, perfil e voluntariado é lido com tipos
+    declarados, normalizado e gravado em disco; como o `person_id` depende só
+    do e-mail, cada bloco é processado de forma independente. O crescimento
+    e o estado incremental são acumulados bloco a bloco, e só as partes já
+    normalizadas (categóricas e já sem as colunas descartadas) são reunidas
+    para o merge final. Assim, o arquivo bruto completo nunca fica em memória.
+    As três fontes são ingeridas em paralelo pelo agendador de etapas.
+
+    Args:
+        exportar_csv (bool): Se True, grava as saídas também em CSV além do Parquet.
+        tamanho_chunk (int): Número máximo de linhas lidas por bloco.
+        workers (int): Número máximo de etapas executadas ao mesmo tempo.
+        executor (str): Tipo de pool usado pelo agendador ('threads' ou 'processos').
+        personas (ConfiguracaoPersonas, optional): Opções do clustering de personas.
+        opcoes_crescimento (ConfiguracaoCrescimento, optional): Opções dos relatórios de crescimento.
+        data_referencia (date, optional): Data em relação à qual a idade é calculada (padrão: hoje).
+        execucao (ExecucaoMetricas, optional): Registro das medidas de cada etapa.
+    """
+    logger.info("="*50 + "\n==  INICIANDO PIPELINE DE DADOS EM BLOCOS (STREAMING)  ==" + "\n" + "="*50)
+    inicio = time.perf_counter()
+    spill = AreaSpill(SPILL_DIR)
+    data_referencia = data_referencia or date.today()
+    execucao = execucao or ExecucaoMetricas(modo='streaming')
     
-    # Adiciona a identificação de alunos.
-    # Se a coluna 'turma_slug' existe, identifica quem está matriculado.
-    # Caso contrário, categoriza todos como 'Em espera'.
-    if 'turma_slug' in df_final.columns:
-        alunos_ids = df_final[df_final['turma_slug'].notna()]['person_id'].unique()
-        df_final['perfil_aluno'] = np.where(df_final['person_id'].isin(alunos_ids), 'Matriculado', 'Em espera')
+    etapas = [
+        Etapa('ingerir_inscricoes', ingerir_inscricoes_em_blocos, argumentos=(spill, RAW_INSCRICOES_PATH, tamanho_chunk, data_referencia)),
+        Etapa('ingerir_perfil', ingerir_fonte_em_blocos, argumentos=(spill, 'perfil', RAW_PROFILE_PATH, processar_dados_perfil, tamanho_chunk)),
+        Etapa('ingerir_voluntariado', ingerir_fonte_em_blocos, argumentos=(spill, 'voluntariado', RAW_VOLUNTARIADO_PATH, processar_dados_voluntariado, tamanho_chunk)),
+        Etapa('carregar_coordenadas', carregar_dados, argumentos=(STATES_COORDS_PATH,)),
+    ]
+    resultados, tempos = executar_grafo(etapas, workers, executor, metricas=execucao)
+    inscricoes = resultados['ingerir_inscricoes']
+    
+    # Interrompe o pipeline se o arquivo de inscrições principal não tiver linhas.
+    if inscricoes['linhas'] == 0:
+        logger.error("Arquivo de inscrições não encontrado. Pipeline interrompido.")
+        spill.limpar()
+        return
+    if inscricoes['tem_data']:
+        inscricoes['motor'].salvar(ESTADO_INCREMENTAL_DIR)
+        salvar_analise_de_crescimento(inscricoes['motor'], exportar_csv, opcoes_crescimento)
     else:
-        df_final['perfil_aluno'] = 'Em espera'
-        
+        logger.warning("Inscrições sem coluna 'data'. Análise de crescimento pulada.")
+    
+    # Cada fonte mantém seu próprio registro de pessoas para o modo incremental.
+    registros = {'inscricoes': incremental.atualizar_registro(inscricoes['registro'], primeiras=inscricoes['primeiras'])}
+    for nome in ('perfil', 'voluntariado'):
+        if resultados[f'ingerir_{nome}'] is not None:
+            registros[nome] = resultados[f'ingerir_{nome}']
+    
+    logger.info("Iniciando merges...")
+    df_demografico = spill.ler('inscricoes')
+    df_fato = salvar_fato_inscricoes(df_demografico, exportar_csv)
+    df_final = execucao.medir('consolidar', consolidar_dados, df_demografico, spill.ler('perfil'), spill.ler('voluntariado'))
+    del df_demografico
+    spill.limpar()
     logger.info(f"Merges concluídos. Shape final: {df_final.shape}")
     
-    # Se a coluna 'atuacao_tags' existe (vindo do voluntariado),
-    # calcula a contagem de tags de atuação para voluntários.
-    if 'atuacao_tags' in df_final.columns:
-        atuacao_counts = df_final[df_final['is_volunteer'] == 'Sim']['atuacao_tags'].explode().value_counts().reset_index()
-        atuacao_counts.columns = ['atuacao', 'count']
-        atuacao_counts.to_csv(ATUACAO_COUNT_PATH, index=False)
-        logger.info(f"Contagem de tags de atuação salva em {ATUACAO_COUNT_PATH}")
+    etapas = [
+        Etapa('saidas', gerar_saidas, argumentos=(df_final, df_fato, resultados['carregar_coordenadas'], exportar_csv, personas)),
+        Etapa('estado_incremental', gravar_estado_incremental, argumentos=(registros, inscricoes['watermark'], inscricoes['linhas'], data_referencia)),
+    ]
+    tempos.update(executar_grafo(etapas, workers, executor, metricas=execucao)[1])
+    logger.info(resumir_tempos(tempos, time.perf_counter() - inicio))
+    logger.info("Pipeline em blocos finalizado com sucesso.")
+
+
+def executar_pipeline_incremental(exportar_csv: bool = True, opcoes_crescimento: ConfiguracaoCrescimento | None = None,
+                                  data_referencia: date | None = None, execucao: ExecucaoMetricas | None = None):
+    """Processa apenas inscrições novas e pessoas alteradas desde a última execução.
+
+    Inscrições com 'data' posterior à watermark e pessoas cujo perfil ou
+    voluntariado mudou são normalizadas e mescladas; as personas dessas linhas
+    são previstas com o modelo salvo na última execução completa. O resultado é
+    acrescentado ao arquivo consolidado, à tabela fato de inscrições e à
+    dimensão de pessoas, e os relatórios de mapa e atuação são atualizados
+    por delta; as inscrições novas são acrescentadas ao estado do
+    motor de crescimento, do qual os relatórios de crescimento são recalculados.
+    Os resumos de personas só são recalculados em execuções completas. A idade
+    das linhas novas é calculada na data de referência da última execução
+    completa, a mesma das linhas já consolidadas. Sem estado salvo, executa o
+    pipeline completo.
+
+    Args:
+        exportar_csv (bool): Se True, grava as saídas também em CSV além do Parquet.
+        opcoes_crescimento (ConfiguracaoCrescimento, optional): Opções dos relatórios de crescimento.
+        data_referencia (date, optional): Data de referência da idade, usada só se
+                                          o pipeline completo precisar ser executado.
+        execucao (ExecucaoMetricas, optional): Registro das medidas de cada etapa.
+    """
+    logger.info("="*50 + "\n==  INICIANDO PIPELINE DE DADOS INCREMENTAL  ==" + "\n" + "="*50)
+    estado = incremental.carregar_estado(ESTADO_INCREMENTAL_DIR)
+    motor = MotorCrescimento.carregar(ESTADO_INCREMENTAL_DIR)
+    tabelas = (PROCESSED_FINAL_PATH, FATO_INSCRICOES_PATH, DIMENSAO_PESSOAS_PATH, CUBO_PATH)
+    if estado is None or estado.get('versao') != incremental.VERSAO_ESTADO or not all(map(existe_tabela, tabelas)) or motor is None:
+        logger.warning("Estado incremental não encontrado ou de uma versão anterior. Executando o pipeline completo.")
+        if execucao is not None:
+            execucao.modo = 'completo'
+        executar_pipeline_completo(exportar_csv, opcoes_crescimento=opcoes_crescimento, data_referencia=data_referencia, execucao=execucao)
+        return
+    data_referencia = date.fromisoformat(estado['data_referencia'])
+    execucao = execucao or ExecucaoMetricas(modo='incremental')
     
-    # Descobre e atribui personas aos usuários.
-    df_final = descobrir_personas_com_clustering(df_final)
+    df_inscricoes_raw = execucao.medir('carregar_inscricoes', carregar_dados, RAW_INSCRICOES_PATH)
+    df_profile_raw = execucao.medir('carregar_perfil', carregar_dados, RAW_PROFILE_PATH)
+    df_voluntariado_raw = execucao.medir('carregar_voluntariado', carregar_dados, RAW_VOLUNTARIADO_PATH)
+    if df_inscricoes_raw.empty:
+        logger.error("Arquivo de inscrições não encontrado. Pipeline interrompido.")
+        return
+    
+    # Identifica as inscrições novas pela watermark e as pessoas já presentes no consolidado.
+    watermark = pd.to_datetime(estado['watermark'])
+    datas = LEITOR_DATA_INSCRICAO(df_inscricoes_raw['data'])
+    novas = (datas > watermark) if pd.notna(watermark) else datas.notna()
+    registro_insc = incremental.carregar_registro(ESTADO_INCREMENTAL_DIR, 'inscricoes')
+    ids_existentes = set(registro_insc['person_id'])
+    ids_insc = chave_pessoa(df_inscricoes_raw['email'])
+    registro_insc = incremental.registrar_pessoas(registro_insc, ids_insc)
+    afetados = set(ids_insc[novas].unique())
+    
+    # Detecta pessoas com perfil ou voluntariado novo ou alterado pelas assinaturas.
+    fontes = {}
+    for nome, df_raw in (('perfil', df_profile_raw), ('voluntariado', df_voluntariado_raw)):
+        if df_raw.empty:
+            continue
+        ids = chave_pessoa(df_raw['email'])
+        registro = incremental.registrar_pessoas(incremental.carregar_registro(ESTADO_INCREMENTAL_DIR, nome), ids)
+        assinaturas = incremental.assinaturas_por_pessoa(df_raw, ids)
+        afetados |= incremental.pessoas_alteradas(registro, assinaturas)
+        fontes[nome] = (df_raw, ids, incremental.atualizar_registro(registro, assinaturas=assinaturas))
+    logger.info(f"Inscrições novas: {int(novas.sum())}. Pessoas afetadas: {len(afetados)}.")
+    
+    if afetados:
+        # Normaliza e mescla apenas as linhas das pessoas afetadas.
+        df_demografico = execucao.medir('processar_inscricoes', processar_dados_inscricoes, df_inscricoes_raw[ids_insc.isin(afetados)], data_referencia)
+        processados = {'perfil': pd.DataFrame(), 'voluntariado': pd.DataFrame()}
+        processadores = {'perfil': processar_dados_perfil, 'voluntariado': processar_dados_voluntariado}
+        for nome, (df_raw, ids, _) in fontes.items():
+            linhas = ids.isin(afetados)
+            if linhas.any():
+                processados[nome] = execucao.medir(f'processar_{nome}', processadores[nome], df_raw[linhas])
+        df_delta = execucao.medir('consolidar', consolidar_dados, df_demografico, processados['perfil'], processados['voluntariado'])
+        df_delta = execucao.medir('atribuir_personas', atribuir_personas, df_delta)
+        
+        # Acrescenta as linhas novas ao consolidado; pessoas já existentes têm suas linhas substituídas.
+        df_store = carregar_tabela(PROCESSED_FINAL_PATH)
+        colunas_store = df_store.columns.tolist()
+        df_delta = df_delta.reindex(columns=colunas_store)
+        removidas_mask = df_store['person_id'].isin(afetados & ids_existentes)
+        df_removidas = df_store[removidas_mask]
+        df_store = concatenar_tabelas([df_store[~removidas_mask], df_delta])
+        salvar_tabela(df_store, PROCESSED_FINAL_PATH, exportar_csv=False)
+        if exportar_csv:
+            # Sem linhas substituídas, o CSV recebe apenas as linhas novas ao final.
+            if df_removidas.empty and os.path.exists(PROCESSED_FINAL_PATH):
+                salvar_csv(df_delta, PROCESSED_FINAL_PATH, acrescentar=True)
+            else:
+                salvar_csv(df_store, PROCESSED_FINAL_PATH)
+        logger.info(f"Consolidado atualizado: +{len(df_delta)} / -{len(df_removidas)} linhas.")
+        
+        # Na fato e na dimensão, as linhas das pessoas afetadas também são substituídas pelas do delta.
+        df_fato = carregar_tabela(FATO_INSCRICOES_PATH)
+        df_fato = concatenar_tabelas([df_fato[~df_fato['person_id'].isin(afetados)],
+                                      montar_fato_inscricoes(df_demografico).reindex(columns=df_fato.columns)])
+        salvar_tabela(df_fato, FATO_INSCRICOES_PATH, exportar_csv)
+        df_pessoas = carregar_tabela(DIMENSAO_PESSOAS_PATH)
+        pessoas_removidas = df_pessoas[df_pessoas['person_id'].isin(afetados)]
+        pessoas_delta = montar_dimensao_pessoas(df_delta).reindex(columns=df_pessoas.columns)
+        df_pessoas = concatenar_tabelas([df_pessoas[~df_pessoas['person_id'].isin(afetados)], pessoas_delta])
+        df_pessoas = df_pessoas.sort_values('person_id', kind='stable').reset_index(drop=True)
+        salvar_tabela(df_pessoas, DIMENSAO_PESSOAS_PATH, exportar_csv)
+        salvar_cubo(df_pessoas, df_fato, exportar_csv)
+        
+        # O armazém de tags acompanha as linhas do consolidado.
+        ArmazemTags.de_tabela(df_store).salvar(TAGS_DIR)
+        
+        # Atualiza os relatórios de mapa e de atuação pela diferença entre linhas novas e removidas.
+        df_states_coords = carregar_dados(STATES_COORDS_PATH)
+        if not df_states_coords.empty and existe_tabela(MAP_SUMMARY_PATH):
+            delta_estados = contar_pessoas_por_estado(pessoas_delta).sub(contar_pessoas_por_estado(pessoas_removidas), fill_value=0)
+            delta_estados.index = delta_estados.index.astype(str)
+            contagem = incremental.aplicar_delta_contagem(carregar_tabela(MAP_SUMMARY_PATH), delta_estados, 'estado_padronizado', 'n_de_pessoas')
+            salvar_tabela(gerar_resumo_mapa(contagem.set_index('estado_padronizado')['n_de_pessoas'], df_states_coords), MAP_SUMMARY_PATH, exportar_csv)
+            logger.info(f"Resumo do mapa atualizado por delta: {MAP_SUMMARY_PATH}")
+        if 'atuacao' in colunas_store and existe_tabela(ATUACAO_COUNT_PATH):
+            delta_tags = contar_tags_atuacao(df_delta).sub(contar_tags_atuacao(df_removidas), fill_value=0)
+            # A tag vazia é lida como nula quando o relatório vem do CSV.
+            atuacao_atual = carregar_tabela(ATUACAO_COUNT_PATH).fillna({'atuacao': ''})
+            atuacao_atual['atuacao'] = atuacao_atual['atuacao'].astype(str)
+            atuacao_counts = incremental.aplicar_delta_contagem(atuacao_atual, delta_tags, 'atuacao', 'count')
+            salvar_tabela(atuacao_counts.sort_values('count', ascending=False, kind='stable'), ATUACAO_COUNT_PATH, exportar_csv)
+            logger.info(f"Contagem de tags de atuação atualizada por delta: {ATUACAO_COUNT_PATH}")
+    
+    # Acrescenta as inscrições novas ao motor de crescimento e recalcula os relatórios.
+    if novas.any():
+        motor = motor.acrescentar(ids_insc[novas], datas[novas])
+        motor.salvar(ESTADO_INCREMENTAL_DIR)
+        execucao.medir('crescimento', salvar_analise_de_crescimento, motor, exportar_csv, opcoes_crescimento)
+    
+    # Persiste o novo estado: registros, assinaturas e watermark.
+    primeiras = datas[novas].groupby(ids_insc[novas].to_numpy()).min()
+    incremental.salvar_registro(ESTADO_INCREMENTAL_DIR, 'inscricoes', incremental.atualizar_registro(registro_insc, primeiras=primeiras))
+    for nome, (_, _, registro) in fontes.items():
+        incremental.salvar_registro(ESTADO_INCREMENTAL_DIR, nome, registro)
+    nova_watermark = max(watermark, datas[novas].max()) if novas.any() else watermark
+    incremental.salvar_estado(ESTADO_INCREMENTAL_DIR, {'versao': incremental.VERSAO_ESTADO, 'watermark': nova_watermark, 'linhas_inscricoes': len(df_inscricoes_raw),
+                                                       'data_referencia': data_referencia.isoformat(), 'atualizado_em': datetime.now()})
+    logger.info(f"Pipeline incremental finalizado com sucesso (watermark: {nova_watermark}).")
 
-    # Se a coluna 'estado_padronizado' existe e os dados de coordenadas de estados foram carregados,
-    # gera um resumo para visualização em mapa.
-    if 'estado_padronizado' in df_final.columns and df_states_coords is not None:
-        logger.info("Gerando resumo para o mapa de estados...")
-        # Agrupa por estado padronizado e conta o número de pessoas.
-        map_summary = df_final[df_final['estado_padronizado'] != 'Inválido'].groupby('estado_padronizado').agg(n_de_pessoas=('person_id', 'count')).reset_index()
-        # Mescla com as coordenadas dos estados.
-        map_summary_final = pd.merge(map_summary, df_states_coords, left_on='estado_padronizado', right_on='uf', how='left')
-        # Calcula uma métrica de tamanho (raiz quadrada do número de pessoas) para o mapa.
-        map_summary_final['size_sqrt'] = np.sqrt(map_summary_final['n_de_pessoas'])
-        map_summary_final.to_csv(MAP_SUMMARY_PATH, index=False)
-        logger.info(f"Resumo do mapa (com coordenadas) salvo em: {MAP_SUMMARY_PATH}")
+
+def criar_parser() -> argparse.ArgumentParser:
+    """Monta o parser da linha de comando, com um subcomando por relatório.
+
+    Cada subcomando aceita só as opções que usa: `crescimento` não carrega
+    as opções de clustering, e `--incremental`/`--streaming` só valem para
+    `tudo`. Os nomes em inglês ('all', 'growth', 'normalize' e 'map') são
+    aceitos como sinônimos.
+    """
+    comum = argparse.ArgumentParser(add_help=False)
+    comum.add_argument('--sem-csv', action='store_true', help="Grava as saídas apenas em Parquet, sem a exportação em CSV.")
+    comum.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Número máximo de etapas executadas ao mesmo tempo (1 executa tudo em sequência).")
+    comum.add_argument('--executor', choices=sorted(EXECUTORES), default='threads', help="Tipo de pool usado para as etapas independentes.")
+    comum.add_argument('--sem-cache', action='store_true', help="Executa todas as etapas sem consultar nem gravar o cache de etapas.")
+    comum.add_argument('--invalidar', nargs='*', metavar='ETAPA', help="Ignora o cache das etapas informadas (ou de todas, se nenhuma for informada).")
+    comum.add_argument('--economizar-memoria', action='store_true',
+                       help="Reduz o pico de memória: não lê colunas sem uso e mantém as colunas de texto repetitivas como categorias.")
+    comum.add_argument('--perfilar', choices=PERFILADORES,
+                       help="Perfila cada etapa com o cProfile ou com o amostrador de pilhas; os perfis ficam na pasta da execução.")
     
-    # Salva o DataFrame final, consolidado e enriquecido, em um arquivo CSV.
-    df_final.to_csv(PROCESSED_FINAL_PATH, index=False)
-    logger.info(f"Dados consolidados e enriquecidos (com personas) salvos em: {PROCESSED_FINAL_PATH}")
-    logger.info("Pipeline completo finalizado com sucesso.")
+    normalizacao_args = argparse.ArgumentParser(add_help=False)
+    normalizacao_args.add_argument('--data-referencia', type=date.fromisoformat, metavar='AAAA-MM-DD',
+                                   help="Data em relação à qual a idade é calculada (padrão: hoje); o modo incremental usa a da última execução completa.")
+    
+    crescimento_args = argparse.ArgumentParser(add_help=False)
+    crescimento_args.add_argument('--granularidades', nargs='+', choices=list(GRANULARIDADES), default=['M'], metavar='G',
+                                  help="Granularidades dos relatórios de crescimento: D (dia), W (semana) e/ou M (mês, sempre gerado).")
+    crescimento_args.add_argument('--janela', type=int, default=JANELA_PADRAO, help="Número de períodos das janelas móveis de crescimento.")
+    crescimento_args.add_argument('--idades-coorte', type=int, default=IDADES_COORTE_PADRAO, help="Número de períodos acompanhados na matriz de retenção por coorte.")
+    
+    personas_args = argparse.ArgumentParser(add_help=False)
+    personas_args.add_argument('--motor-clustering', choices=MOTORES_CLUSTERING, default='kmeans', help="Motor usado para descobrir as personas ('minibatch' e 'streaming' para bases grandes).")
+    personas_args.add_argument('--comparar-clustering', action='store_true', help="Compara o motor de clustering com o K-Means completo (inércia e acordo de rótulos).")
+    personas_args.add_argument('--k-personas', default=str(K_PADRAO), help="Número de personas, ou 'auto' para escolher K pelo método do cotovelo.")
+    personas_args.add_argument('--k-candidatos', type=int, nargs='+', default=list(K_CANDIDATOS_PADRAO), metavar='K', help="Valores de K avaliados pela varredura.")
+    personas_args.add_argument('--varrer-k', action='store_true', help="Atualiza a curva do cotovelo mesmo com --k-personas fixo.")
+    
+    parser = argparse.ArgumentParser(description="Pipeline de análise de dados da comunidade TransDevs.",
+                                     epilog="Sem subcomando, executa 'tudo'. Use '<comando> -h' para as opções de cada subcomando.")
+    parser.set_defaults(incremental=False, streaming=False, data_referencia=None)
+    subcomandos = parser.add_subparsers(dest='comando', metavar='COMANDO')
+    tudo = subcomandos.add_parser('tudo', aliases=['all'], parents=[comum, normalizacao_args, crescimento_args, personas_args],
+                                  help="Executa o pipeline inteiro: todos os relatórios, o consolidado e o estado incremental.")
+    modo = tudo.add_mutually_exclusive_group()
+    modo.add_argument('--incremental', action='store_true', help="Processa apenas inscrições novas e pessoas alteradas desde a última execução.")
+    modo.add_argument('--streaming', action='store_true', help="Executa o pipeline completo lendo os arquivos brutos em blocos, para arquivos maiores que a memória.")
+    tudo.add_argument('--tamanho-chunk', type=int, default=TAMANHO_CHUNK_PADRAO, help="Número de linhas por bloco no modo --streaming.")
+    subcomandos.add_parser('crescimento', aliases=['growth'], parents=[comum, crescimento_args],
+                           help="Gera apenas os relatórios de crescimento e de retenção por coorte.")
+    subcomandos.add_parser('normalizar', aliases=['normalize'], parents=[comum, normalizacao_args],
+                           help="Normaliza e consolida os arquivos brutos, com as personas do modelo salvo.")
+    subcomandos.add_parser('personas', parents=[comum, normalizacao_args, personas_args],
+                           help="Reajusta as personas e gera os relatórios delas.")
+    subcomandos.add_parser('mapa', aliases=['map'], parents=[comum, normalizacao_args], help="Gera apenas o resumo do mapa de estados.")
+    return parser
+
+
+def _com_subcomando(argv: list) -> list:
+    """Usa 'tudo' quando nenhum subcomando é informado, como nas chamadas anteriores aos subcomandos."""
+    if not argv or (argv[0].startswith('-') and argv[0] not in ('-h', '--help')):
+        return ['tudo'] + argv
+    return argv
+
+
+def main(argv: list | None = None):
+    """Função principal que orquestra o pipeline de análise de dados.
+
+    O subcomando escolhe os relatórios gerados ('tudo' por padrão); cada um
+    executa apenas as etapas de que precisa, e o scikit-learn só é importado
+    quando as personas são ajustadas. Com `tudo --incremental`, processa
+    apenas o que mudou desde a última execução e, com `tudo --streaming`,
+    executa o pipeline completo lendo os arquivos brutos em blocos. Cada
+    execução grava em EXECUCOES_DIR um manifesto com as medidas de cada etapa.
+
+    Args:
+        argv (list, optional): Argumentos de linha de comando (padrão: `sys.argv`).
+    """
+    parser = criar_parser()
+    args = parser.parse_args(_com_subcomando(sys.argv[1:] if argv is None else list(argv)))
+    comando = {'all': 'tudo', 'growth': 'crescimento', 'normalize': 'normalizar', 'map': 'mapa'}.get(args.comando, args.comando)
+    personas = None
+    if 'k_personas' in args:
+        if args.k_personas != 'auto' and not args.k_personas.isdigit():
+            parser.error("--k-personas deve ser um número inteiro ou 'auto'.")
+        if len(args.k_candidatos) < 2 or min(args.k_candidatos) < 2:
+            parser.error("--k-candidatos precisa de pelo menos dois valores, todos maiores ou iguais a 2.")
+        personas = ConfiguracaoPersonas(args.motor_clustering, args.comparar_clustering, None if args.k_personas == 'auto' else int(args.k_personas),
+                                        args.k_candidatos, args.varrer_k, args.workers)
+    if args.economizar_memoria and (args.incremental or args.streaming):
+        parser.error("--economizar-memoria vale apenas para o pipeline completo, sem --incremental ou --streaming.")
+    opcoes_crescimento = None
+    if 'janela' in args:
+        if args.janela < 1 or args.idades_coorte < 0:
+            parser.error("--janela deve ser pelo menos 1 e --idades-coorte não pode ser negativo.")
+        opcoes_crescimento = ConfiguracaoCrescimento(tuple(args.granularidades), args.janela, args.idades_coorte)
+    cache = None
+    if not args.sem_cache:
+        cache = CacheEtapas(CACHE_DIR, invalidar=set(args.invalidar) if args.invalidar else args.invalidar is not None)
+    
+    configurar_logging()
+    modo = 'incremental' if args.incremental else 'streaming' if args.streaming else 'completo' if comando == 'tudo' else comando
+    execucao = ExecucaoMetricas(EXECUCOES_DIR, modo, args.perfilar, [RAW_INSCRICOES_PATH, RAW_PROFILE_PATH, RAW_VOLUNTARIADO_PATH])
+    logger.info(f"Execução {execucao.id} ({modo}) iniciada.")
+    status = 'erro'
+    try:
+        if args.incremental:
+            executar_pipeline_incremental(exportar_csv=not args.sem_csv, opcoes_crescimento=opcoes_crescimento, data_referencia=args.data_referencia,
+                                          execucao=execucao)
+        elif args.streaming:
+            executar_pipeline_streaming(exportar_csv=not args.sem_csv, tamanho_chunk=args.tamanho_chunk, workers=args.workers, executor=args.executor,
+                                        personas=personas, opcoes_crescimento=opcoes_crescimento, data_referencia=args.data_referencia,
+                                        execucao=execucao)
+        else:
+            executar_pipeline_completo(exportar_csv=not args.sem_csv, workers=args.workers, executor=args.executor, cache=cache,
+                                       personas=personas, opcoes_crescimento=opcoes_crescimento, data_referencia=args.data_referencia,
+                                       execucao=execucao, alvos=COMANDOS[comando], economizar_memoria=args.economizar_memoria)
+        status = 'ok'
+    finally:
+        # O manifesto é gravado mesmo quando uma etapa falha, com as etapas concluídas até ali.
+        logger.info(f"Manifesto da execução salvo em: {execucao.finalizar(status)}")
 
 
 if __name__ == "__main__":
     # Garante que a função main() seja executada apenas quando o script é rodado diretamente.
-    main()
\ No newline at end of file
+    main()
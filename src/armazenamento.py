@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+
+"""
+Armazenamento Colunar - TransDevs Data Analysis
+
+Este módulo grava e lê as tabelas produzidas por `analysis.py` em Parquet,
+um formato colunar comprimido que preserva os tipos do Pandas: categorias
+(inclusive as ordenadas, como 'professional_level_padronizado' e
+'faixa_etaria') são gravadas com dictionary encoding e colunas de listas,
+como as dos detalhes das personas, são gravadas como listas nativas. O CSV
+continua disponível como exportação opcional, no mesmo caminho de sempre.
+"""
+
+import os
+import ast
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Compressão usada nos arquivos Parquet.
+COMPRESSAO_PARQUET = 'zstd'
+
+# Colunas de texto com proporção de valores distintos abaixo deste limite são
+# gravadas como categorias (dictionary encoding).
+LIMITE_CATEGORIA = 0.5
+
+
+def caminho_parquet(caminho_csv: str) -> str:
+    """Retorna o caminho Parquet correspondente a um caminho CSV."""
+    return os.path.splitext(caminho_csv)[0] + '.parquet'
+
+
+def preparar_para_arrow(df: pd.DataFrame) -> pd.DataFrame:
+    """Ajusta colunas de texto para uma gravação colunar compacta e sem erros.
+
+    Colunas de listas são mantidas como estão; colunas de texto com valores de
+    tipos misturados são convertidas para texto e as de baixa cardinalidade
+    viram categorias.
+
+    Args:
+        df (pd.DataFrame): A tabela a ser gravada.
+
+    Returns:
+        pd.DataFrame: Uma cópia rasa da tabela com as colunas de texto ajustadas.
+    """
+    df = df.copy(deep=False)
+    for coluna in df.select_dtypes(include=['object', 'string']).columns:
+        valores = df[coluna]
+        nao_nulos = valores.dropna()
+        if nao_nulos.empty or isinstance(nao_nulos.iloc[0], (list, tuple, np.ndarray)):
+            continue
+        valores = valores.where(valores.isna(), valores.astype(str))
+        if nao_nulos.nunique() <= LIMITE_CATEGORIA * len(nao_nulos):
+            valores = valores.astype('category')
+        df[coluna] = valores
+    return df
+
+
+def compactar_coluna(valores: pd.Series) -> pd.Series:
+    """Converte uma coluna para um tipo mais compacto que representa os mesmos valores.
+
+    Texto de baixa cardinalidade vira categoria, pela mesma regra de
+    `preparar_para_arrow`; inteiros e floats são reduzidos ao menor tipo que
+    representa todos os valores exatamente (a idade, por exemplo, continua em
+    float64). Outras colunas são devolvidas sem alteração.
+
+    Args:
+        valores (pd.Series): A coluna a ser compactada.
+
+    Returns:
+        pd.Series: A coluna no tipo compacto, ou a própria coluna.
+    """
+    if isinstance(valores.dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(valores):
+        return valores
+    if pd.api.types.is_integer_dtype(valores) and not pd.api.types.is_extension_array_dtype(valores):
+        return pd.to_numeric(valores, downcast='integer')
+    if pd.api.types.is_float_dtype(valores) and valores.dtype != np.float32:
+        reduzida = valores.astype('float32')
+        iguais = np.array_equal(reduzida.to_numpy(dtype='float64'), valores.to_numpy(dtype='float64'), equal_nan=True)
+        return reduzida if iguais else valores
+    if pd.api.types.is_string_dtype(valores):
+        nao_nulos = valores.dropna()
+        if not nao_nulos.empty and nao_nulos.nunique() <= LIMITE_CATEGORIA * len(nao_nulos):
+            return valores.astype('category')
+    return valores
+
+
+def compactar_tabela(df: pd.DataFrame) -> pd.DataFrame:
+    """Aplica `compactar_coluna` a cada coluna, sem copiar as colunas que não mudam.
+
+    Args:
+        df (pd.DataFrame): A tabela a ser compactada.
+
+    Returns:
+        pd.DataFrame: Uma cópia rasa da tabela com as colunas compactadas.
+    """
+    df = df.copy(deep=False)
+    for coluna in df.columns:
+        valores = df[coluna]
+        compacta = compactar_coluna(valores)
+        if compacta is not valores:
+            df[coluna] = compacta
+    return df
+
+
+def salvar_tabela(df: pd.DataFrame, caminho_csv: str, exportar_csv: bool = True):
+    """Grava uma tabela em Parquet e, opcionalmente, também em CSV.
+
+    Args:
+        df (pd.DataFrame): A tabela a ser gravada.
+        caminho_csv (str): Caminho CSV de referência; o Parquet é gravado ao lado,
+                           com a extensão '.parquet'.
+        exportar_csv (bool): Se True, também grava o CSV em `caminho_csv`.
+    """
+    tabela = pa.Table.from_pandas(preparar_para_arrow(df), preserve_index=False)
+    pq.write_table(tabela, caminho_parquet(caminho_csv), compression=COMPRESSAO_PARQUET)
+    if exportar_csv:
+        salvar_csv(df, caminho_csv)
+
+
+def salvar_csv(df: pd.DataFrame, caminho_csv: str, acrescentar: bool = False):
+    """Exporta uma tabela em CSV no mesmo formato das versões anteriores.
+
+    Colunas de listas lidas do Parquet chegam como arrays NumPy; elas são
+    convertidas de volta para listas para manter a representação textual.
+
+    Args:
+        df (pd.DataFrame): A tabela a ser exportada.
+        caminho_csv (str): Caminho do arquivo CSV.
+        acrescentar (bool): Se True, acrescenta as linhas ao final do arquivo, sem cabeçalho.
+    """
+    df = df.copy(deep=False)
+    for coluna in df.select_dtypes(include=['object']).columns:
+        nao_nulos = df[coluna].dropna()
+        if not nao_nulos.empty and isinstance(nao_nulos.iloc[0], np.ndarray):
+            df[coluna] = df[coluna].map(lambda v: v.tolist() if isinstance(v, np.ndarray) else v)
+    if acrescentar:
+        df.to_csv(caminho_csv, mode='a', header=False, index=False)
+    else:
+        df.to_csv(caminho_csv, index=False)
+
+
+def carregar_tabela(caminho_csv: str, memory_map: bool = True, tipos: dict | None = None,
+                    colunas_lista: tuple = ()) -> pd.DataFrame | None:
+    """Carrega uma tabela preferindo o Parquet e recorrendo ao CSV.
+
+    O Parquet é lido com memory map, restaurando categorias ordenadas e colunas
+    de listas sem nenhum re-parsing de texto. No CSV, esses tipos se perdem;
+    `tipos` e `colunas_lista` os reconstituem na leitura.
+
+    Args:
+        caminho_csv (str): Caminho CSV de referência da tabela.
+        memory_map (bool): Se True, mapeia o arquivo Parquet em memória na leitura.
+        tipos (dict, optional): Tipos das colunas lidas do CSV (ex: categorias
+                                ordenadas); colunas ausentes são ignoradas.
+        colunas_lista (tuple): Colunas do CSV com listas gravadas como texto,
+                               convertidas de volta para listas.
+
+    Returns:
+        pd.DataFrame or None: A tabela carregada, ou None se nenhum dos dois
+                              arquivos existir.
+    """
+    parquet = caminho_parquet(caminho_csv)
+    if os.path.exists(parquet):
+        return pq.read_table(parquet, memory_map=memory_map).to_pandas()
+    if os.path.exists(caminho_csv):
+        df = pd.read_csv(caminho_csv, low_memory=False, dtype=tipos)
+        for coluna in colunas_lista:
+            if coluna in df.columns:
+                df[coluna] = df[coluna].map(lambda v: ast.literal_eval(v) if isinstance(v, str) else v)
+        return df
+    return None
+
+
+def tipos_categoricos(caminho_csv: str) -> dict:
+    """Retorna o tipo categórico (categorias e ordem) de cada coluna de dicionário do Parquet de uma tabela.
+
+    Lê apenas as colunas categóricas do primeiro row group, sem converter as
+    linhas; o resultado serve para restaurar as categorias em consultas que
+    leem o Parquet por outros meios.
+
+    Args:
+        caminho_csv (str): Caminho CSV de referência da tabela.
+
+    Returns:
+        dict: O `pd.CategoricalDtype` de cada coluna categórica (vazio se o
+              Parquet não existir).
+    """
+    parquet = caminho_parquet(caminho_csv)
+    if not os.path.exists(parquet):
+        return {}
+    arquivo = pq.ParquetFile(parquet)
+    colunas = [campo.name for campo in arquivo.schema_arrow if pa.types.is_dictionary(campo.type)]
+    if not colunas or arquivo.num_row_groups == 0:
+        return {}
+    vazia = arquivo.read_row_group(0, columns=colunas).slice(0, 0).to_pandas()
+    return {coluna: vazia[coluna].dtype for coluna in colunas}
+
+
+def arquivos_tabela(caminho_csv: str, exportar_csv: bool = True) -> list:
+    """Lista os arquivos gravados por `salvar_tabela` para uma tabela."""
+    return [caminho_parquet(caminho_csv)] + ([caminho_csv] if exportar_csv else [])
+
+
+def existe_tabela(caminho_csv: str) -> bool:
+    """Indica se a tabela existe em Parquet ou em CSV."""
+    return os.path.exists(caminho_parquet(caminho_csv)) or os.path.exists(caminho_csv)
+
+
+def concatenar_tabelas(tabelas: list) -> pd.DataFrame:
+    """Concatena tabelas preservando as colunas categóricas.
+
+    O `pd.concat` converte para texto as categorias cujos conjuntos diferem entre
+    as partes. Aqui as categorias são unidas (mantendo a ordem e a flag
+    `ordered` da primeira parte) para que o resultado continue categórico.
+
+    Args:
+        tabelas (list): Lista de DataFrames com colunas compatíveis.
+
+    Returns:
+        pd.DataFrame: As tabelas concatenadas com índice novo.
+    """
+    resultado = pd.concat(tabelas, ignore_index=True)
+    for coluna in resultado.columns:
+        tipos = [t[coluna].dtype for t in tabelas if coluna in t.columns and isinstance(t[coluna].dtype, pd.CategoricalDtype)]
+        if not tipos or isinstance(resultado[coluna].dtype, pd.CategoricalDtype):
+            continue
+        categorias = list(dict.fromkeys(c for t in tipos for c in t.categories))
+        extras = sorted(set(resultado[coluna].dropna().unique()) - set(categorias), key=str)
+        resultado[coluna] = resultado[coluna].astype(pd.CategoricalDtype(categorias + extras, ordered=tipos[0].ordered))
+    return resultado
@@ -0,0 +1,416 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do Pipeline - TransDevs Data Analysis
+
+Mede como o pipeline escala sobre arquivos brutos sintéticos (gerados por
+`dados_sinteticos.py`) de vários tamanhos. Para cada tamanho, as etapas do
+pipeline completo (leitura, cada `processar_*`, merge, crescimento, tags,
+clustering e gravação dos relatórios) são executadas em sequência em uma
+pasta isolada, com as mesmas subpastas de dados e relatórios, registrando o tempo e o pico
+de memória de cada uma.
+
+Antes de os números valerem, as saídas passam por uma verificação de
+equivalência: cada tabela gravada é comparada, sem depender da ordem das
+linhas, com a de uma execução de referência. A referência só é gravada com
+`--gravar-referencia`, de preferência a partir de um checkout fixado da
+implementação de comparação, e guarda a revisão que a produziu; sem ela, o
+benchmark não mede nada. Assim, um caminho otimizado só é comparado com o
+fixado se produzir as mesmas saídas.
+"""
+
+import os
+import glob
+import shutil
+import logging
+import subprocess
+import argparse
+import tracemalloc
+import gc
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+import numpy as np
+import pandas as pd
+import analysis
+import dados_sinteticos
+from clustering import ConfiguracaoPersonas, MOTORES_CLUSTERING
+from leitura_datas import LeitorDatas
+from armazenamento import salvar_tabela
+from metricas import executar_medindo, memoria_rss_mb
+
+logger = logging.getLogger(__name__)
+
+# Diretório padrão dos dados sintéticos, das execuções e das referências.
+BENCHMARK_DIR = os.path.join(analysis.PROJECT_ROOT, 'data', 'benchmark')
+
+# Tamanhos (número de inscrições) medidos por padrão.
+TAMANHOS_PADRAO = (10_000, 100_000)
+
+# Data de referência fixa da idade, para que as saídas sejam reprodutíveis.
+DATA_REFERENCIA_BENCHMARK = date(2025, 9, 16)
+
+# Modos de memória medidos por `--memoria` (valores de `economizar_memoria`).
+MODOS_MEMORIA = {'padrao': (False,), 'reduzida': (True,), 'ambas': (False, True)}
+
+# Casas decimais consideradas na comparação de colunas numéricas.
+CASAS_DECIMAIS = 9
+
+# Arquivo, dentro da pasta da referência, com a revisão do código que a gravou.
+ARQUIVO_ORIGEM_REFERENCIA = 'ORIGEM'
+
+
+@contextmanager
+def caminhos_em(raiz: str):
+    """Redireciona para `raiz` os caminhos de dados e relatórios do `analysis` enquanto o bloco executa.
+
+    Todo atributo de módulo terminado em '_PATH', '_DIR' ou '_PATHS' que
+    aponta para dentro do projeto passa a apontar para o caminho equivalente
+    dentro de `raiz`; os valores originais são restaurados ao final.
+    """
+    def mover(caminho):
+        if isinstance(caminho, str) and caminho.startswith(analysis.PROJECT_ROOT + os.sep):
+            return os.path.join(raiz, os.path.relpath(caminho, analysis.PROJECT_ROOT))
+        return caminho
+
+    originais = {}
+    for nome, valor in list(vars(analysis).items()):
+        if nome.endswith(('_PATH', '_DIR')):
+            originais[nome], novo = valor, mover(valor)
+        elif nome.endswith('_PATHS') and isinstance(valor, dict):
+            originais[nome], novo = valor, {chave: mover(caminho) for chave, caminho in valor.items()}
+        else:
+            continue
+        setattr(analysis, nome, novo)
+    try:
+        yield
+    finally:
+        for nome, valor in originais.items():
+            setattr(analysis, nome, valor)
+
+
+class Medidor:
+    """Mede o tempo e o pico de memória de cada etapa executada por `medir`.
+
+    As etapas rodam em sequência, então o pico de memória residente (RSS),
+    que inclui a memória do Arrow e das bibliotecas nativas, é o de cada
+    etapa quando o sistema permite zerá-lo (Linux); nos demais, é o pico do
+    processo até o fim da etapa.
+
+    Args:
+        rastrear_python (bool): Se True, também mede com o `tracemalloc` o pico
+                                de memória alocada pelo Python e pelo NumPy em
+                                cada etapa (o rastreamento deixa a execução
+                                várias vezes mais lenta).
+    """
+
+    def __init__(self, rastrear_python: bool = False):
+        self.rastrear_python = rastrear_python
+        self.medidas = []
+
+    def medir(self, etapa: str, funcao, *args):
+        """Executa `funcao(*args)`, registra a medida da etapa e devolve o resultado."""
+        gc.collect()
+        rss_inicial = memoria_rss_mb()[0]
+        if self.rastrear_python:
+            tracemalloc.start()
+        try:
+            resultado, medida = executar_medindo(funcao, args, {'isolada': True})
+        finally:
+            pico_python = tracemalloc.get_traced_memory()[1] / 2**20 if self.rastrear_python else np.nan
+            tracemalloc.stop()
+        acrescimo = max(medida['pico_rss_mb'] - rss_inicial, 0.0) if medida['pico_rss_isolado'] else np.nan
+        self.medidas.append({'etapa': etapa, 'segundos': medida['segundos'], 'cpu_s': medida['cpu_s'], 'pico_rss_mb': medida['pico_rss_mb'],
+                             'acrescimo_rss_mb': acrescimo, 'pico_python_mb': pico_python})
+        logger.info(f"[benchmark] {etapa}: {medida['segundos']:.2f}s, pico de {medida['pico_rss_mb']:.0f} MB")
+        return resultado
+
+
+def executar_etapas(medidor: Medidor, personas: ConfiguracaoPersonas, data_referencia: date = DATA_REFERENCIA_BENCHMARK,
+                    economizar_memoria: bool = False):
+    """Executa as etapas do pipeline completo em sequência, medindo cada uma.
+
+    Usa os caminhos atuais do `analysis` (ver `caminhos_em`) e sempre exporta CSV,
+    como a execução padrão. Os leitores de data começam sem cache, como em uma
+    execução nova. Cada tabela bruta é descartada assim que deixa de ser usada,
+    como no agendador de etapas; `economizar_memoria` tem o mesmo efeito que
+    em `analysis.executar_pipeline_completo`.
+    """
+    analysis.LEITOR_NASCIMENTO = LeitorDatas()
+    analysis.LEITOR_DATA_INSCRICAO = LeitorDatas()
+    for diretorio in (os.path.dirname(analysis.PROCESSED_FINAL_PATH), os.path.dirname(analysis.PERSONA_SUMMARY_PATH)):
+        os.makedirs(diretorio, exist_ok=True)
+
+    descartadas = analysis.COLUNAS_SEM_USO_INSCRICOES if economizar_memoria else ()
+    df_inscricoes_raw = medidor.medir('carregar_inscricoes', analysis.carregar_dados, analysis.RAW_INSCRICOES_PATH, descartadas)
+    df_profile_raw = medidor.medir('carregar_perfil', analysis.carregar_dados, analysis.RAW_PROFILE_PATH)
+    df_voluntariado_raw = medidor.medir('carregar_voluntariado', analysis.carregar_dados, analysis.RAW_VOLUNTARIADO_PATH)
+    df_states_coords = analysis.carregar_dados(analysis.STATES_COORDS_PATH)
+
+    df_demografico = medidor.medir('processar_inscricoes', analysis.processar_dados_inscricoes, df_inscricoes_raw, data_referencia, economizar_memoria)
+    medidor.medir('crescimento', analysis.gerar_analise_de_crescimento, df_inscricoes_raw)
+    del df_inscricoes_raw
+    df_fato = medidor.medir('fato_inscricoes', analysis.salvar_fato_inscricoes, df_demografico)
+    df_profissional = medidor.medir('processar_perfil', analysis.processar_dados_perfil, df_profile_raw, economizar_memoria)
+    del df_profile_raw
+    df_voluntario = medidor.medir('processar_voluntariado', analysis.processar_dados_voluntariado, df_voluntariado_raw, economizar_memoria)
+    del df_voluntariado_raw
+    df_final = medidor.medir('consolidar', analysis.consolidar_dados, df_demografico, df_profissional, df_voluntario, economizar_memoria)
+    del df_demografico, df_profissional, df_voluntario
+
+    armazem_tags = medidor.medir('tags', analysis.salvar_armazem_tags, df_final)
+    df_final = medidor.medir('clustering', analysis.descobrir_personas_com_clustering, df_final, True, personas, armazem_tags)
+
+    def gravar_relatorios():
+        analysis.salvar_contagem_atuacao(df_final, armazem_tags)
+        df_pessoas = analysis.salvar_dimensao_pessoas(df_final)
+        analysis.salvar_cubo(df_pessoas, df_fato)
+        analysis.salvar_resumo_mapa(df_pessoas, df_states_coords)
+        salvar_tabela(df_final, analysis.PROCESSED_FINAL_PATH)
+    medidor.medir('relatorios', gravar_relatorios)
+
+
+def _normalizar(df: pd.DataFrame) -> pd.DataFrame:
+    """Converte cada valor para uma representação textual comparável entre tipos.
+
+    Colunas numéricas viram float arredondado e nulos de qualquer tipo viram
+    o mesmo marcador, de modo que uma troca de tipo que preserva os valores
+    (categoria ↔ texto, inteiro ↔ float) não conta como diferença.
+    """
+    colunas = {}
+    for nome, coluna in df.items():
+        if pd.api.types.is_numeric_dtype(coluna) and not pd.api.types.is_bool_dtype(coluna):
+            coluna = coluna.astype('float64').round(CASAS_DECIMAIS)
+        nulos = coluna.isna().to_numpy()
+        valores = [repr(v.tolist() if isinstance(v, np.ndarray) else v) for v in coluna.astype(object).tolist()]
+        colunas[nome] = np.where(nulos, '<nulo>', np.array(valores, dtype=object))
+    return pd.DataFrame(colunas)
+
+
+def _alinhar_linhas(df: pd.DataFrame) -> pd.DataFrame:
+    """Ordena uma tabela normalizada por todas as colunas, da primeira à última.
+
+    As colunas que identificam as linhas (ids, datas, categorias) vêm antes das
+    medidas nas tabelas do pipeline, então linhas com a mesma chave ficam lado
+    a lado e a primeira diferença aponta para a linha certa.
+    """
+    return df.sort_values(list(df.columns), kind='stable', ignore_index=True)
+
+
+def comparar_tabelas(atual: pd.DataFrame, referencia: pd.DataFrame) -> str | None:
+    """Compara duas tabelas valor a valor, independentemente da ordem das linhas.
+
+    As linhas das duas tabelas são alinhadas pelos valores normalizados de
+    todas as colunas (ver `_alinhar_linhas`) antes da comparação, de modo que
+    só um conteúdo diferente, e não uma ordem diferente, conta como diferença.
+
+    Returns:
+        str | None: Descrição da primeira diferença encontrada, ou None se forem equivalentes.
+    """
+    if list(atual.columns) != list(referencia.columns):
+        return f"colunas diferentes: {list(atual.columns)} x {list(referencia.columns)}"
+    if len(atual) != len(referencia):
+        return f"número de linhas diferente: {len(atual)} x {len(referencia)}"
+    atual, referencia = _alinhar_linhas(_normalizar(atual)), _alinhar_linhas(_normalizar(referencia))
+    for coluna in atual.columns:
+        diferentes = np.flatnonzero(atual[coluna].to_numpy() != referencia[coluna].to_numpy())
+        if len(diferentes):
+            linha = diferentes[0]
+            return (f"coluna '{coluna}' difere em {len(diferentes)} linhas "
+                    f"(linha {linha} das tabelas ordenadas: {atual[coluna].iat[linha]} x {referencia[coluna].iat[linha]})")
+    return None
+
+
+def tabelas_gravadas(raiz: str) -> list:
+    """Lista, relativas a `raiz`, as tabelas Parquet de dados e relatórios gravadas pela execução (fora do cache de etapas)."""
+    caminhos = [c for pasta in ('data', 'reports') for c in glob.glob(os.path.join(raiz, pasta, '**', '*.parquet'), recursive=True)]
+    return sorted(os.path.relpath(c, raiz) for c in caminhos if os.path.join('processed', 'cache') not in c)
+
+
+def verificar_equivalencia(raiz: str, dir_referencia: str) -> dict:
+    """Compara as tabelas gravadas em `raiz` com as da referência.
+
+    Returns:
+        dict: Diferença encontrada em cada tabela não equivalente (vazio se tudo for equivalente).
+    """
+    atuais, referencias = set(tabelas_gravadas(raiz)), set(tabelas_gravadas(dir_referencia))
+    diferencas = {tabela: 'ausente na execução atual' for tabela in referencias - atuais}
+    diferencas.update({tabela: 'ausente na referência' for tabela in atuais - referencias})
+    for tabela in sorted(atuais & referencias):
+        diferenca = comparar_tabelas(pd.read_parquet(os.path.join(raiz, tabela)), pd.read_parquet(os.path.join(dir_referencia, tabela)))
+        if diferenca:
+            diferencas[tabela] = diferenca
+    return diferencas
+
+
+def revisao_codigo() -> str:
+    """Retorna a revisão do git do código em execução ('desconhecida' fora de um repositório).
+
+    Uma revisão com alterações não commitadas recebe o sufixo '-modificada'.
+    """
+    try:
+        saida = subprocess.run(['git', 'describe', '--always', '--dirty=-modificada'], cwd=analysis.PROJECT_ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'desconhecida'
+    return saida or 'desconhecida'
+
+
+def diretorio_referencia(diretorio: str, linhas: int, semente: int, motor: str) -> str:
+    """Retorna a pasta da referência de um tamanho, semente e motor de clustering."""
+    return os.path.join(diretorio, f'{linhas}_{semente}', 'referencia', motor)
+
+
+def origem_referencia(dir_referencia: str) -> str | None:
+    """Retorna a revisão que gravou a referência, ou None se não houver referência."""
+    if not os.path.isdir(dir_referencia):
+        return None
+    try:
+        with open(os.path.join(dir_referencia, ARQUIVO_ORIGEM_REFERENCIA), encoding='utf-8') as f:
+            return f.read().strip() or 'desconhecida'
+    except FileNotFoundError:
+        return 'desconhecida'
+
+
+def gravar_referencia(raiz: str, dir_referencia: str):
+    """Guarda as tabelas gravadas em `raiz` como a referência, com a revisão do código que as gravou."""
+    shutil.rmtree(dir_referencia, ignore_errors=True)
+    for tabela in tabelas_gravadas(raiz):
+        destino = os.path.join(dir_referencia, tabela)
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        shutil.copy2(os.path.join(raiz, tabela), destino)
+    os.makedirs(dir_referencia, exist_ok=True)
+    with open(os.path.join(dir_referencia, ARQUIVO_ORIGEM_REFERENCIA), 'w', encoding='utf-8') as f:
+        f.write(revisao_codigo() + '\n')
+
+
+def medir_tamanho(linhas: int, diretorio: str = BENCHMARK_DIR, semente: int = 42, personas: ConfiguracaoPersonas | None = None,
+                  rastrear_python: bool = False, regravar_referencia: bool = False, economizar_memoria: bool = False) -> pd.DataFrame:
+    """Gera (ou reaproveita) os dados de um tamanho, mede as etapas e verifica a equivalência.
+
+    Os dados sintéticos ficam em `<diretorio>/<linhas>_<semente>/data/raw/` e
+    são reaproveitados entre execuções; as saídas de cada execução são apagadas
+    e regravadas na mesma pasta. A referência fica em
+    `<diretorio>/<linhas>_<semente>/referencia/<motor>/` e só é gravada
+    quando `regravar_referencia` for True; sem ela, a execução não é comparada
+    com nada e fica marcada como 'sem referência'.
+
+    Args:
+        linhas (int): Número de inscrições.
+        diretorio (str): Diretório do benchmark.
+        semente (int): Semente dos dados sintéticos.
+        personas (ConfiguracaoPersonas, optional): Opções do clustering de personas.
+        rastrear_python (bool): Se True, também mede o pico de memória do Python em cada etapa com o `tracemalloc`.
+        regravar_referencia (bool): Se True, a execução atual substitui a referência.
+        economizar_memoria (bool): Se True, mede o modo de memória reduzida do pipeline.
+
+    Returns:
+        pd.DataFrame: Uma linha por etapa, com o tempo, os picos de memória e a
+                      coluna 'equivalente' ('sim', 'não', 'sem referência' ou
+                      'referência', quando a execução acabou de ser gravada
+                      como referência).
+    """
+    personas = personas or ConfiguracaoPersonas()
+    raiz = os.path.join(diretorio, f'{linhas}_{semente}')
+    dir_referencia = diretorio_referencia(diretorio, linhas, semente, personas.motor)
+    with caminhos_em(raiz):
+        if not os.path.exists(analysis.RAW_INSCRICOES_PATH):
+            logger.info(f"[benchmark] Gerando {linhas} inscrições sintéticas em {raiz}...")
+            dados_sinteticos.gerar_arquivos(os.path.dirname(analysis.RAW_INSCRICOES_PATH), linhas, semente)
+        for saida in (os.path.dirname(analysis.PROCESSED_FINAL_PATH), os.path.dirname(analysis.PERSONA_SUMMARY_PATH)):
+            shutil.rmtree(saida, ignore_errors=True)
+        medidor = Medidor(rastrear_python)
+        executar_etapas(medidor, personas, economizar_memoria=economizar_memoria)
+
+    origem = origem_referencia(dir_referencia)
+    if regravar_referencia:
+        gravar_referencia(raiz, dir_referencia)
+        equivalente = 'referência'
+        logger.info(f"[benchmark] Saídas de {linhas} linhas gravadas como referência em {dir_referencia} (revisão {revisao_codigo()})")
+    elif origem is None:
+        equivalente = 'sem referência'
+        logger.error(f"[benchmark] Não há referência em {dir_referencia}: as saídas de {linhas} linhas não foram verificadas.")
+    else:
+        diferencas = verificar_equivalencia(raiz, dir_referencia)
+        equivalente = 'sim' if not diferencas else 'não'
+        logger.info(f"[benchmark] Saídas de {linhas} linhas comparadas com a referência da revisão {origem}.")
+        for tabela, diferenca in diferencas.items():
+            logger.error(f"[benchmark] {tabela} não é equivalente à referência: {diferenca}")
+
+    medidas = pd.DataFrame(medidor.medidas)
+    medidas.insert(0, 'linhas', linhas)
+    medidas.insert(1, 'memoria', 'reduzida' if economizar_memoria else 'padrão')
+    medidas['equivalente'] = equivalente
+    return medidas
+
+
+def resumir_memoria(resultados: pd.DataFrame) -> pd.DataFrame:
+    """Compara o maior pico de memória de cada tamanho entre o modo padrão e o de memória reduzida.
+
+    Args:
+        resultados (pd.DataFrame): Medidas de `medir_tamanho` com os dois modos.
+
+    Returns:
+        pd.DataFrame: Uma linha por tamanho com o pico de cada modo (MB) e a razão entre eles.
+    """
+    picos = resultados.pivot_table(index='linhas', columns='memoria', values='pico_rss_mb', aggfunc='max')
+    picos['reducao'] = picos['padrão'] / picos['reduzida']
+    return picos.rename(columns={'padrão': 'pico_padrao_mb', 'reduzida': 'pico_reduzida_mb'}).reset_index().rename_axis(columns=None)
+
+
+def main(argv: list | None = None) -> int:
+    """Mede o pipeline nos tamanhos pedidos e grava os resultados em `<diretorio>/resultados.csv`.
+
+    Sem `--gravar-referencia`, todos os tamanhos precisam de uma referência
+    gravada antes; se faltar alguma, nada é medido.
+
+    Returns:
+        int: 0 se todas as saídas forem equivalentes à referência, 1 caso contrário.
+    """
+    parser = argparse.ArgumentParser(description="Mede o tempo e a memória de cada etapa do pipeline sobre dados sintéticos.")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=list(TAMANHOS_PADRAO), metavar='N', help="Números de inscrições medidos (ex: 10000 1000000).")
+    parser.add_argument('--diretorio', default=BENCHMARK_DIR, help="Diretório dos dados sintéticos, das execuções e das referências.")
+    parser.add_argument('--semente', type=int, default=42, help="Semente dos dados sintéticos.")
+    parser.add_argument('--motor-clustering', choices=MOTORES_CLUSTERING, default='kmeans', help="Motor usado para descobrir as personas.")
+    parser.add_argument('--tracemalloc', action='store_true', help="Também mede o pico de memória do Python em cada etapa (deixa as etapas mais lentas).")
+    parser.add_argument('--gravar-referencia', action='store_true',
+                        help="Grava as saídas desta execução como a referência de equivalência (use um checkout fixado da implementação de comparação).")
+    parser.add_argument('--memoria', choices=MODOS_MEMORIA, default='padrao',
+                        help="Mede o pipeline padrão, o modo de memória reduzida ou os dois, comparando o pico de memória de cada tamanho.")
+    args = parser.parse_args(argv)
+    analysis.configurar_logging()
+
+    personas = ConfiguracaoPersonas(args.motor_clustering, workers=1)
+    # Sem referência, os tempos não teriam com o que ser comparados: ela precisa ter sido gravada antes,
+    # explicitamente, e não pela primeira execução da implementação que está sendo medida.
+    sem_referencia = [linhas for linhas in args.tamanhos
+                      if origem_referencia(diretorio_referencia(args.diretorio, linhas, args.semente, personas.motor)) is None]
+    if sem_referencia and not args.gravar_referencia:
+        logger.error(f"Não há referência de equivalência para {sem_referencia} inscrições (semente {args.semente}, motor "
+                     f"'{personas.motor}'). Grave-a com --gravar-referencia a partir da implementação de comparação "
+                     f"(por exemplo, um 'git worktree' da revisão fixada, com o mesmo --diretorio) antes de medir.")
+        return 1
+
+    # Cada medida roda em um processo novo, para que o pico de memória de uma não
+    # herde a memória que a anterior não devolveu ao sistema. A referência só é
+    # regravada pela primeira execução de cada tamanho; a segunda é comparada com ela.
+    medidas = []
+    for linhas in args.tamanhos:
+        for i, economizar in enumerate(MODOS_MEMORIA[args.memoria]):
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                medidas.append(pool.submit(medir_tamanho, linhas, args.diretorio, args.semente, personas, args.tracemalloc,
+                                           args.gravar_referencia and i == 0, economizar).result())
+    resultados = pd.concat(medidas, ignore_index=True)
+    os.makedirs(args.diretorio, exist_ok=True)
+    resultados.to_csv(os.path.join(args.diretorio, 'resultados.csv'), index=False)
+    logger.info("Resultados do benchmark:\n" + resultados.to_string(index=False, float_format=lambda v: f'{v:.2f}'))
+    if args.memoria == 'ambas':
+        logger.info("Pico de memória por tamanho:\n" + resumir_memoria(resultados).to_string(index=False, float_format=lambda v: f'{v:.2f}'))
+    if resultados['equivalente'].isin(['não', 'sem referência']).any():
+        logger.error("Há saídas diferentes da referência: os tempos dessas execuções não valem como comparação.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+"""
+Cache de Etapas - TransDevs Data Analysis
+
+Este módulo guarda em disco o resultado das etapas do pipeline, endereçado
+pelo conteúdo: a chave de uma etapa é o hash do seu código, dos seus
+parâmetros (inclusive tabelas de mapeamento), dos arquivos que ela lê e das
+chaves das etapas das quais depende. Se nada disso mudou desde a última
+execução, a etapa não é executada de novo; se um arquivo bruto muda, apenas as
+etapas que dependem dele são recalculadas.
+
+Para etapas que gravam arquivos (relatórios, arquivo consolidado, estado
+incremental), a entrada do cache também registra tamanho e data de
+modificação desses arquivos: se algum deles sumiu ou foi alterado por fora,
+a etapa é executada novamente.
+"""
+
+import os
+import glob
+import json
+import pickle
+import hashlib
+import inspect
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Versão do formato das entradas; alterá-la invalida todo o cache.
+VERSAO_CACHE = 1
+
+# Índice com o hash de conteúdo dos arquivos de entrada, por tamanho e data de modificação.
+INDICE_HASHES = 'hashes_arquivos.json'
+
+
+def _novo_hash():
+    return hashlib.blake2b(digest_size=16)
+
+
+def _serializar(objeto) -> bytes:
+    """Serializa um parâmetro para o hash da chave.
+
+    Funções, classes e módulos entram pelo código-fonte, para que editar uma
+    regra de normalização invalide as etapas que a usam. Objetos com o método
+    `chave_cache` entram pelo que ele retorna, para que opções que não mudam o
+    resultado (como o número de processos) não invalidem a etapa.
+    """
+    if hasattr(objeto, 'chave_cache') and not inspect.isclass(objeto):
+        return _serializar(objeto.chave_cache())
+    if inspect.isfunction(objeto) or inspect.ismethod(objeto) or inspect.isclass(objeto) or inspect.ismodule(objeto):
+        return inspect.getsource(objeto).encode('utf-8')
+    if isinstance(objeto, (list, tuple)):
+        return b'[' + b','.join(_serializar(item) for item in objeto) + b']'
+    return pickle.dumps(objeto, protocol=4)
+
+
+def _estatisticas(caminho: str) -> list | None:
+    """Retorna [tamanho, mtime_ns] de um arquivo, ou None se ele não existir."""
+    try:
+        info = os.stat(caminho)
+    except FileNotFoundError:
+        return None
+    return [info.st_size, info.st_mtime_ns]
+
+
+class CacheEtapas:
+    """Cache em disco dos resultados das etapas, endereçado pelo conteúdo.
+
+    Cada etapa mantém apenas a entrada mais recente: `<etapa>-<chave>.json`
+    com os metadados e, se o resultado for guardado, `<etapa>-<chave>.pkl`.
+
+    Args:
+        diretorio (str): Diretório do cache.
+        invalidar (bool or set): True ignora (e substitui) todas as entradas;
+                                 um conjunto de nomes ignora as dessas etapas
+                                 e das etapas que dependem delas.
+    """
+
+    def __init__(self, diretorio: str, invalidar: bool | set = False):
+        self.diretorio = diretorio
+        self.invalidar = invalidar
+        os.makedirs(diretorio, exist_ok=True)
+        caminho_indice = os.path.join(diretorio, INDICE_HASHES)
+        self._indice_hashes = {}
+        if os.path.exists(caminho_indice):
+            with open(caminho_indice, encoding='utf-8') as f:
+                self._indice_hashes = json.load(f)
+
+    def hash_arquivo(self, caminho: str) -> str:
+        """Hash do conteúdo de um arquivo, reaproveitado enquanto tamanho e mtime não mudam."""
+        estatisticas = _estatisticas(caminho)
+        if estatisticas is None:
+            return 'ausente'
+        memorizado = self._indice_hashes.get(caminho)
+        if memorizado and memorizado[:2] == estatisticas:
+            return memorizado[2]
+        h = _novo_hash()
+        with open(caminho, 'rb') as f:
+            for bloco in iter(lambda: f.read(1 << 20), b''):
+                h.update(bloco)
+        self._indice_hashes[caminho] = estatisticas + [h.hexdigest()]
+        with open(os.path.join(self.diretorio, INDICE_HASHES), 'w', encoding='utf-8') as f:
+            json.dump(self._indice_hashes, f)
+        return h.hexdigest()
+
+    def chave(self, etapa, chaves_dependencias: list) -> str:
+        """Calcula a chave de uma etapa a partir de código, parâmetros, entradas e dependências."""
+        h = _novo_hash()
+        for parte in (VERSAO_CACHE, etapa.nome):
+            h.update(repr(parte).encode('utf-8'))
+        h.update(_serializar(etapa.funcao))
+        h.update(_serializar(etapa.parametros))
+        h.update(_serializar(etapa.argumentos))
+        for caminho in etapa.entradas:
+            h.update(self.hash_arquivo(caminho).encode('utf-8'))
+        for chave in chaves_dependencias:
+            h.update(chave.encode('utf-8'))
+        return h.hexdigest()
+
+    def _caminho(self, nome: str, chave: str, extensao: str) -> str:
+        return os.path.join(self.diretorio, f'{nome}-{chave}.{extensao}')
+
+    def invalidada(self, etapa) -> bool:
+        """Indica se a entrada da etapa foi invalidada à força nesta execução."""
+        return self.invalidar is True or bool(self.invalidar and etapa.nome in self.invalidar)
+
+    def valida(self, etapa, chave: str) -> bool:
+        """Indica se há uma entrada válida para a etapa com essa chave."""
+        if self.invalidada(etapa):
+            return False
+        caminho = self._caminho(etapa.nome, chave, 'json')
+        if not os.path.exists(caminho):
+            return False
+        with open(caminho, encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta['guardado'] and not os.path.exists(self._caminho(etapa.nome, chave, 'pkl')):
+            return False
+        return all(_estatisticas(c) == e for c, e in meta['saidas'].items())
+
+    def carregar(self, etapa, chave: str):
+        """Carrega o resultado guardado de uma etapa (None se ele não foi guardado)."""
+        caminho = self._caminho(etapa.nome, chave, 'pkl')
+        if not os.path.exists(caminho):
+            return None
+        with open(caminho, 'rb') as f:
+            return pickle.load(f)
+
+    def gravar(self, etapa, chave: str, resultado):
+        """Grava a entrada da etapa e remove as entradas anteriores dela."""
+        for antigo in glob.glob(os.path.join(self.diretorio, f'{etapa.nome}-*')):
+            os.remove(antigo)
+        if etapa.guardar:
+            with open(self._caminho(etapa.nome, chave, 'pkl'), 'wb') as f:
+                pickle.dump(resultado, f, protocol=pickle.HIGHEST_PROTOCOL)
+        saidas = {c: _estatisticas(c) for c in etapa.saidas if _estatisticas(c) is not None}
+        with open(self._caminho(etapa.nome, chave, 'json'), 'w', encoding='utf-8') as f:
+            json.dump({'etapa': etapa.nome, 'guardado': etapa.guardar, 'saidas': saidas}, f, ensure_ascii=False, indent=2)
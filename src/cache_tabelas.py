@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+"""
+Cache de Tabelas do Dashboard - TransDevs Data Analysis
+
+O `st.cache_data` do Streamlit serializa o resultado e entrega uma cópia a
+cada chamada, então cada sessão aberta no dashboard mantém a sua própria
+cópia das tabelas. Este módulo mantém uma única cópia de cada versão de cada
+tabela para o processo inteiro (o objeto fica em um `st.cache_resource`) e
+entrega às sessões cópias rasas dela: com o Copy-on-Write do Pandas, elas
+compartilham os buffers (colunas Arrow de texto, categorias e arrays
+numéricos) sem copiar nenhum dado, e uma alteração feita por uma página não
+afeta a tabela compartilhada.
+
+O cache tem um orçamento de memória: quando a soma dos bytes residentes das
+tabelas passa dele, as tabelas usadas há mais tempo são descartadas (LRU).
+Versões antigas de uma tabela são descartadas assim que a versão nova é lida.
+"""
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def bytes_residentes(df: pd.DataFrame) -> int:
+    """Retorna os bytes ocupados por uma tabela, incluindo o índice e o conteúdo das colunas de texto."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class CacheTabelas:
+    """Cache de tabelas em memória, compartilhado entre as sessões, com orçamento de memória e descarte LRU.
+
+    A leitura de uma tabela ausente é feita com o cache travado, para que
+    várias sessões pedindo a mesma tabela ao mesmo tempo (como no início de
+    uma oficina) não a leiam, cada uma, para a memória.
+
+    Args:
+        orcamento_bytes (int): Limite da soma dos bytes residentes das tabelas.
+                               A tabela mais recente é mantida mesmo que sozinha
+                               passe do limite.
+    """
+
+    def __init__(self, orcamento_bytes: int):
+        self.orcamento_bytes = orcamento_bytes
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.faltas = 0
+        self.descartes = 0
+
+    def obter(self, caminho: str, versao: str, carregar) -> pd.DataFrame | None:
+        """Retorna uma cópia rasa (sem cópia de dados) da tabela, lendo-a se ela não estiver no cache.
+
+        Args:
+            caminho (str): Caminho da tabela.
+            versao (str): Versão dos arquivos da tabela; uma versão nova é lida de novo.
+            carregar (callable): Função que recebe o caminho e retorna a tabela, ou None.
+
+        Returns:
+            pd.DataFrame or None: A tabela, ou None se `carregar` retornar None
+                                  (nesse caso nada é guardado).
+        """
+        chave = (caminho, versao)
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is not None:
+                self._entradas.move_to_end(chave)
+                self.acertos += 1
+            else:
+                self.faltas += 1
+                tabela = carregar(caminho)
+                if tabela is None:
+                    return None
+                entrada = {'tabela': tabela, 'bytes': bytes_residentes(tabela), 'linhas': len(tabela), 'acessos': 0}
+                self._descartar([c for c in self._entradas if c[0] == caminho], 'versão antiga')
+                self._entradas[chave] = entrada
+                self._descartar_excesso()
+            entrada['acessos'] += 1
+            entrada['ultimo_acesso'] = datetime.now()
+            return entrada['tabela'].copy(deep=False)
+
+    def _descartar(self, chaves: list, motivo: str):
+        for chave in chaves:
+            entrada = self._entradas.pop(chave)
+            self.descartes += 1
+            logger.info(f"Cache de tabelas: '{os.path.basename(chave[0])}' ({entrada['bytes'] / 1024 ** 2:.1f} MB) descartada ({motivo}).")
+
+    def _descartar_excesso(self):
+        """Descarta as tabelas usadas há mais tempo até o total caber no orçamento (mantendo a mais recente)."""
+        while len(self._entradas) > 1 and self.total_bytes() > self.orcamento_bytes:
+            self._descartar([next(iter(self._entradas))], 'orçamento de memória')
+
+    def total_bytes(self) -> int:
+        """Retorna a soma dos bytes residentes das tabelas no cache."""
+        return sum(entrada['bytes'] for entrada in self._entradas.values())
+
+    def resumo(self) -> pd.DataFrame:
+        """Retorna uma linha por tabela no cache, da usada há mais tempo para a mais recente.
+
+        Returns:
+            pd.DataFrame: As colunas 'tabela', 'versao', 'linhas', 'mb_residentes',
+                          'acessos' e 'ultimo_acesso'.
+        """
+        with self._lock:
+            linhas = [{'tabela': os.path.basename(caminho), 'versao': versao, 'linhas': entrada['linhas'],
+                       'mb_residentes': round(entrada['bytes'] / 1024 ** 2, 3), 'acessos': entrada['acessos'],
+                       'ultimo_acesso': entrada['ultimo_acesso']}
+                      for (caminho, versao), entrada in self._entradas.items()]
+        return pd.DataFrame(linhas, columns=['tabela', 'versao', 'linhas', 'mb_residentes', 'acessos', 'ultimo_acesso'])
@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+
+"""
+Motores de Clustering - TransDevs Data Analysis
+
+Este módulo ajusta o modelo de personas usado por `analysis.py`. O motor
+padrão, 'kmeans', é o K-Means completo com `n_init=10` de sempre. Para bases
+grandes há dois motores mais leves:
+
+- 'minibatch': `MiniBatchKMeans`, que atualiza os centróides com lotes
+  sorteados da matriz de features em vez de percorrê-la inteira a cada
+  iteração;
+- 'streaming': ajusta o pré-processamento em uma passada e alimenta o
+  `MiniBatchKMeans.partial_fit` bloco a bloco, transformando um bloco por vez,
+  de modo que a matriz one-hot + padronizada nunca é montada por completo.
+
+Todos os motores retornam o mesmo tipo de `Pipeline` (pré-processador +
+modelo com `predict`), então a coluna 'persona', os relatórios e o modelo
+salvo para o modo incremental continuam compatíveis. `comparar_com_kmeans`
+mede a qualidade de um motor em relação ao K-Means completo.
+
+Para escolher o número de personas, `varrer_k` ajusta os candidatos de K em
+paralelo sobre a matriz de features já pré-processada, gravada uma única vez
+em disco e aberta por memory map em cada processo, e calcula a inércia (para
+o método do cotovelo) e a silhueta em uma amostra.
+"""
+
+import os
+import glob
+import pickle
+import hashlib
+import logging
+import contextlib
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+from scipy import sparse
+
+# O scikit-learn leva mais de um segundo para importar e só é usado ao ajustar
+# modelos, então é importado dentro das funções; os relatórios que não usam
+# personas não pagam esse custo.
+if TYPE_CHECKING:
+    from sklearn.compose import ColumnTransformer
+    from sklearn.pipeline import Pipeline
+
+logger = logging.getLogger(__name__)
+
+# Motores aceitos por `ajustar_modelo_personas`.
+MOTORES_CLUSTERING = ('kmeans', 'minibatch', 'streaming')
+
+# Semente usada por todos os motores, para resultados reprodutíveis.
+SEMENTE_CLUSTERING = 42
+
+# Linhas por lote do MiniBatchKMeans e por bloco do motor 'streaming'.
+TAMANHO_LOTE_CLUSTERING = 4096
+TAMANHO_BLOCO_CLUSTERING = 100_000
+
+# Passadas completas sobre os blocos no motor 'streaming'.
+EPOCAS_STREAMING = 10
+
+# Número padrão de personas e candidatos avaliados pela varredura de K.
+K_PADRAO = 4
+K_CANDIDATOS_PADRAO = tuple(range(2, 11))
+
+# Máximo de linhas usadas no cálculo da silhueta, que é quadrático no número de linhas.
+AMOSTRA_SILHUETA = 10_000
+
+
+class ConfiguracaoPersonas:
+    """Opções do clustering de personas.
+
+    Args:
+        motor (str): 'kmeans', 'minibatch' ou 'streaming'.
+        comparar (bool): Se True, compara o motor com o K-Means completo.
+        k (int, optional): Número de personas; None escolhe K pela varredura.
+        candidatos (tuple): Valores de K avaliados pela varredura.
+        varrer (bool): Se True, executa a varredura de K mesmo com `k` fixo,
+                       para atualizar a curva do cotovelo.
+        workers (int): Número de processos usados pela varredura.
+    """
+
+    def __init__(self, motor: str = 'kmeans', comparar: bool = False, k: int | None = K_PADRAO,
+                 candidatos: tuple = K_CANDIDATOS_PADRAO, varrer: bool = False, workers: int = 1):
+        self.motor = motor
+        self.comparar = comparar
+        self.k = k
+        self.candidatos = tuple(candidatos)
+        self.varrer = varrer
+        self.workers = workers
+
+    def chave_cache(self) -> tuple:
+        """Opções que alteram o resultado; o número de processos fica de fora."""
+        return (self.motor, self.comparar, self.k, self.candidatos, self.varrer)
+
+
+def criar_preprocessador(categoricas: list, numericas: list) -> 'ColumnTransformer':
+    """Cria o pré-processador das features das personas.
+
+    Numéricas são padronizadas com StandardScaler e categóricas transformadas
+    com OneHotEncoder (ignorando categorias desconhecidas).
+
+    Args:
+        categoricas (list): Nomes das features categóricas.
+        numericas (list): Nomes das features numéricas.
+
+    Returns:
+        ColumnTransformer: O pré-processador, ainda não ajustado.
+    """
+    from sklearn.compose import ColumnTransformer
+    from sklearn.preprocessing import StandardScaler, OneHotEncoder
+    return ColumnTransformer(
+        transformers=[
+            ('num', StandardScaler(), numericas),
+            ('cat', OneHotEncoder(handle_unknown='ignore'), categoricas)
+        ])
+
+
+def _blocos(n_linhas: int, tamanho_bloco: int):
+    """Gera os intervalos [inicio, fim) de cada bloco de linhas."""
+    for inicio in range(0, n_linhas, tamanho_bloco):
+        yield inicio, min(inicio + tamanho_bloco, n_linhas)
+
+
+def ajustar_modelo_personas(df_model: pd.DataFrame, categoricas: list, numericas: list, n_clusters: int,
+                            motor: str = 'kmeans', tamanho_bloco: int = TAMANHO_BLOCO_CLUSTERING) -> tuple['Pipeline', np.ndarray]:
+    """Ajusta o modelo de personas com o motor escolhido.
+
+    Args:
+        df_model (pd.DataFrame): Linhas com todas as features preenchidas.
+        categoricas (list): Nomes das features categóricas.
+        numericas (list): Nomes das features numéricas.
+        n_clusters (int): Número de personas.
+        motor (str): 'kmeans', 'minibatch' ou 'streaming'.
+        tamanho_bloco (int): Linhas transformadas por vez no motor 'streaming'.
+
+    Returns:
+        tuple[Pipeline, np.ndarray]: O pipeline ajustado e o cluster (a partir
+                                     de 0) de cada linha de `df_model`.
+    """
+    if motor not in MOTORES_CLUSTERING:
+        raise ValueError(f"Motor de clustering desconhecido: '{motor}'. Opções: {MOTORES_CLUSTERING}")
+    from sklearn.cluster import KMeans, MiniBatchKMeans
+    from sklearn.pipeline import Pipeline
+    preprocessor = criar_preprocessador(categoricas, numericas)
+
+    if motor == 'kmeans':
+        modelo = KMeans(n_clusters=n_clusters, random_state=SEMENTE_CLUSTERING, n_init=10) # n_init para maior robustez
+    elif motor == 'minibatch':
+        modelo = MiniBatchKMeans(n_clusters=n_clusters, random_state=SEMENTE_CLUSTERING, n_init=10,
+                                 batch_size=TAMANHO_LOTE_CLUSTERING)
+
+    if motor != 'streaming':
+        pipeline = Pipeline(steps=[('preprocessor', preprocessor), ('cluster', modelo)])
+        return pipeline, pipeline.fit_predict(df_model)
+
+    # Motor 'streaming': o pré-processador precisa apenas de médias, desvios e das
+    # categorias, obtidos em uma passada; a matriz é montada um bloco por vez.
+    # As linhas são embaralhadas uma vez, para que cada bloco não reflita a ordem de inscrição.
+    preprocessor.fit(df_model)
+    n_linhas = len(df_model)
+    ordem = np.random.default_rng(SEMENTE_CLUSTERING).permutation(n_linhas)
+
+    # Como o partial_fit faz uma única inicialização, os centróides iniciais vêm de
+    # um K-Means com várias inicializações sobre o primeiro bloco (uma amostra aleatória).
+    X_amostra = preprocessor.transform(df_model.iloc[ordem[:tamanho_bloco]])
+    centros = KMeans(n_clusters=n_clusters, random_state=SEMENTE_CLUSTERING, n_init=10).fit(X_amostra).cluster_centers_
+    modelo = MiniBatchKMeans(n_clusters=n_clusters, random_state=SEMENTE_CLUSTERING, init=centros, n_init=1,
+                             batch_size=TAMANHO_LOTE_CLUSTERING)
+    for _ in range(EPOCAS_STREAMING):
+        for inicio, fim in _blocos(n_linhas, tamanho_bloco):
+            X_bloco = preprocessor.transform(df_model.iloc[ordem[inicio:fim]])
+            # Cada partial_fit é um passo de mini-batch sobre um lote do bloco.
+            for lote_inicio, lote_fim in _blocos(X_bloco.shape[0], TAMANHO_LOTE_CLUSTERING):
+                modelo.partial_fit(X_bloco[lote_inicio:lote_fim])
+    labels = np.concatenate([modelo.predict(preprocessor.transform(df_model.iloc[inicio:fim]))
+                             for inicio, fim in _blocos(n_linhas, tamanho_bloco)])
+    return Pipeline(steps=[('preprocessor', preprocessor), ('cluster', modelo)]), labels
+
+
+def acordo_rotulos(referencia: np.ndarray, rotulos: np.ndarray) -> float:
+    """Fração de linhas com o mesmo cluster, após casar os rótulos dos dois agrupamentos.
+
+    Os números dos clusters são arbitrários, então os rótulos são casados pelo
+    pareamento de maior sobreposição (algoritmo húngaro) antes da comparação.
+    """
+    from scipy.optimize import linear_sum_assignment
+    _, ref_codigos = np.unique(referencia, return_inverse=True)
+    _, rot_codigos = np.unique(rotulos, return_inverse=True)
+    contingencia = np.zeros((ref_codigos.max() + 1, rot_codigos.max() + 1), dtype=np.int64)
+    np.add.at(contingencia, (ref_codigos, rot_codigos), 1)
+    linhas, colunas = linear_sum_assignment(contingencia, maximize=True)
+    return contingencia[linhas, colunas].sum() / len(referencia)
+
+
+def comparar_com_kmeans(df_model: pd.DataFrame, pipeline: 'Pipeline', rotulos: np.ndarray, categoricas: list,
+                        numericas: list, n_clusters: int, motor: str) -> pd.DataFrame:
+    """Compara o modelo de um motor com o K-Means completo nos mesmos dados.
+
+    A inércia dos dois é calculada sobre a mesma matriz (a do pré-processador
+    do K-Means completo), para que os valores sejam comparáveis.
+
+    Args:
+        df_model (pd.DataFrame): Linhas usadas no ajuste.
+        pipeline (Pipeline): Pipeline ajustado pelo motor avaliado.
+        rotulos (np.ndarray): Clusters atribuídos pelo motor avaliado.
+        categoricas (list): Nomes das features categóricas.
+        numericas (list): Nomes das features numéricas.
+        n_clusters (int): Número de personas.
+        motor (str): Nome do motor avaliado.
+
+    Returns:
+        pd.DataFrame: Uma linha por motor ('kmeans' e o avaliado) com inércia,
+                      razão de inércia, ARI e acordo de rótulos em relação ao
+                      K-Means completo.
+    """
+    from sklearn.metrics import adjusted_rand_score
+    referencia, rotulos_referencia = ajustar_modelo_personas(df_model, categoricas, numericas, n_clusters, 'kmeans')
+    X = referencia.named_steps['preprocessor'].transform(df_model)
+    inercia_referencia = referencia.named_steps['cluster'].inertia_
+    inercia_motor = -pipeline.named_steps['cluster'].score(X)
+    comparacao = pd.DataFrame([
+        {'motor': 'kmeans', 'inercia': inercia_referencia, 'razao_inercia': 1.0, 'ari': 1.0, 'acordo_rotulos': 1.0},
+        {'motor': motor, 'inercia': inercia_motor, 'razao_inercia': inercia_motor / inercia_referencia,
+         'ari': adjusted_rand_score(rotulos_referencia, rotulos), 'acordo_rotulos': acordo_rotulos(rotulos_referencia, rotulos)},
+    ])
+    comparacao['n_amostras'] = len(df_model)
+    logger.info(f"Motor '{motor}' vs K-Means completo: razão de inércia {comparacao['razao_inercia'].iloc[1]:.4f}, "
+                f"ARI {comparacao['ari'].iloc[1]:.4f}, acordo de rótulos {comparacao['acordo_rotulos'].iloc[1]:.1%}")
+    return comparacao
+
+
+def matriz_features(df_model: pd.DataFrame, categoricas: list, numericas: list, diretorio: str) -> tuple['ColumnTransformer', str]:
+    """Pré-processa as features uma única vez e grava a matriz densa em disco.
+
+    A matriz é identificada pelo conteúdo das features: se os dados não
+    mudaram desde a última execução, o arquivo existente é reaproveitado sem
+    ajustar o pré-processador de novo. Só a matriz mais recente é mantida.
+
+    Args:
+        df_model (pd.DataFrame): Linhas com todas as features preenchidas.
+        categoricas (list): Nomes das features categóricas.
+        numericas (list): Nomes das features numéricas.
+        diretorio (str): Diretório onde a matriz (.npy) e o pré-processador são gravados.
+
+    Returns:
+        tuple[ColumnTransformer, str]: O pré-processador ajustado e o caminho do
+                                       arquivo .npy, que pode ser aberto com
+                                       `np.load(caminho, mmap_mode='r')`.
+    """
+    h = hashlib.blake2b(repr((categoricas, numericas)).encode('utf-8'), digest_size=16)
+    h.update(pd.util.hash_pandas_object(df_model[categoricas + numericas], index=False).to_numpy().tobytes())
+    caminho_matriz = os.path.join(diretorio, f'matriz-{h.hexdigest()}.npy')
+    caminho_preprocessador = os.path.join(diretorio, f'matriz-{h.hexdigest()}.pkl')
+    if os.path.exists(caminho_matriz) and os.path.exists(caminho_preprocessador):
+        logger.info(f"Matriz de features reaproveitada de {caminho_matriz}")
+        with open(caminho_preprocessador, 'rb') as f:
+            return pickle.load(f), caminho_matriz
+
+    os.makedirs(diretorio, exist_ok=True)
+    for antigo in glob.glob(os.path.join(diretorio, 'matriz-*')):
+        os.remove(antigo)
+    preprocessor = criar_preprocessador(categoricas, numericas)
+    X = preprocessor.fit_transform(df_model)
+    if sparse.issparse(X):
+        X = X.toarray()
+    # Grava em um arquivo temporário para que uma execução interrompida não deixe uma matriz truncada.
+    temporario = caminho_matriz + '.tmp'
+    with open(temporario, 'wb') as f:
+        np.save(f, np.ascontiguousarray(X, dtype=np.float64))
+    os.replace(temporario, caminho_matriz)
+    with open(caminho_preprocessador, 'wb') as f:
+        pickle.dump(preprocessor, f)
+    logger.info(f"Matriz de features {X.shape} gravada em {caminho_matriz}")
+    return preprocessor, caminho_matriz
+
+
+def _avaliar_k(caminho_matriz: str, k: int, amostra_silhueta: int, uma_thread: bool) -> dict:
+    """Ajusta o K-Means com `k` clusters sobre a matriz em disco e mede inércia e silhueta."""
+    from sklearn.cluster import KMeans
+    from sklearn.metrics import silhouette_score
+    from threadpoolctl import threadpool_limits
+    X = np.load(caminho_matriz, mmap_mode='r')
+    # Com vários processos, cada K-Means usa uma thread para não disputar os núcleos.
+    with threadpool_limits(limits=1) if uma_thread else contextlib.nullcontext():
+        modelo = KMeans(n_clusters=k, random_state=SEMENTE_CLUSTERING, n_init=10).fit(X)
+        silhueta = silhouette_score(X, modelo.labels_, sample_size=min(amostra_silhueta, X.shape[0]),
+                                    random_state=SEMENTE_CLUSTERING)
+    return {'k': k, 'inercia': modelo.inertia_, 'silhueta': silhueta}
+
+
+def varrer_k(caminho_matriz: str, candidatos: tuple, workers: int = 1, amostra_silhueta: int = AMOSTRA_SILHUETA) -> pd.DataFrame:
+    """Avalia os candidatos de K em paralelo sobre a matriz de features em disco.
+
+    Cada processo abre a matriz por memory map, então ela não é copiada para
+    os processos nem pré-processada de novo para cada candidato.
+
+    Args:
+        caminho_matriz (str): Arquivo .npy gravado por `matriz_features`.
+        candidatos (tuple): Valores de K avaliados.
+        workers (int): Número máximo de processos (1 avalia em sequência).
+        amostra_silhueta (int): Máximo de linhas usadas no cálculo da silhueta.
+
+    Returns:
+        pd.DataFrame: Uma linha por K com 'k', 'inercia' e 'silhueta', em ordem de K.
+    """
+    candidatos = sorted(candidatos)
+    logger.info(f"Varrendo K em {candidatos} com {workers} processo(s)...")
+    argumentos = [(caminho_matriz, k, amostra_silhueta, workers > 1) for k in candidatos]
+    if workers <= 1:
+        resultados = [_avaliar_k(*a) for a in argumentos]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(candidatos))) as pool:
+            resultados = list(pool.map(_avaliar_k, *zip(*argumentos)))
+    return pd.DataFrame(resultados)
+
+
+def escolher_k(varredura: pd.DataFrame) -> int:
+    """Escolhe K pelo método do cotovelo.
+
+    Com K e inércia normalizados para [0, 1], o cotovelo é o ponto mais
+    distante, abaixo, da reta que liga o primeiro ao último candidato.
+
+    Args:
+        varredura (pd.DataFrame): Saída de `varrer_k`.
+
+    Returns:
+        int: O K escolhido.
+    """
+    k = varredura['k'].to_numpy(dtype=float)
+    inercia = varredura['inercia'].to_numpy(dtype=float)
+    if len(k) < 3 or inercia[0] == inercia[-1]:
+        return int(k[0])
+    x = (k - k[0]) / (k[-1] - k[0])
+    y = (inercia - inercia[-1]) / (inercia[0] - inercia[-1])
+    return int(k[np.argmax((1 - x) - y)])
+
+
+def salvar_grafico_cotovelo(varredura: pd.DataFrame, k_escolhido: int, caminho_figura: str):
+    """Grava a curva do cotovelo (inércia) com a silhueta de cada K.
+
+    Args:
+        varredura (pd.DataFrame): Saída de `varrer_k`.
+        k_escolhido (int): K destacado no gráfico.
+        caminho_figura (str): Caminho da imagem (.png).
+    """
+    # Importado aqui para que o pipeline só dependa do matplotlib quando gera a figura.
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.plot(varredura['k'], varredura['inercia'], marker='o', color='#C738D8', label='Inércia')
+    ax.axvline(k_escolhido, color='#888888', linestyle=':', label=f'K escolhido = {k_escolhido}')
+    ax.set_xlabel('Número de clusters (K)')
+    ax.set_ylabel('Inércia')
+    ax.set_xticks(varredura['k'])
+    ax_silhueta = ax.twinx()
+    ax_silhueta.plot(varredura['k'], varredura['silhueta'], marker='s', linestyle='--', color='#F5A9B8', label='Silhueta (amostra)')
+    ax_silhueta.set_ylabel('Silhueta')
+    linhas = ax.get_legend_handles_labels()
+    linhas_silhueta = ax_silhueta.get_legend_handles_labels()
+    ax.legend(linhas[0] + linhas_silhueta[0], linhas[1] + linhas_silhueta[1], loc='upper right')
+    ax.set_title('Método do Cotovelo para Escolha de K')
+    os.makedirs(os.path.dirname(caminho_figura), exist_ok=True)
+    fig.savefig(caminho_figura, bbox_inches='tight', dpi=150)
+    plt.close(fig)
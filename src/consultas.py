@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+"""
+Consultas SQL Embarcadas - TransDevs Data Analysis
+
+Backend opcional das consultas do dashboard. Em vez de carregar tabelas no
+Pandas, as páginas enviam cada contagem como uma consulta SQL a um DuckDB
+embarcado (no próprio processo, sem servidor) que lê diretamente os arquivos
+Parquet da dimensão de pessoas e da tabela fato de inscrições. Os filtros e
+agrupamentos são executados pelo DuckDB sobre as colunas necessárias e só o
+resultado agregado, com uma linha por combinação de valores, chega ao Pandas.
+
+`ConsultasSQL` tem a mesma interface de `cubo.ConsultasCubo` (`fatiar`,
+`total` e `tem_dimensoes`), mas aceita qualquer combinação de dimensões e
+filtros das duas tabelas, e não só os agrupamentos pré-calculados do cubo.
+O DuckDB é uma dependência opcional: sem ele, o dashboard usa o cubo.
+"""
+
+import os
+import pandas as pd
+from armazenamento import caminho_parquet, tipos_categoricos
+
+try:
+    import duckdb
+except ImportError:  # Backend opcional.
+    duckdb = None
+
+# Dimensões calculadas por pessoa a partir da tabela fato.
+DIMENSOES_DERIVADAS = ('n_inscricoes', 'cursos_inscritos')
+
+# Medidas aceitas por `ConsultasSQL.fatiar` e a sua expressão em cada nível de consulta.
+MEDIDAS_PESSOA = {'n_pessoas': 'COUNT(*)', 'n_inscricoes': 'SUM(n_inscricoes)'}
+MEDIDAS_INSCRICAO = {'n_pessoas': 'COUNT(DISTINCT person_id)', 'n_inscricoes': 'COUNT(*)'}
+
+
+def duckdb_disponivel() -> bool:
+    """Indica se o pacote `duckdb` está instalado."""
+    return duckdb is not None
+
+
+def _identificador(nome: str) -> str:
+    """Escreve o nome de uma coluna como identificador SQL entre aspas."""
+    return '"' + nome.replace('"', '""') + '"'
+
+
+def _literal(caminho: str) -> str:
+    """Escreve um caminho de arquivo como literal de texto SQL."""
+    return "'" + caminho.replace("'", "''") + "'"
+
+
+class ConsultasSQL:
+    """Consultas de contagem sobre os Parquet das tabelas do modelo estrela, executadas pelo DuckDB.
+
+    As views 'pessoas' e 'inscricoes' apontam para os arquivos e são lidas a
+    cada consulta, de modo que uma nova execução do pipeline é vista sem
+    reabrir a conexão. Consultas só sobre colunas de pessoas contam linhas da
+    dimensão; consultas que envolvem colunas da inscrição (como o curso)
+    contam as inscrições e as pessoas distintas delas, como o agrupamento de
+    cursos do cubo.
+
+    Args:
+        caminho_pessoas (str): Caminho CSV de referência da dimensão de pessoas.
+        caminho_inscricoes (str): Caminho CSV de referência da tabela fato de inscrições.
+
+    Raises:
+        ImportError: Se o `duckdb` não estiver instalado.
+        FileNotFoundError: Se o Parquet de alguma das tabelas não existir.
+    """
+
+    def __init__(self, caminho_pessoas: str, caminho_inscricoes: str):
+        if duckdb is None:
+            raise ImportError("O backend SQL do dashboard precisa do pacote 'duckdb' (pip install duckdb).")
+        parquets = {'pessoas': caminho_parquet(caminho_pessoas), 'inscricoes': caminho_parquet(caminho_inscricoes)}
+        faltantes = [caminho for caminho in parquets.values() if not os.path.exists(caminho)]
+        if faltantes:
+            raise FileNotFoundError(f"Tabelas Parquet não encontradas para o backend SQL: {faltantes}")
+
+        self._conexao = duckdb.connect(':memory:')
+        for view, caminho in parquets.items():
+            self._conexao.execute(f"CREATE VIEW {view} AS SELECT * FROM read_parquet({_literal(caminho)})")
+        self._conexao.execute(
+            "CREATE VIEW pessoas_inscricoes AS SELECT pessoas.*, "
+            "COALESCE(contagens.n_inscricoes, 0) AS n_inscricoes, COALESCE(contagens.cursos_inscritos, 0) AS cursos_inscritos "
+            "FROM pessoas LEFT JOIN (SELECT person_id, COUNT(*) AS n_inscricoes, COUNT(curso_titulo) AS cursos_inscritos "
+            "FROM inscricoes GROUP BY person_id) AS contagens USING (person_id)")
+        self.colunas_pessoas = set(self._colunas('pessoas'))
+        self.colunas_inscricoes = set(self._colunas('inscricoes')) - {'person_id'}
+        # Categorias (e a ordem delas) das colunas categóricas, que o DuckDB lê como texto.
+        self.tipos = {**tipos_categoricos(caminho_inscricoes), **tipos_categoricos(caminho_pessoas)}
+
+    def _colunas(self, view: str) -> list:
+        with self._conexao.cursor() as cursor:
+            return [linha[0] for linha in cursor.execute(f"DESCRIBE {view}").fetchall()]
+
+    def tem_dimensoes(self, *dimensoes: str) -> bool:
+        """Indica se todas as `dimensoes` são colunas das tabelas (ou dimensões derivadas)."""
+        return set(dimensoes) <= self.colunas_pessoas | self.colunas_inscricoes | set(DIMENSOES_DERIVADAS)
+
+    def _consultar(self, dimensoes: list, filtros: dict, medida: str) -> pd.DataFrame:
+        """Monta e executa a consulta agregada; os valores dos filtros são passados como parâmetros."""
+        necessarias = set(dimensoes) | set(filtros)
+        if not self.tem_dimensoes(*necessarias):
+            raise KeyError(f"Dimensões inexistentes nas tabelas: {sorted(necessarias - self.colunas_pessoas - self.colunas_inscricoes)}")
+        if medida not in MEDIDAS_PESSOA:
+            raise ValueError(f"Medida desconhecida: '{medida}'. Use uma de {list(MEDIDAS_PESSOA)}.")
+        if necessarias & self.colunas_inscricoes:
+            origem = 'inscricoes' + (' JOIN pessoas USING (person_id)' if necessarias & self.colunas_pessoas else '')
+            expressao = MEDIDAS_INSCRICAO[medida]
+        else:
+            derivadas = medida == 'n_inscricoes' or necessarias & set(DIMENSOES_DERIVADAS)
+            origem = 'pessoas_inscricoes' if derivadas else 'pessoas'
+            expressao = MEDIDAS_PESSOA[medida]
+
+        condicoes, parametros = [], []
+        for dimensao in dimensoes:
+            condicoes.append(f"{_identificador(dimensao)} IS NOT NULL")
+        for dimensao, valores in filtros.items():
+            valores = list(valores) if isinstance(valores, (list, tuple, set)) else [valores]
+            if not valores:
+                condicoes.append('FALSE')
+                continue
+            condicoes.append(f"{_identificador(dimensao)} IN ({', '.join('?' * len(valores))})")
+            parametros.extend(valores)
+        colunas = ', '.join(_identificador(d) for d in dimensoes)
+        sql = f"SELECT {colunas + ', ' if colunas else ''}CAST({expressao} AS BIGINT) AS {medida} FROM {origem}"
+        if condicoes:
+            sql += ' WHERE ' + ' AND '.join(condicoes)
+        if dimensoes:
+            sql += f" GROUP BY {colunas}"
+        # Cada consulta usa o seu próprio cursor, para que sessões em threads diferentes não compartilhem a conexão.
+        with self._conexao.cursor() as cursor:
+            return cursor.execute(sql, parametros).df()
+
+    def fatiar(self, dimensoes: list, filtros: dict | None = None, medida: str = 'n_pessoas') -> pd.Series:
+        """Soma uma medida por combinação de `dimensoes`, nas linhas que satisfazem `filtros`.
+
+        Tem o mesmo resultado de `cubo.fatiar`: combinações com valor nulo em
+        alguma das dimensões são descartadas e as colunas categóricas voltam
+        com as suas categorias (só as que ocorrem no resultado), na ordem do índice.
+
+        Args:
+            dimensoes (list): Dimensões do resultado.
+            filtros (dict, optional): Valor ou lista de valores aceitos em cada dimensão filtrada.
+            medida (str): 'n_pessoas' ou 'n_inscricoes'.
+
+        Returns:
+            pd.Series: A medida indexada pelas dimensões, sem combinações vazias.
+        """
+        resultado = self._consultar(list(dimensoes), filtros or {}, medida)
+        for dimensao in dimensoes:
+            if dimensao in self.tipos:
+                resultado[dimensao] = resultado[dimensao].astype(self.tipos[dimensao]).cat.remove_unused_categories()
+        return resultado.set_index(list(dimensoes))[medida].sort_index()
+
+    def total(self, filtros: dict | None = None, medida: str = 'n_pessoas') -> int:
+        """Soma uma medida sobre as linhas que satisfazem `filtros` (o total de pessoas, sem filtros)."""
+        valor = self._consultar([], filtros or {}, medida)[medida].iloc[0]
+        return 0 if pd.isna(valor) else int(valor)
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+
+"""
+Motor de Crescimento - TransDevs Data Analysis
+
+Este módulo calcula as análises de crescimento da comunidade a partir dos
+eventos de inscrição (`person_id` e data). Os eventos são reduzidos aos pares
+distintos pessoa × dia e ordenados uma única vez por (`person_id`, dia); a
+partir dessa ordem, a primeira inscrição de cada pessoa e todas as inscrições
+posteriores saem de comparações entre linhas vizinhas, e os períodos (dia,
+semana ou mês) são calculados por aritmética vetorizada sobre o número de
+dias desde 1970-01-01. Com isso, novas pessoas, pessoas que retornam, matrizes
+de retenção por coorte e janelas móveis são contagens (`np.bincount`) sobre
+arrays de inteiros, e o estado compacto pode ser gravado e acrescido de novos
+eventos no modo incremental.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+# Granularidades aceitas e o nome usado nos relatórios.
+GRANULARIDADES = {'D': 'diario', 'W': 'semanal', 'M': 'mensal'}
+
+# Número de períodos das janelas móveis.
+JANELA_PADRAO = 3
+
+# Número de períodos após a entrada acompanhados na matriz de retenção.
+IDADES_COORTE_PADRAO = 12
+
+# Arquivo com os pares pessoa × dia gravado por `MotorCrescimento.salvar`.
+ARQUIVO_ATIVIDADE = 'atividade_inscricoes.parquet'
+
+
+class ConfiguracaoCrescimento:
+    """Opções dos relatórios de crescimento.
+
+    Args:
+        granularidades (tuple): Granularidades geradas ('D', 'W' e/ou 'M'); o
+                                relatório mensal é sempre gerado, pois é o que
+                                o dashboard lê.
+        janela (int): Número de períodos das janelas móveis.
+        idades_coorte (int): Número de períodos após a entrada acompanhados na
+                             matriz de retenção.
+    """
+
+    def __init__(self, granularidades: tuple = ('M',), janela: int = JANELA_PADRAO, idades_coorte: int = IDADES_COORTE_PADRAO):
+        invalidas = [g for g in granularidades if g not in GRANULARIDADES]
+        if invalidas:
+            raise ValueError(f"Granularidades inválidas: {invalidas}. Use {list(GRANULARIDADES)}.")
+        self.granularidades = tuple(g for g in GRANULARIDADES if g == 'M' or g in granularidades)
+        self.janela = janela
+        self.idades_coorte = idades_coorte
+
+
+def periodos(dias: np.ndarray, granularidade: str) -> np.ndarray:
+    """Converte dias desde 1970-01-01 no ordinal do período (o mesmo de `pd.Period`).
+
+    Semanas vão de segunda a domingo; 1970-01-01 foi uma quinta-feira.
+    """
+    if granularidade == 'D':
+        return dias
+    if granularidade == 'W':
+        return (dias + 3) // 7 + 1
+    if len(dias) == 0:
+        return dias
+    # O mês de cada dia distinto do intervalo é calculado uma vez e consultado por posição.
+    primeiro = dias.min()
+    meses = np.arange(primeiro, dias.max() + 1).astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+    return meses[dias - primeiro]
+
+
+def rotulos_periodos(ordinais: np.ndarray, granularidade: str) -> np.ndarray:
+    """Retorna o texto de cada período (ex: '2024-03' para meses)."""
+    return pd.PeriodIndex.from_ordinals(ordinais, freq=granularidade).astype(str).to_numpy(dtype=object)
+
+
+def _pares_unicos(person_id: np.ndarray, valores: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Ordena os pares (`person_id`, valor) e remove os repetidos.
+
+    Em vez de uma ordenação lexicográfica, ordena pelo `person_id` e depois por
+    uma única chave inteira (posição da pessoa × amplitude dos valores + valor),
+    duas ordenações simples bem mais rápidas para dezenas de milhões de pares.
+    """
+    if len(person_id) == 0:
+        return person_id, valores
+    ordem = np.argsort(person_id)
+    person_id, valores = person_id[ordem], valores[ordem]
+    pessoa = np.cumsum(_inicios_de_pessoa(person_id)) - 1
+    minimo = valores.min()
+    ordem = np.argsort(pessoa * (valores.max() - minimo + 1) + (valores - minimo))
+    person_id, valores = person_id[ordem], valores[ordem]
+    manter = np.ones(len(person_id), dtype=bool)
+    manter[1:] = (person_id[1:] != person_id[:-1]) | (valores[1:] != valores[:-1])
+    return person_id[manter], valores[manter]
+
+
+def _inicios_de_pessoa(person_id: np.ndarray) -> np.ndarray:
+    """Marca a primeira linha de cada pessoa em arrays ordenados por `person_id`."""
+    inicio = np.ones(len(person_id), dtype=bool)
+    inicio[1:] = person_id[1:] != person_id[:-1]
+    return inicio
+
+
+def _soma_movel(valores: np.ndarray, janela: int) -> np.ndarray:
+    """Soma de cada período com os `janela - 1` períodos anteriores."""
+    acumulado = np.concatenate([[0], np.cumsum(valores)])
+    return acumulado[1:] - acumulado[np.maximum(np.arange(1, len(acumulado)) - janela, 0)]
+
+
+class MotorCrescimento:
+    """Pares distintos pessoa × dia de inscrição, ordenados por (`person_id`, dia).
+
+    Args:
+        person_id (np.ndarray): `person_id` de cada par.
+        dia (np.ndarray): Dia da inscrição, em dias desde 1970-01-01.
+    """
+
+    def __init__(self, person_id: np.ndarray, dia: np.ndarray):
+        self.person_id = person_id
+        self.dia = dia
+
+    @classmethod
+    def de_eventos(cls, person_id, datas: pd.Series) -> 'MotorCrescimento':
+        """Monta o motor a partir dos eventos de inscrição; datas nulas são ignoradas.
+
+        Args:
+            person_id (array-like): `person_id` de cada inscrição.
+            datas (pd.Series): Data de cada inscrição, já convertida para datetime.
+        """
+        ids = np.asarray(person_id, dtype=np.int64)
+        datas = np.asarray(datas, dtype='datetime64[us]')
+        validas = ~np.isnat(datas)
+        dias = datas[validas].astype('datetime64[D]').astype(np.int64)
+        return cls(*_pares_unicos(ids[validas], dias))
+
+    @classmethod
+    def unir(cls, motores: list) -> 'MotorCrescimento':
+        """Une motores montados separadamente (ex: um por bloco de inscrições)."""
+        if not motores:
+            return cls(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+        return cls(*_pares_unicos(np.concatenate([m.person_id for m in motores]), np.concatenate([m.dia for m in motores])))
+
+    def acrescentar(self, person_id, datas: pd.Series) -> 'MotorCrescimento':
+        """Retorna um novo motor com os eventos de inscrição acrescentados."""
+        return MotorCrescimento.unir([self, MotorCrescimento.de_eventos(person_id, datas)])
+
+    def _atividade(self, granularidade: str) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Pares distintos pessoa × período, com a coorte (período de entrada) de cada par.
+
+        Returns:
+            tuple: `person_id`, período e coorte de cada par, e a marca dos
+                   pares que são a primeira inscrição da pessoa.
+        """
+        person_id, periodo = self.person_id, periodos(self.dia, granularidade)
+        # Os dias já estão ordenados dentro de cada pessoa, e os períodos também.
+        manter = _inicios_de_pessoa(person_id)
+        manter[1:] |= periodo[1:] != periodo[:-1]
+        person_id, periodo = person_id[manter], periodo[manter]
+        inicio = _inicios_de_pessoa(person_id)
+        coorte = periodo[np.flatnonzero(inicio)][np.cumsum(inicio) - 1]
+        return person_id, periodo, coorte, inicio
+
+    def crescimento(self, granularidade: str = 'M', janela: int = JANELA_PADRAO) -> pd.DataFrame:
+        """Conta novas pessoas, pessoas ativas e pessoas que retornam por período.
+
+        Args:
+            granularidade (str): 'D' (dia), 'W' (semana) ou 'M' (mês).
+            janela (int): Número de períodos das janelas móveis.
+
+        Returns:
+            pd.DataFrame: Uma linha por período, do primeiro ao último com
+                          inscrições, com 'periodo', 'novas_pessoas',
+                          'total_acumulado', 'pessoas_ativas' (pessoas com
+                          alguma inscrição no período), 'pessoas_retornando'
+                          (ativas que entraram em um período anterior),
+                          'novas_pessoas_janela' e 'pessoas_ativas_janela'
+                          (pessoas distintas com inscrição nos últimos
+                          `janela` períodos).
+        """
+        colunas = ['periodo', 'novas_pessoas', 'total_acumulado', 'pessoas_ativas', 'pessoas_retornando',
+                   'novas_pessoas_janela', 'pessoas_ativas_janela']
+        if len(self.person_id) == 0:
+            return pd.DataFrame(columns=colunas)
+        person_id, periodo, _, inicio = self._atividade(granularidade)
+        primeiro = periodo.min()
+        n = int(periodo.max() - primeiro + 1)
+        posicao = periodo - primeiro
+        novas = np.bincount(posicao[inicio], minlength=n)
+        ativas = np.bincount(posicao, minlength=n)
+
+        # Cada par conta na janela do seu período até a janela que já alcança o
+        # próximo período ativo da mesma pessoa, para que ela seja contada uma vez.
+        proximo = np.full(len(posicao), n, dtype=np.int64)
+        continua = ~inicio[1:]
+        proximo[:-1][continua] = posicao[1:][continua]
+        fim = np.minimum(posicao + janela, proximo)
+        variacao = np.bincount(posicao, minlength=n + janela + 1) - np.bincount(fim, minlength=n + janela + 1)
+
+        return pd.DataFrame({
+            'periodo': rotulos_periodos(np.arange(primeiro, primeiro + n), granularidade),
+            'novas_pessoas': novas,
+            'total_acumulado': np.cumsum(novas),
+            'pessoas_ativas': ativas,
+            'pessoas_retornando': ativas - novas,
+            'novas_pessoas_janela': _soma_movel(novas, janela),
+            'pessoas_ativas_janela': np.cumsum(variacao)[:n],
+        }, columns=colunas)
+
+    def retencao(self, granularidade: str = 'M', idades: int = IDADES_COORTE_PADRAO) -> pd.DataFrame:
+        """Monta a matriz de retenção por coorte.
+
+        A coorte de uma pessoa é o período da sua primeira inscrição; a célula
+        (coorte, k) é a fração das pessoas da coorte com alguma inscrição k
+        períodos depois da entrada.
+
+        Args:
+            granularidade (str): 'D' (dia), 'W' (semana) ou 'M' (mês).
+            idades (int): Número de períodos após a entrada acompanhados.
+
+        Returns:
+            pd.DataFrame: Uma linha por coorte com pessoas, com 'coorte',
+                          'tamanho_coorte' e as colunas '0' a `idades`.
+        """
+        colunas_idade = [str(k) for k in range(idades + 1)]
+        if len(self.person_id) == 0:
+            return pd.DataFrame(columns=['coorte', 'tamanho_coorte'] + colunas_idade)
+        _, periodo, coorte, _ = self._atividade(granularidade)
+        primeiro = coorte.min()
+        n = int(coorte.max() - primeiro + 1)
+        idade = periodo - coorte
+        acompanhadas = idade <= idades
+        celulas = (coorte[acompanhadas] - primeiro) * (idades + 1) + idade[acompanhadas]
+        ativas = np.bincount(celulas, minlength=n * (idades + 1)).reshape(n, idades + 1)
+        com_pessoas = np.flatnonzero(ativas[:, 0])
+        tamanho = ativas[com_pessoas, 0]
+
+        matriz = pd.DataFrame(ativas[com_pessoas] / tamanho[:, None], columns=colunas_idade)
+        # Idades que a coorte ainda não alcançou ficam vazias, não zeradas.
+        ultimo = periodo.max() - primeiro
+        matriz = matriz.mask(com_pessoas[:, None] + np.arange(idades + 1) > ultimo)
+        matriz.insert(0, 'tamanho_coorte', tamanho)
+        matriz.insert(0, 'coorte', rotulos_periodos(primeiro + com_pessoas, granularidade))
+        return matriz
+
+    def salvar(self, diretorio: str):
+        """Grava os pares pessoa × dia em Parquet."""
+        os.makedirs(diretorio, exist_ok=True)
+        pd.DataFrame({'person_id': self.person_id, 'dia': self.dia.astype(np.int32)}).to_parquet(
+            os.path.join(diretorio, ARQUIVO_ATIVIDADE), index=False)
+
+    @classmethod
+    def carregar(cls, diretorio: str) -> 'MotorCrescimento | None':
+        """Carrega os pares gravados por `salvar`, ou None se eles não existirem."""
+        caminho = os.path.join(diretorio, ARQUIVO_ATIVIDADE)
+        if not os.path.exists(caminho):
+            return None
+        df = pd.read_parquet(caminho)
+        return cls(df['person_id'].to_numpy(dtype=np.int64), df['dia'].to_numpy(dtype=np.int64))
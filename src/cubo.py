@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+
+"""
+Cubo de Contagens - TransDevs Data Analysis
+
+Os gráficos e indicadores do dashboard são contagens de pessoas por uma ou
+mais dimensões (região, nível profissional, gênero, voluntariado...). Este
+módulo pré-calcula essas contagens a partir da dimensão de pessoas e da
+tabela fato de inscrições: para cada agrupamento de `AGRUPAMENTOS`, o número
+de pessoas e de inscrições em cada combinação de valores, inclusive os nulos.
+Todos os agrupamentos ficam em uma única tabela longa, identificados pela
+coluna 'agrupamento'; as dimensões fora do agrupamento ficam nulas.
+
+`fatiar` responde uma contagem a partir do menor agrupamento que contém as
+dimensões pedidas e as dos filtros, somando as células. Assim, o tempo de
+cada gráfico depende do número de combinações de valores, e não do número de
+pessoas.
+"""
+
+import pandas as pd
+from armazenamento import concatenar_tabelas
+
+# Separador dos nomes das dimensões na coluna 'agrupamento'.
+SEPARADOR = '|'
+
+# Agrupamentos calculados sobre a dimensão de pessoas. Contagens por qualquer
+# subconjunto de um agrupamento são somas das suas células, então só os
+# agrupamentos maximais usados pelo dashboard precisam ser guardados.
+AGRUPAMENTOS = [
+    ('estado_padronizado',),
+    ('perfil_aluno',),
+    ('computador_acesso',),
+    ('cursos_inscritos',),
+    ('regiao', 'professional_level_padronizado'),
+    ('faixa_etaria', 'working'),
+    ('genero_padronizado', 'etnia_padronizada', 'working'),
+    ('genero_padronizado', 'professional_level_padronizado', 'is_volunteer'),
+    ('is_volunteer', 'persona', 'regiao'),
+    ('is_volunteer', 'persona', 'professional_level_padronizado'),
+    ('is_volunteer', 'persona', 'atuacao_principal'),
+]
+
+# Agrupamento calculado sobre a tabela fato; nele, 'n_pessoas' é o número de
+# pessoas distintas de cada curso e não pode ser somado entre cursos.
+AGRUPAMENTO_CURSOS = ('curso_titulo',)
+
+# Medidas de cada célula do cubo.
+MEDIDAS = ['n_pessoas', 'n_inscricoes']
+
+# Ordem das dimensões ordenadas. O pipeline cria as categorias nessa ordem e o
+# dashboard a usa para reconstituir os tipos das tabelas lidas de CSV.
+ORDEM_CATEGORIAS = {
+    'faixa_etaria': ['Menor de 18', '18-24 anos', '25-34 anos', '35-44 anos', '45-54 anos', '55-64 anos', '65+ anos'],
+    'professional_level_padronizado': ['Iniciante', 'Estagiário', 'Júnior', 'Pleno', 'Sênior', 'Especialista', 'Liderança', 'Outro', 'Não informado'],
+}
+
+
+def montar_cubo(df_pessoas: pd.DataFrame, df_fato: pd.DataFrame) -> pd.DataFrame:
+    """Monta o cubo de contagens.
+
+    Cada pessoa da dimensão recebe o número de inscrições e o de inscrições
+    com curso ('cursos_inscritos') da tabela fato antes do agrupamento.
+    Agrupamentos com alguma coluna ausente nas tabelas são omitidos.
+
+    Args:
+        df_pessoas (pd.DataFrame): A dimensão de pessoas (ver `analysis.montar_dimensao_pessoas`).
+        df_fato (pd.DataFrame): A tabela fato de inscrições (ver `analysis.montar_fato_inscricoes`).
+
+    Returns:
+        pd.DataFrame: Uma linha por célula de cada agrupamento, com as colunas
+                      'agrupamento', as dimensões e as `MEDIDAS`, ordenada pelo
+                      agrupamento e pelo texto dos valores das dimensões.
+    """
+    pessoas = df_pessoas.copy(deep=False)
+    ids = pessoas['person_id']
+    pessoas['n_inscricoes'] = ids.map(df_fato['person_id'].value_counts()).fillna(0).astype('int64')
+    if 'curso_titulo' in df_fato.columns:
+        pessoas['cursos_inscritos'] = ids.map(df_fato.groupby('person_id')['curso_titulo'].count()).fillna(0).astype('int64')
+
+    partes = []
+    for agrupamento in AGRUPAMENTOS:
+        if not set(agrupamento) <= set(pessoas.columns):
+            continue
+        parte = pessoas.groupby(list(agrupamento), observed=True, dropna=False).agg(
+            n_pessoas=('person_id', 'size'), n_inscricoes=('n_inscricoes', 'sum')).reset_index()
+        parte.insert(0, 'agrupamento', SEPARADOR.join(agrupamento))
+        partes.append(parte)
+    if set(AGRUPAMENTO_CURSOS) <= set(df_fato.columns):
+        parte = df_fato.dropna(subset=list(AGRUPAMENTO_CURSOS)).groupby(list(AGRUPAMENTO_CURSOS), observed=True).agg(
+            n_pessoas=('person_id', 'nunique'), n_inscricoes=('person_id', 'size')).reset_index()
+        parte.insert(0, 'agrupamento', SEPARADOR.join(AGRUPAMENTO_CURSOS))
+        partes.append(parte)
+
+    cubo = concatenar_tabelas(partes)
+    dimensoes = [col for col in cubo.columns if col != 'agrupamento' and col not in MEDIDAS]
+    # A ordem das células do groupby segue a ordem das categorias de cada coluna, que muda com os tipos
+    # (no modo de memória reduzida, por exemplo); ordenar pelo texto dos valores (nulos no fim) a torna independente deles.
+    cubo = cubo.sort_values(['agrupamento', *dimensoes], key=lambda valores: valores.astype(str).where(valores.notna()), kind='stable', ignore_index=True)
+    return cubo[['agrupamento', *dimensoes, *MEDIDAS]]
+
+
+def agrupamentos(cubo: pd.DataFrame) -> dict:
+    """Retorna as dimensões de cada agrupamento do cubo, indexadas pelo nome do agrupamento."""
+    return {nome: tuple(nome.split(SEPARADOR)) for nome in cubo['agrupamento'].unique()}
+
+
+def tem_dimensoes(cubo: pd.DataFrame, *dimensoes: str) -> bool:
+    """Indica se algum agrupamento do cubo contém todas as `dimensoes`."""
+    return any(set(dimensoes) <= set(dims) for dims in agrupamentos(cubo).values())
+
+
+def _celulas(cubo: pd.DataFrame, dimensoes: list, filtros: dict) -> pd.DataFrame:
+    """Seleciona as células do menor agrupamento que responde a consulta e aplica os filtros."""
+    necessarias = set(dimensoes) | set(filtros)
+    tamanhos = cubo['agrupamento'].value_counts()
+    # O agrupamento de cursos não é somável e só responde consultas exatamente sobre as suas dimensões.
+    candidatos = [nome for nome, dims in agrupamentos(cubo).items()
+                  if necessarias <= set(dims) and (dims != AGRUPAMENTO_CURSOS or necessarias == set(dims))]
+    if not candidatos:
+        raise KeyError(f"Nenhum agrupamento do cubo contém as dimensões {sorted(necessarias)}")
+    celulas = cubo[cubo['agrupamento'] == min(candidatos, key=lambda nome: tamanhos[nome])]
+    for dimensao, valores in filtros.items():
+        valores = valores if isinstance(valores, (list, tuple, set)) else [valores]
+        celulas = celulas[celulas[dimensao].isin(valores)]
+    return celulas
+
+
+def fatiar(cubo: pd.DataFrame, dimensoes: list, filtros: dict | None = None, medida: str = 'n_pessoas') -> pd.Series:
+    """Soma uma medida por combinação de `dimensoes`, nas células que satisfazem `filtros`.
+
+    Usa o agrupamento com menos células entre os que contêm as dimensões e as
+    colunas dos filtros. Como em `value_counts` e `pd.crosstab`, as células com
+    valor nulo em alguma das `dimensoes` são descartadas.
+
+    Args:
+        cubo (pd.DataFrame): Saída de `montar_cubo`.
+        dimensoes (list): Dimensões do resultado.
+        filtros (dict, optional): Valor ou lista de valores aceitos em cada dimensão filtrada.
+        medida (str): 'n_pessoas' ou 'n_inscricoes'.
+
+    Returns:
+        pd.Series: A medida indexada pelas dimensões (um `MultiIndex` se houver
+                   mais de uma), sem combinações vazias.
+
+    Raises:
+        KeyError: Se nenhum agrupamento do cubo contém as dimensões pedidas.
+    """
+    celulas = _celulas(cubo, dimensoes, filtros or {})
+    return celulas.groupby(list(dimensoes), observed=True)[medida].sum()
+
+
+def total(cubo: pd.DataFrame, filtros: dict | None = None, medida: str = 'n_pessoas') -> int:
+    """Soma uma medida sobre todas as células que satisfazem `filtros` (o total de pessoas, sem filtros)."""
+    return int(_celulas(cubo, [], filtros or {})[medida].sum())
+
+
+class ConsultasCubo:
+    """Consultas do dashboard respondidas por um cubo carregado em memória.
+
+    Expõe `fatiar`, `total` e `tem_dimensoes` como métodos, com a mesma
+    interface de `consultas.ConsultasSQL`, para que as páginas não dependam
+    do backend escolhido.
+
+    Args:
+        cubo (pd.DataFrame): Saída de `montar_cubo`.
+    """
+
+    def __init__(self, cubo: pd.DataFrame):
+        self.cubo = cubo
+
+    def fatiar(self, dimensoes: list, filtros: dict | None = None, medida: str = 'n_pessoas') -> pd.Series:
+        return fatiar(self.cubo, dimensoes, filtros, medida)
+
+    def total(self, filtros: dict | None = None, medida: str = 'n_pessoas') -> int:
+        return total(self.cubo, filtros, medida)
+
+    def tem_dimensoes(self, *dimensoes: str) -> bool:
+        return tem_dimensoes(self.cubo, *dimensoes)
@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+
+"""
+Dados Sintéticos - TransDevs Data Analysis
+
+Gera versões sintéticas dos arquivos brutos (`div_inscricoes`, `div_profile`
+e `div_voluntariado`) em qualquer tamanho, para medir como o pipeline escala
+sem depender dos dados reais. Os valores reproduzem a bagunça que os
+normalizadores tratam: estados e cidades com grafias, acentos e sufixos
+variados ('Rio - RJ', ' sao paulo/SP ', 'Solteira'), datas em formatos
+misturados (inclusive inválidas e vazias), listas de tags em texto e e-mails
+com caixa e espaços diferentes entre as fontes. As colunas de curso e turma
+são amostradas das inscrições anonimizadas do repositório, quando existem.
+
+Os arquivos são gerados e gravados em blocos, com um gerador aleatório
+semeado por bloco: a mesma combinação de linhas, semente e tamanho de bloco
+produz sempre os mesmos arquivos.
+"""
+
+import os
+import argparse
+import unicodedata
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from analysis import (PROJECT_ROOT, RAW_INSCRICOES_PATH, RAW_PROFILE_PATH, RAW_VOLUNTARIADO_PATH, STATES_COORDS_PATH,
+                      MAP_SUMMARY_PATH, CIDADE_MAP_REVERSO, CIDADES_INVALIDAS)
+
+# Inscrições anonimizadas de onde as colunas de curso e turma são amostradas.
+REFERENCIA_INSCRICOES_PATH = os.path.join(PROJECT_ROOT, 'data', 'processed', 'inscricoes_anonimizadas.csv')
+
+# Colunas das inscrições amostradas (linha a linha, mantendo as correlações) da referência.
+COLUNAS_AMOSTRADAS = ['sabendo', 'conhecimento', 'pcd', 'turma', 'turma_slug', 'notas', 'data_form_selecao', 's_conhecimento',
+                      's_escolaridade', 's_trabalhando', 'curso_titulo', 'curso_slug', 'pronome', 'logica_simples', 's_atuacao',
+                      's_nivel_exp', 's_tecnologias', 's_ferramentas']
+
+# Proporções das outras fontes em relação ao número de inscrições.
+PESSOAS_POR_INSCRICAO = 0.7
+PERFIS_POR_INSCRICAO = 0.5
+VOLUNTARIOS_POR_INSCRICAO = 0.08
+
+# Número de linhas geradas e gravadas de cada vez.
+TAMANHO_BLOCO_PADRAO = 500_000
+
+# Período das inscrições; a densidade de inscrições cresce ao longo dele.
+INICIO_INSCRICOES = np.datetime64('2024-11-01')
+FIM_INSCRICOES = np.datetime64('2025-09-16')
+
+UFS = {'SP': 'São Paulo', 'RJ': 'Rio de Janeiro', 'MG': 'Minas Gerais', 'BA': 'Bahia', 'CE': 'Ceará', 'PE': 'Pernambuco', 'PR': 'Paraná',
+       'RS': 'Rio Grande do Sul', 'SC': 'Santa Catarina', 'GO': 'Goiás', 'DF': 'Distrito Federal', 'AM': 'Amazonas', 'RO': 'Rondônia',
+       'RN': 'Rio Grande do Norte', 'AL': 'Alagoas', 'ES': 'Espírito Santo', 'PA': 'Pará', 'MA': 'Maranhão', 'SE': 'Sergipe', 'PI': 'Piauí',
+       'MS': 'Mato Grosso do Sul', 'MT': 'Mato Grosso', 'PB': 'Paraíba', 'AC': 'Acre', 'TO': 'Tocantins', 'RR': 'Roraima', 'AP': 'Amapá'}
+
+# Peso de cada UF no sorteio do estado (as demais têm peso 1).
+PESOS_UF = {'SP': 25, 'RJ': 12, 'MG': 8, 'BA': 5, 'PE': 5, 'RS': 5, 'PR': 5, 'SC': 4, 'CE': 4, 'DF': 3, 'GO': 2, 'PA': 2, 'AM': 2}
+
+GENEROS = ['["mulher trans"]', 'mulher trans', '["homem trans"]', 'Homem Trans', '["nao binarie"]', 'nao-binarie', 'travesti', '["travesti"]',
+           'trans', 'transgenero', 'cis', 'queer', 'agênero', 'intersexo', 'outro', 'nao_sei', 'nao_quero_responder', '[]', '["trans","queer"]']
+ETNIAS = ['["etnia_branca"]', 'branca', 'Branca', 'parda', '["parda"]', 'preta', '["preta"]', 'preta,parda', '["preta","parda"]',
+          'amarela', 'indigena', 'outro', 'nao_quero_responder', '[]']
+NIVEIS = ['iniciante', 'Iniciante', 'INICIANTE ', 'estagiário', 'estagiario', 'júnior', 'Junior', 'pleno', 'Pleno', 'sênior', 'senior',
+          'especialista', 'liderança', 'c-level', 'outro', 'xx']
+AREAS = ['front-end', 'back-end', 'full-stack', 'ux-ui-designer', 'engenharia_de_dados', 'análise de dados', 'ciência de dados', 'cloud',
+         'devops', 'qa', 'mobile', 'produto', 'segurança']
+TECNOLOGIAS = ['html', 'css', 'javascript', 'python', 'sql', 'react', 'node_js', 'java', 'typescript', 'c/cc++', 'php', 'c#', 'go', 'kotlin',
+               'swift', 'ruby', 'r', 'rust', 'dart', 'flutter', 'angular', 'vue', 'django', 'spring']
+FERRAMENTAS = ['git', 'github', 'gitlab', 'figma', 'docker', 'photoshop', 'jira', 'trello', 'notion', 'vscode', 'postman', 'kubernetes',
+               'aws', 'azure', 'power_bi', 'excel', 'illustrator', 'canva']
+ATUACOES = ['tecnologia', 'comunicacao', 'psicologia', 'parcerias', 'engajamento', 'outras']
+TRABALHO = ['desempregade', 'tenho_emprego', 'faco_freelas']
+ESCOLARIDADE = ['ensino_superior_incompleto', 'ensino_superior_completo', 'ensino_medio', 'cursos_tecnicos', 'ensino_fundamental']
+DATAS_INVALIDAS = ['00/00/0000', '31/02/1990', 'não sei', '1990', '99/99/9999', '12/31/1995']
+
+# Número de listas distintas sorteadas para cada campo multivalorado.
+LISTAS_POR_CAMPO = 2_000
+
+
+def _sem_acentos(texto: str) -> str:
+    """Remove os acentos de um texto."""
+    return ''.join(c for c in unicodedata.normalize('NFKD', texto) if not unicodedata.combining(c))
+
+
+def _zipf(rng: np.random.Generator, n: int, tamanho: int, expoente: float = 1.1) -> np.ndarray:
+    """Sorteia `tamanho` índices em [0, n) com frequência decrescente (lei de Zipf)."""
+    pesos = 1.0 / np.arange(1, n + 1) ** expoente
+    return rng.choice(n, size=tamanho, p=pesos / pesos.sum())
+
+
+def _variacoes(texto: str, uf: str | None = None) -> list:
+    """Grafias de um nome de estado ou cidade: caixa, acentos, espaços e sufixo da UF."""
+    variacoes = [texto, texto.lower(), texto.upper(), texto.title(), _sem_acentos(texto), f' {texto} ', f'{texto.lower()} ']
+    if uf:
+        variacoes += [f'{texto}/{uf}', f'{texto} - {uf}', f'{texto.lower()} / {uf.lower()}', f'{texto}, {uf}']
+    return variacoes
+
+
+def vocabulario_enderecos() -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Monta os vocabulários bagunçados de estado e de cidade de cada UF.
+
+    Returns:
+        tuple: As UFs, o peso de cada UF e, para cada UF, um array com as
+               grafias do estado e outro com as grafias das suas cidades
+               (tirados do mapa de cidades do pipeline).
+    """
+    cidades_por_uf = {}
+    for cidade, uf in CIDADE_MAP_REVERSO.items():
+        cidades_por_uf.setdefault(uf, []).append(cidade)
+    ufs = np.array(list(UFS))
+    pesos = np.array([PESOS_UF.get(uf, 1) for uf in ufs], dtype=float)
+    estados = np.empty(len(ufs), dtype=object)
+    cidades = np.empty(len(ufs), dtype=object)
+    for i, uf in enumerate(ufs):
+        estados[i] = np.array(_variacoes(UFS[uf]) + [uf, uf.lower(), uf.title()], dtype=object)
+        nomes = cidades_por_uf.get(uf, [UFS[uf].lower()])
+        cidades[i] = np.array([v for nome in nomes for v in _variacoes(nome, uf)], dtype=object)
+    return ufs, pesos / pesos.sum(), estados, cidades
+
+
+def _sortear_por_grupo(rng: np.random.Generator, grupos: np.ndarray, vocabularios: np.ndarray) -> np.ndarray:
+    """Sorteia, para cada linha, um valor do vocabulário do seu grupo."""
+    valores = np.empty(len(grupos), dtype=object)
+    for grupo in np.unique(grupos):
+        linhas = np.flatnonzero(grupos == grupo)
+        valores[linhas] = vocabularios[grupo][rng.integers(0, len(vocabularios[grupo]), len(linhas))]
+    return valores
+
+
+def _listas(rng: np.random.Generator, tags: list, n_listas: int = LISTAS_POR_CAMPO, maximo: int = 5) -> np.ndarray:
+    """Sorteia listas distintas de tags no formato '["python","sql"]', com caixa e espaços variados.
+
+    A primeira lista é a vazia ('[]'); as tags mais ao início de `tags` são as mais frequentes.
+    """
+    listas = ['[]']
+    for _ in range(n_listas - 1):
+        escolhidas = [tags[i] for i in np.unique(_zipf(rng, len(tags), rng.integers(1, maximo + 1)))]
+        if rng.random() < 0.1:
+            escolhidas = [tag.title() for tag in escolhidas]
+        separador = ', ' if rng.random() < 0.2 else ','
+        listas.append('[' + separador.join(f'"{tag}"' for tag in escolhidas) + ']')
+    return np.array(listas, dtype=object)
+
+
+def _emails(rng: np.random.Generator, pessoas: np.ndarray) -> pd.Series:
+    """E-mails das pessoas sorteadas, com variações de caixa e espaços nas pontas."""
+    emails = 'pessoa' + pd.Series(pessoas).astype(str) + '@exemplo.com.br'
+    sorteio = rng.random(len(pessoas))
+    emails = emails.where(sorteio >= 0.1, emails.str.upper())
+    emails = emails.where((sorteio < 0.1) | (sorteio >= 0.15), ' ' + emails + ' ')
+    return emails
+
+
+def _com_nulos(rng: np.random.Generator, valores: np.ndarray, fracao: float) -> np.ndarray:
+    """Troca uma fração dos valores por nulos."""
+    valores = np.asarray(valores, dtype=object)
+    return np.where(rng.random(len(valores)) < fracao, None, valores)
+
+
+def _datas_inscricao(rng: np.random.Generator, n: int) -> pd.Series:
+    """Datas de inscrição em formatos misturados, mais densas no fim do período."""
+    segundos_periodo = int((FIM_INSCRICOES - INICIO_INSCRICOES) / np.timedelta64(1, 's'))
+    instantes = INICIO_INSCRICOES.astype('datetime64[s]') + (segundos_periodo * np.sqrt(rng.random(n))).astype('timedelta64[s]')
+    iso = pd.Series(np.datetime_as_string(instantes, unit='s'))
+    dia, mes, ano, hora = iso.str[8:10], iso.str[5:7], iso.str[:4], iso.str[11:]
+    sorteio = rng.random(n)
+    datas = iso.str.replace('T', ' ', regex=False)
+    datas = datas.where(sorteio < 0.85, dia + '/' + mes + '/' + ano + ' ' + hora)
+    return datas.where(sorteio < 0.95, iso)
+
+
+def _datas_nascimento(rng: np.random.Generator, n: int) -> pd.Series:
+    """Datas de nascimento em formatos misturados, com valores vazios e inválidos."""
+    dias = rng.integers(np.datetime64('1955-01-01').astype(int), np.datetime64('2010-12-31').astype(int), n)
+    iso = pd.Series(np.datetime_as_string(dias.astype('datetime64[D]')))
+    dia, mes, ano = iso.str[8:10], iso.str[5:7], iso.str[:4]
+    sorteio = rng.random(n)
+    datas = (dia + '/' + mes + '/' + ano).where(sorteio < 0.6, iso)
+    datas = datas.where(sorteio < 0.85, dia + '-' + mes + '-' + ano)
+    datas = datas.where(sorteio < 0.88, pd.Series(np.array(DATAS_INVALIDAS, dtype=object)[rng.integers(0, len(DATAS_INVALIDAS), n)]))
+    return datas.where(sorteio < 0.95, None)
+
+
+def carregar_referencia() -> pd.DataFrame:
+    """Carrega as colunas amostradas das inscrições anonimizadas (vazio se o arquivo não existir)."""
+    if not os.path.exists(REFERENCIA_INSCRICOES_PATH):
+        return pd.DataFrame()
+    referencia = pd.read_csv(REFERENCIA_INSCRICOES_PATH)
+    return referencia[[coluna for coluna in COLUNAS_AMOSTRADAS if coluna in referencia.columns]]
+
+
+def gerar_inscricoes(rng: np.random.Generator, inicio: int, n: int, n_pessoas: int, enderecos: tuple, referencia: pd.DataFrame) -> pd.DataFrame:
+    """Gera um bloco de inscrições brutas.
+
+    Args:
+        rng (np.random.Generator): Gerador aleatório do bloco.
+        inicio (int): Número da primeira linha do bloco (base da coluna 'id').
+        n (int): Número de linhas do bloco.
+        n_pessoas (int): Número de pessoas distintas da base inteira.
+        enderecos (tuple): Saída de `vocabulario_enderecos`.
+        referencia (pd.DataFrame): Saída de `carregar_referencia`.
+
+    Returns:
+        pd.DataFrame: Bloco com as colunas do arquivo bruto de inscrições.
+    """
+    ufs, pesos, estados, cidades = enderecos
+    pessoas = rng.integers(0, n_pessoas, n)
+    uf = rng.choice(len(ufs), size=n, p=pesos)
+    estado = _sortear_por_grupo(rng, uf, estados)
+    cidade = _sortear_por_grupo(rng, uf, cidades)
+    # Parte das pessoas preenche a cidade com lixo ou com o estado civil.
+    lixo = rng.random(n) < 0.03
+    cidade[lixo] = np.array(CIDADES_INVALIDAS, dtype=object)[rng.integers(0, len(CIDADES_INVALIDAS), lixo.sum())]
+
+    df = pd.DataFrame({
+        'id': np.arange(inicio, inicio + n),
+        'nome_completo': 'Pessoa ' + pd.Series(pessoas).astype(str),
+        'email': _emails(rng, pessoas),
+        'telefone': pd.Series(rng.integers(11_900_000_000, 99_999_999_999, n)).astype(str),
+        'nascdt': _datas_nascimento(rng, n),
+        'cidade': _com_nulos(rng, cidade, 0.06),
+        'estado': _com_nulos(rng, estado, 0.04),
+        'computador': rng.choice(np.array([1.0, 0.0, np.nan]), size=n, p=[0.65, 0.09, 0.26]),
+        'data': _datas_inscricao(rng, n),
+        'genero': _com_nulos(rng, np.array(GENEROS, dtype=object)[_zipf(rng, len(GENEROS), n, 0.8)], 0.18),
+        'etnia': _com_nulos(rng, np.array(ETNIAS, dtype=object)[_zipf(rng, len(ETNIAS), n, 0.8)], 0.2),
+        's_link': None,
+    })
+    if not referencia.empty:
+        amostra = referencia.iloc[rng.integers(0, len(referencia), n)].reset_index(drop=True)
+        df = pd.concat([df, amostra], axis=1)
+    return df
+
+
+def gerar_perfis(rng: np.random.Generator, n: int, n_pessoas: int, listas: dict) -> pd.DataFrame:
+    """Gera um bloco de perfis profissionais brutos, com as listas de `listas` ('areas', 'tecnologias', 'ferramentas')."""
+    def sortear_lista(campo):
+        return _com_nulos(rng, listas[campo][_zipf(rng, len(listas[campo]), n)], 0.1)
+
+    return pd.DataFrame({
+        'email': _emails(rng, rng.integers(0, n_pessoas, n)),
+        'professional_level': _com_nulos(rng, np.array(NIVEIS, dtype=object)[_zipf(rng, len(NIVEIS), n, 0.9)], 0.05),
+        'professional_area': sortear_lista('areas'),
+        'professional_technologies': sortear_lista('tecnologias'),
+        'professional_tools': sortear_lista('ferramentas'),
+        'working': _com_nulos(rng, rng.choice(np.array(TRABALHO, dtype=object), size=n, p=[0.55, 0.32, 0.13]), 0.05),
+        'schooling': _com_nulos(rng, np.array(ESCOLARIDADE, dtype=object)[_zipf(rng, len(ESCOLARIDADE), n, 0.9)], 0.05),
+    })
+
+
+def gerar_voluntariado(rng: np.random.Generator, n: int, n_pessoas: int, listas: dict) -> pd.DataFrame:
+    """Gera um bloco de inscrições brutas de voluntariado, com as listas de `listas['atuacoes']`."""
+    return pd.DataFrame({
+        'email': _emails(rng, rng.integers(0, n_pessoas, n)),
+        'atuacao': _com_nulos(rng, listas['atuacoes'][_zipf(rng, len(listas['atuacoes']), n)], 0.05),
+    })
+
+
+def _gravar_em_blocos(caminho: str, total: int, tamanho_bloco: int, semente: int, fonte: int, gerar):
+    """Grava `total` linhas em `caminho`, geradas por `gerar(rng, inicio, n)` em blocos."""
+    with open(caminho, 'wb') as f:
+        for bloco, inicio in enumerate(range(0, total, tamanho_bloco)):
+            rng = np.random.default_rng([semente, fonte, bloco])
+            tabela = pa.Table.from_pandas(gerar(rng, inicio, min(tamanho_bloco, total - inicio)), preserve_index=False)
+            pacsv.write_csv(tabela, f, pacsv.WriteOptions(include_header=bloco == 0, quoting_style='needed'))
+
+
+def caminhos_sinteticos(diretorio: str) -> dict:
+    """Caminhos dos arquivos gerados em `diretorio`, com os mesmos nomes dos arquivos brutos."""
+    return {nome: os.path.join(diretorio, os.path.basename(caminho)) for nome, caminho in
+            (('inscricoes', RAW_INSCRICOES_PATH), ('perfil', RAW_PROFILE_PATH), ('voluntariado', RAW_VOLUNTARIADO_PATH),
+             ('coordenadas', STATES_COORDS_PATH))}
+
+
+def gerar_arquivos(diretorio: str, linhas: int, semente: int = 42, tamanho_bloco: int = TAMANHO_BLOCO_PADRAO) -> dict:
+    """Gera os arquivos brutos sintéticos em `diretorio`.
+
+    O número de pessoas, de perfis e de inscrições de voluntariado é
+    proporcional ao número de inscrições. As coordenadas dos estados são
+    copiadas do resumo do mapa do repositório, quando ele existe.
+
+    Args:
+        diretorio (str): Diretório onde os arquivos são gravados.
+        linhas (int): Número de inscrições.
+        semente (int): Semente dos geradores aleatórios.
+        tamanho_bloco (int): Número de linhas geradas e gravadas de cada vez.
+
+    Returns:
+        dict: Caminho de cada arquivo gerado ('inscricoes', 'perfil', 'voluntariado', 'coordenadas').
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    caminhos = caminhos_sinteticos(diretorio)
+    n_pessoas = max(1, int(linhas * PESSOAS_POR_INSCRICAO))
+    rng = np.random.default_rng([semente, 0])
+    listas = {'areas': _listas(rng, AREAS, maximo=3), 'tecnologias': _listas(rng, TECNOLOGIAS),
+              'ferramentas': _listas(rng, FERRAMENTAS), 'atuacoes': _listas(rng, ATUACOES, n_listas=40, maximo=2)}
+    enderecos = vocabulario_enderecos()
+    referencia = carregar_referencia()
+
+    _gravar_em_blocos(caminhos['inscricoes'], linhas, tamanho_bloco, semente, 1,
+                      lambda rng, inicio, n: gerar_inscricoes(rng, inicio, n, n_pessoas, enderecos, referencia))
+    _gravar_em_blocos(caminhos['perfil'], int(linhas * PERFIS_POR_INSCRICAO), tamanho_bloco, semente, 2,
+                      lambda rng, inicio, n: gerar_perfis(rng, n, n_pessoas, listas))
+    _gravar_em_blocos(caminhos['voluntariado'], int(linhas * VOLUNTARIOS_POR_INSCRICAO), tamanho_bloco, semente, 3,
+                      lambda rng, inicio, n: gerar_voluntariado(rng, n, n_pessoas, listas))
+    if os.path.exists(MAP_SUMMARY_PATH):
+        pd.read_csv(MAP_SUMMARY_PATH)[['uf', 'latitude', 'longitude']].dropna().to_csv(caminhos['coordenadas'], index=False)
+    return caminhos
+
+
+def main(argv: list | None = None):
+    """Gera os arquivos brutos sintéticos pela linha de comando."""
+    parser = argparse.ArgumentParser(description="Gera arquivos brutos sintéticos para medir o desempenho do pipeline.")
+    parser.add_argument('--linhas', type=int, default=10_000, help="Número de inscrições geradas.")
+    parser.add_argument('--diretorio', default=os.path.join(PROJECT_ROOT, 'data', 'benchmark', 'raw'), help="Diretório de saída.")
+    parser.add_argument('--semente', type=int, default=42, help="Semente dos geradores aleatórios.")
+    parser.add_argument('--tamanho-bloco', type=int, default=TAMANHO_BLOCO_PADRAO, help="Número de linhas geradas e gravadas de cada vez.")
+    args = parser.parse_args(argv)
+    for nome, caminho in gerar_arquivos(args.diretorio, args.linhas, args.semente, args.tamanho_bloco).items():
+        print(f"{nome}: {caminho}")
+
+
+if __name__ == "__main__":
+    main()
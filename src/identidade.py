@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+"""
+Chave de Pessoa - TransDevs Data Analysis
+
+Este módulo calcula o `person_id` usado como chave de junção entre as
+inscrições, os perfis e o voluntariado. A chave é um hash SipHash de 64 bits,
+com chave secreta, do e-mail normalizado (minúsculas e sem espaços nas
+pontas). Por depender apenas do e-mail, a mesma pessoa recebe o mesmo id em
+todos os arquivos e em todas as execuções, independentemente da ordem ou da
+inserção de linhas.
+
+O id não é anônimo por si só: quem conhece a chave do hash pode calcular o
+id de qualquer e-mail e, com uma lista de e-mails, descobrir a quem cada id
+pertence. Só um segredo configurado em `TRANSDEVS_CHAVE_PESSOA` impede isso;
+sem ele, a chave é `CHAVE_HASH_PADRAO`, que é pública, e o pipeline registra
+um aviso no log.
+"""
+
+import os
+import logging
+import hashlib
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Variável de ambiente com o segredo do hash. Trocar o segredo troca todos os ids.
+VARIAVEL_SEGREDO = 'TRANSDEVS_CHAVE_PESSOA'
+
+# Chave de 16 caracteres usada quando nenhum segredo é configurado. Está no código-fonte, portanto
+# não protege os ids: serve apenas para execuções locais e dados de teste.
+CHAVE_HASH_PADRAO = 'transdevs-pessoa'
+
+# Id atribuído às linhas sem e-mail.
+ID_SEM_EMAIL = 0
+
+
+def chave_hash() -> str:
+    """Retorna a chave de 16 caracteres do hash, derivada do segredo configurado.
+
+    Sem o segredo, retorna `CHAVE_HASH_PADRAO` e registra um aviso no log:
+    os ids gravados com ela podem ser recalculados a partir dos e-mails.
+    """
+    segredo = os.environ.get(VARIAVEL_SEGREDO, '')
+    if not segredo:
+        logger.warning(f"ATENÇÃO: a variável de ambiente {VARIAVEL_SEGREDO} não está definida. Os person_id serão "
+                       f"calculados com a chave padrão, que é pública, e podem ser associados aos e-mails de origem. "
+                       f"Não publique as saídas desta execução; defina o segredo e execute o pipeline completo.")
+        return CHAVE_HASH_PADRAO
+    return hashlib.blake2b(segredo.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def chave_pessoa(emails: pd.Series, chave: str | None = None) -> pd.Series:
+    """Calcula o `person_id` de cada linha a partir do e-mail.
+
+    O hash é calculado de forma vetorizada sobre os e-mails distintos.
+
+    Args:
+        emails (pd.Series): E-mails como aparecem no arquivo bruto.
+        chave (str, optional): Chave de 16 caracteres do hash (padrão: `chave_hash()`).
+
+    Returns:
+        pd.Series: `person_id` em `int64`, com o mesmo índice de `emails`; linhas
+                   sem e-mail recebem `ID_SEM_EMAIL`.
+    """
+    normalizados = emails.str.lower().str.strip()
+    hashes = pd.util.hash_pandas_object(normalizados, index=False, hash_key=chave or chave_hash(), categorize=True)
+    ids = np.where(normalizados.notna().to_numpy(), hashes.to_numpy().view(np.int64), ID_SEM_EMAIL)
+    return pd.Series(ids, index=emails.index, name='person_id')
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+"""
+Estado do Modo Incremental - TransDevs Data Analysis
+
+Este módulo guarda e atualiza o estado usado pelo modo `--incremental` de
+`analysis.py`: a marca d'água (watermark) da coluna `data` das inscrições,
+os registros de pessoas de cada arquivo bruto (`person_id`, assinatura das
+linhas e primeira inscrição) e as funções que aplicam deltas aos relatórios
+já gravados. Os e-mails nunca são gravados no estado; o `person_id` já é o
+hash do e-mail calculado por `identidade.chave_pessoa`.
+"""
+
+import json
+import os
+import numpy as np
+import pandas as pd
+
+ESTADO_ARQUIVO = 'estado.json'
+COLUNAS_REGISTRO = ['person_id', 'assinatura', 'primeira_inscricao']
+
+# Versão do formato do estado; estados de versões anteriores forçam uma execução completa.
+VERSAO_ESTADO = 5
+
+
+def registrar_pessoas(registro: pd.DataFrame, ids: pd.Series) -> pd.DataFrame:
+    """Acrescenta ao registro as pessoas que ainda não estão nele.
+
+    Args:
+        registro (pd.DataFrame): Registro atual com as colunas `COLUNAS_REGISTRO`.
+        ids (pd.Series): `person_id` das linhas processadas.
+
+    Returns:
+        pd.DataFrame: O registro acrescido das novas pessoas, na ordem da
+                      primeira aparição.
+    """
+    novos = pd.unique(ids.to_numpy())
+    novos = novos[~np.isin(novos, registro['person_id'].to_numpy())]
+    if len(novos) == 0:
+        return registro
+    return pd.concat([registro, pd.DataFrame({'person_id': novos})], ignore_index=True)
+
+
+def assinaturas_por_pessoa(df: pd.DataFrame, ids: pd.Series) -> pd.Series:
+    """Resume o conteúdo das linhas de cada pessoa em uma assinatura inteira.
+
+    A assinatura é a soma dos hashes das linhas (reduzidos a 48 bits para não
+    estourar o int64), de modo que qualquer linha nova, removida ou alterada
+    muda o valor da pessoa correspondente.
+
+    Args:
+        df (pd.DataFrame): Linhas brutas de um arquivo.
+        ids (pd.Series): `person_id` de cada linha, alinhado a `df`.
+
+    Returns:
+        pd.Series: Assinatura indexada por `person_id`.
+    """
+    hashes = (pd.util.hash_pandas_object(df, index=False) >> np.uint64(16)).astype('int64')
+    return hashes.groupby(ids.to_numpy()).sum()
+
+
+def registro_vazio() -> pd.DataFrame:
+    """Cria um registro de pessoas sem nenhuma entrada."""
+    return pd.DataFrame({c: pd.Series(dtype=t) for c, t in zip(COLUNAS_REGISTRO, ['int64', 'Int64', 'datetime64[ns]'])})
+
+
+def carregar_registro(diretorio: str, nome: str) -> pd.DataFrame:
+    """Carrega o registro de pessoas de uma fonte, ou um registro vazio."""
+    caminho = os.path.join(diretorio, f'registro_{nome}.csv')
+    if not os.path.exists(caminho):
+        return registro_vazio()
+    registro = pd.read_csv(caminho, dtype={'person_id': 'int64', 'assinatura': 'Int64'})
+    registro['primeira_inscricao'] = pd.to_datetime(registro['primeira_inscricao'], errors='coerce')
+    return registro
+
+
+def salvar_registro(diretorio: str, nome: str, registro: pd.DataFrame):
+    """Grava o registro de pessoas de uma fonte."""
+    os.makedirs(diretorio, exist_ok=True)
+    registro[COLUNAS_REGISTRO].to_csv(os.path.join(diretorio, f'registro_{nome}.csv'), index=False)
+
+
+def carregar_estado(diretorio: str) -> dict | None:
+    """Carrega o arquivo de estado (watermark e contadores) se existir."""
+    caminho = os.path.join(diretorio, ESTADO_ARQUIVO)
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def salvar_estado(diretorio: str, estado: dict):
+    """Grava o arquivo de estado (watermark e contadores)."""
+    os.makedirs(diretorio, exist_ok=True)
+    with open(os.path.join(diretorio, ESTADO_ARQUIVO), 'w', encoding='utf-8') as f:
+        json.dump(estado, f, ensure_ascii=False, indent=2, default=str)
+
+
+def atualizar_registro(registro: pd.DataFrame, assinaturas: pd.Series | None = None, primeiras: pd.Series | None = None) -> pd.DataFrame:
+    """Atualiza assinaturas e datas de primeira inscrição no registro.
+
+    Args:
+        registro (pd.DataFrame): Registro de pessoas de uma fonte.
+        assinaturas (pd.Series, optional): Assinaturas indexadas por `person_id`.
+        primeiras (pd.Series, optional): Primeira inscrição válida por `person_id`;
+                                         só preenche pessoas que ainda não tinham data.
+
+    Returns:
+        pd.DataFrame: O registro atualizado.
+    """
+    registro = registro.copy()
+    if assinaturas is not None:
+        registro['assinatura'] = registro['person_id'].map(assinaturas).astype('Int64')
+    if primeiras is not None:
+        novas_datas = pd.Series(pd.to_datetime(primeiras.reindex(registro['person_id'].to_numpy())).to_numpy(), index=registro.index)
+        registro['primeira_inscricao'] = pd.to_datetime(registro['primeira_inscricao']).fillna(novas_datas)
+    return registro
+
+
+def pessoas_alteradas(registro: pd.DataFrame, assinaturas: pd.Series) -> set:
+    """Retorna os `person_id` cuja assinatura mudou desde o último estado."""
+    anteriores = registro.set_index('person_id')['assinatura'].reindex(assinaturas.index)
+    alteradas = assinaturas.index[(anteriores != assinaturas).fillna(True).to_numpy(dtype=bool)]
+    return set(alteradas.tolist())
+
+
+def aplicar_delta_contagem(atual: pd.DataFrame | None, delta: pd.Series, coluna_chave: str, coluna_contagem: str) -> pd.DataFrame:
+    """Aplica um delta de contagens (positivo ou negativo) a um relatório.
+
+    Linhas cuja contagem final fica em zero são removidas, como aconteceria se
+    o relatório fosse recalculado do zero.
+
+    Args:
+        atual (pd.DataFrame or None): Relatório atual.
+        delta (pd.Series): Variação da contagem indexada pela chave.
+        coluna_chave (str): Nome da coluna de chave do relatório.
+        coluna_contagem (str): Nome da coluna de contagem do relatório.
+
+    Returns:
+        pd.DataFrame: Relatório com as colunas `coluna_chave` e `coluna_contagem`.
+    """
+    base = pd.Series(dtype='int64') if atual is None else atual.set_index(coluna_chave)[coluna_contagem]
+    combinado = base.add(delta, fill_value=0).astype('int64')
+    combinado = combinado[combinado > 0]
+    return combinado.rename(coluna_contagem).rename_axis(coluna_chave).reset_index()
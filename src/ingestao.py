@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+"""
+Ingestão em Blocos - TransDevs Data Analysis
+
+Este módulo dá suporte ao modo `--streaming` de `analysis.py`, usado quando
+os arquivos brutos são grandes demais para serem lidos de uma só vez. Os CSVs
+são lidos em blocos (chunks) de tamanho limitado e com tipos declarados, para
+que todos os blocos tenham o mesmo esquema, e os resultados parciais de cada
+bloco já normalizado são gravados em disco (spill) em Parquet até o merge
+final.
+"""
+
+import os
+import glob
+import shutil
+import logging
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from armazenamento import COMPRESSAO_PARQUET, concatenar_tabelas
+
+logger = logging.getLogger(__name__)
+
+# Número padrão de linhas lidas por bloco.
+TAMANHO_CHUNK_PADRAO = 200_000
+
+
+def tipos_colunas(caminho_arquivo: str, tipos_declarados: dict | None = None) -> dict:
+    """Monta o mapa de tipos de todas as colunas de um CSV.
+
+    Sem o mapa completo, o Pandas infere o tipo de cada bloco separadamente e
+    uma coluna vazia em um bloco vira numérica enquanto é texto nos demais.
+
+    Args:
+        caminho_arquivo (str): O caminho do arquivo CSV.
+        tipos_declarados (dict, optional): Tipos das colunas que não são texto
+                                           (ex: {'computador': 'float64'}).
+
+    Returns:
+        dict: Tipo de cada coluna do cabeçalho; colunas não declaradas são texto.
+    """
+    tipos_declarados = tipos_declarados or {}
+    colunas = pd.read_csv(caminho_arquivo, nrows=0).columns
+    return {coluna: tipos_declarados.get(coluna, str) for coluna in colunas}
+
+
+def ler_em_chunks(caminho_arquivo: str, tamanho_chunk: int = TAMANHO_CHUNK_PADRAO, tipos_declarados: dict | None = None):
+    """Lê um CSV em blocos de no máximo `tamanho_chunk` linhas.
+
+    Args:
+        caminho_arquivo (str): O caminho do arquivo CSV.
+        tamanho_chunk (int): Número máximo de linhas por bloco.
+        tipos_declarados (dict, optional): Tipos das colunas que não são texto.
+
+    Yields:
+        pd.DataFrame: Os blocos do arquivo, com índice contínuo entre eles.
+                      Nada é produzido se o arquivo não existir.
+    """
+    if not os.path.exists(caminho_arquivo):
+        logger.warning(f"Arquivo não encontrado: {caminho_arquivo}")
+        return
+    logger.info(f"Lendo em blocos de {tamanho_chunk} linhas: {os.path.basename(caminho_arquivo)}")
+    tipos = tipos_colunas(caminho_arquivo, tipos_declarados)
+    with pd.read_csv(caminho_arquivo, dtype=tipos, chunksize=tamanho_chunk) as leitor:
+        yield from leitor
+
+
+class AreaSpill:
+    """Diretório temporário com as partes já processadas de cada fonte.
+
+    Cada chamada de `gravar` cria uma nova parte em Parquet e `ler` concatena
+    as partes de uma fonte na ordem em que foram gravadas, preservando as
+    colunas categóricas e de listas. Como `ler` encontra as partes pelo nome
+    dos arquivos, fontes diferentes podem ser gravadas em paralelo, inclusive
+    por outros processos.
+
+    Args:
+        diretorio (str): Diretório onde as partes serão gravadas. É esvaziado
+                         na criação e removido por `limpar`.
+    """
+
+    def __init__(self, diretorio: str):
+        self.diretorio = diretorio
+        self.partes = {}
+        shutil.rmtree(diretorio, ignore_errors=True)
+        os.makedirs(diretorio)
+
+    def gravar(self, nome: str, df: pd.DataFrame):
+        """Grava uma parte processada da fonte `nome`."""
+        indice = self.partes.get(nome, 0)
+        caminho = os.path.join(self.diretorio, f'{nome}-{indice:05d}.parquet')
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), caminho, compression=COMPRESSAO_PARQUET)
+        self.partes[nome] = indice + 1
+
+    def ler(self, nome: str) -> pd.DataFrame:
+        """Concatena todas as partes da fonte `nome`, ou um DataFrame vazio."""
+        caminhos = sorted(glob.glob(os.path.join(self.diretorio, f'{nome}-[0-9]*.parquet')))
+        if not caminhos:
+            return pd.DataFrame()
+        return concatenar_tabelas([pq.read_table(c, memory_map=True).to_pandas() for c in caminhos])
+
+    def limpar(self):
+        """Remove o diretório com todas as partes."""
+        shutil.rmtree(self.diretorio, ignore_errors=True)
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+"""
+Leitura de Datas - TransDevs Data Analysis
+
+As colunas de data dos arquivos brutos ('data' das inscrições e 'nascdt')
+misturam formatos, como '2024-11-10 05:39:49', '10/10/2024 13:34:49' e
+'1990-03-04'. Sem formato explícito, o `pd.to_datetime` infere o formato pela
+primeira linha e transforma em NaT, sem aviso, as linhas nos outros formatos
+(ou cai na leitura elemento a elemento). Este módulo lê cada texto distinto
+uma única vez, tentando uma lista de formatos explícitos, cada um aplicado de
+forma vetorizada às linhas que os formatos anteriores não reconheceram; os
+textos já lidos ficam em cache entre chamadas (por exemplo, entre os blocos
+do modo streaming), e cada leitura registra quantos valores foram
+reconhecidos em cada formato e quantos ficaram inválidos.
+"""
+
+import logging
+import numpy as np
+import pandas as pd
+import metricas
+
+logger = logging.getLogger(__name__)
+
+# Formatos aceitos; datas com barra são sempre dia/mês/ano.
+FORMATOS_DATA = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%d/%m/%Y %H:%M:%S', '%d/%m/%Y', '%Y-%m-%dT%H:%M:%S',
+                 '%Y-%m-%d %H:%M:%S.%f', '%d/%m/%Y %H:%M', '%d-%m-%Y', '%d.%m.%Y')
+
+# Número máximo de textos distintos guardados no cache de cada leitor.
+LIMITE_CACHE_DATAS = 500_000
+
+# Rótulos da contagem para valores não reconhecidos e vazios.
+INVALIDAS = 'inválidas'
+VAZIAS = 'vazias'
+
+
+class LeitorDatas:
+    """Converte colunas de texto com datas em formatos misturados para datetime.
+
+    Args:
+        formatos (tuple): Formatos aceitos (sintaxe do `strftime`). Cada texto
+                          recebe o primeiro formato que o reconhece por inteiro;
+                          os formatos mais frequentes nas leituras anteriores
+                          são tentados primeiro.
+        limite_cache (int): Número máximo de textos distintos guardados no cache.
+    """
+
+    def __init__(self, formatos: tuple = FORMATOS_DATA, limite_cache: int = LIMITE_CACHE_DATAS):
+        self.formatos = tuple(formatos)
+        self.limite_cache = limite_cache
+        self.contagem = pd.Series(0, index=list(self.formatos) + [INVALIDAS, VAZIAS], dtype='int64')
+        self._cache = pd.DataFrame({'valor': np.empty(0, dtype='datetime64[us]'), 'formato': np.empty(0, dtype=np.int16)},
+                                   index=pd.Index([], dtype=object))
+
+    def _ler_distintos(self, textos: pd.Index) -> tuple[np.ndarray, np.ndarray]:
+        """Lê textos distintos com os formatos explícitos.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: A data de cada texto (NaT se nenhum
+                                           formato o reconheceu) e o índice do
+                                           formato usado (-1 para inválidos).
+        """
+        valores = np.full(len(textos), np.datetime64('NaT'), dtype='datetime64[us]')
+        formato = np.full(len(textos), -1, dtype=np.int16)
+        pendentes = np.arange(len(textos))
+        ordem = np.argsort(-self.contagem.iloc[:len(self.formatos)].to_numpy(), kind='stable')
+        for indice in ordem:
+            if len(pendentes) == 0:
+                break
+            lidas = pd.to_datetime(textos[pendentes], format=self.formatos[indice], errors='coerce')
+            reconhecidas = ~np.asarray(lidas.isna())
+            valores[pendentes[reconhecidas]] = lidas[reconhecidas].to_numpy(dtype='datetime64[us]')
+            formato[pendentes[reconhecidas]] = indice
+            pendentes = pendentes[~reconhecidas]
+        return valores, formato
+
+    def __call__(self, valores: pd.Series) -> pd.Series:
+        """Converte a coluna para datetime; valores vazios ou não reconhecidos viram NaT.
+
+        Args:
+            valores (pd.Series): Coluna com as datas em texto.
+
+        Returns:
+            pd.Series: Coluna `datetime64[us]` com o mesmo índice de `valores`.
+        """
+        codigos, distintos = pd.factorize(valores)
+        textos = pd.Index(distintos).astype(str)
+        # Espaços nas pontas não distinguem textos: a leitura é feita sobre os textos já aparados.
+        aparados = textos.str.strip()
+        if (aparados != textos).any():
+            codigos_textos, textos = pd.factorize(aparados)
+            codigos = np.where(codigos >= 0, codigos_textos[codigos], -1)
+
+        # Consulta o cache e lê apenas os textos ainda não vistos.
+        posicoes = self._cache.index.get_indexer(textos) if len(self._cache) else np.full(len(textos), -1)
+        datas = np.full(len(textos), np.datetime64('NaT'), dtype='datetime64[us]')
+        formato = np.full(len(textos), -1, dtype=np.int16)
+        em_cache = posicoes >= 0
+        datas[em_cache] = self._cache['valor'].to_numpy()[posicoes[em_cache]]
+        formato[em_cache] = self._cache['formato'].to_numpy()[posicoes[em_cache]]
+        novos = np.flatnonzero(~em_cache)
+        if len(novos):
+            datas[novos], formato[novos] = self._ler_distintos(textos[novos])
+            if len(self._cache) + len(novos) <= self.limite_cache:
+                self._cache = pd.concat([self._cache, pd.DataFrame({'valor': datas[novos], 'formato': formato[novos]}, index=textos[novos])])
+
+        # O texto vazio conta como valor vazio, não como data inválida.
+        vazios = np.flatnonzero(np.asarray(textos == ''))
+        if len(vazios):
+            codigos = np.where(codigos == vazios[0], -1, codigos)
+        presentes = codigos >= 0
+        formato_linhas = formato[codigos[presentes]]
+        por_formato = np.bincount(formato_linhas[formato_linhas >= 0], minlength=len(self.formatos))
+        contagem = pd.Series(np.append(por_formato, [(formato_linhas < 0).sum(), (~presentes).sum()]), index=self.contagem.index)
+        self.contagem += contagem
+        metricas.registrar_datas(valores.name, contagem)
+        resumo = ', '.join(f"{n} em '{f}'" for f, n in contagem.iloc[:len(self.formatos)].items() if n)
+        logger.info(f"Datas de '{valores.name}': {resumo or 'nenhuma reconhecida'}; {contagem[INVALIDAS]} inválidas, {contagem[VAZIAS]} vazias.")
+
+        resultado = np.full(len(codigos), np.datetime64('NaT'), dtype='datetime64[us]')
+        resultado[presentes] = datas[codigos[presentes]]
+        return pd.Series(resultado, index=valores.index, name=valores.name)
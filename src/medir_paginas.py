@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+"""
+Medição das Páginas do Dashboard - TransDevs Data Analysis
+
+Mede o tempo de execução de cada página do dashboard e compara com os
+orçamentos de latência de `paginas.PAGINAS`. Cada página é medida em um
+processo novo: a primeira execução reproduz a partida a frio depois de um
+deploy ou de um reinício do contêiner (importações, leitura das tabelas e
+desenho dos gráficos), e as seguintes medem os reruns, com os caches já
+preenchidos. O script é executado pelo `AppTest` do Streamlit, sem servidor
+nem navegador, sobre os dados processados do projeto.
+
+Os processos de medição são iniciados com 'spawn' e este módulo só importa
+bibliotecas leves no topo, para que nada que o dashboard importa já esteja
+carregado antes da primeira execução.
+"""
+
+import os
+import sys
+import csv
+import time
+import logging
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from paginas import PAGINAS, buscar_pagina
+
+logger = logging.getLogger(__name__)
+
+# Script medido.
+DASHBOARD_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dashboard.py')
+
+# Bibliotecas de gráficos cuja importação é registrada em cada página (o pacote 'plotly' é
+# importado pelo próprio Streamlit; o 'plotly.express' só pela página que desenha o mapa).
+BIBLIOTECAS_GRAFICOS = ('matplotlib', 'seaborn', 'plotly.express')
+
+# Tempo máximo, em segundos, de uma execução do script no `AppTest`.
+TIMEOUT_EXECUCAO = 300
+
+
+def medir_pagina(titulo: str, reruns: int, motor_consultas: str = 'cubo') -> dict:
+    """Executa o dashboard com uma página selecionada e mede a primeira execução e os reruns.
+
+    Deve ser chamada em um processo novo para que a primeira execução seja fria.
+
+    Args:
+        titulo (str): Título da página (ver `paginas.PAGINAS`).
+        reruns (int): Número de execuções medidas depois da primeira.
+        motor_consultas (str): Valor de 'MOTOR_CONSULTAS' nos secrets ('cubo' ou 'duckdb').
+
+    Returns:
+        dict: 'pagina', 'fria_ms', 'rerun_mediana_ms', 'rerun_max_ms',
+              'bibliotecas' (as bibliotecas de gráficos importadas) e 'erro'
+              (a primeira exceção exibida pela página, ou '').
+    """
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(DASHBOARD_PATH, default_timeout=TIMEOUT_EXECUCAO)
+    app.secrets['APP_PASSWORD'] = ''
+    app.secrets['MOTOR_CONSULTAS'] = motor_consultas
+    app.session_state['password_correct'] = True
+    app.session_state['pagina'] = titulo
+
+    inicio = time.perf_counter()
+    app.run()
+    fria_ms = (time.perf_counter() - inicio) * 1000
+    tempos = []
+    for _ in range(reruns):
+        inicio = time.perf_counter()
+        app.run()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    tempos.sort()
+    return {'pagina': titulo, 'fria_ms': round(fria_ms),
+            'rerun_mediana_ms': round(tempos[len(tempos) // 2]) if tempos else None,
+            'rerun_max_ms': round(tempos[-1]) if tempos else None,
+            'bibliotecas': ' '.join(b for b in BIBLIOTECAS_GRAFICOS if b in sys.modules),
+            'erro': app.exception[0].value if len(app.exception) else ''}
+
+
+def verificar_orcamento(medida: dict) -> list:
+    """Retorna as violações de orçamento de uma medida (vazia se a página couber nos dois orçamentos)."""
+    pagina = buscar_pagina(medida['pagina'])
+    violacoes = []
+    if medida['fria_ms'] > pagina.orcamento_frio_ms:
+        violacoes.append(f"primeira execução {medida['fria_ms']} ms > {pagina.orcamento_frio_ms} ms")
+    if medida['rerun_mediana_ms'] is not None and medida['rerun_mediana_ms'] > pagina.orcamento_rerun_ms:
+        violacoes.append(f"rerun (mediana) {medida['rerun_mediana_ms']} ms > {pagina.orcamento_rerun_ms} ms")
+    return violacoes
+
+
+def main(argv: list | None = None) -> int:
+    """Mede as páginas pedidas e, opcionalmente, grava os resultados em CSV.
+
+    Returns:
+        int: 0 se todas as páginas couberem nos orçamentos e executarem sem erro, 1 caso contrário.
+    """
+    parser = argparse.ArgumentParser(description="Mede a primeira execução e os reruns de cada página do dashboard.")
+    parser.add_argument('--paginas', nargs='+', default=[pagina.titulo for pagina in PAGINAS], metavar='TITULO',
+                        help="Títulos das páginas medidas (padrão: todas).")
+    parser.add_argument('--reruns', type=int, default=5, help="Número de reruns medidos depois da primeira execução.")
+    parser.add_argument('--motor-consultas', choices=('cubo', 'duckdb'), default='cubo', help="Fonte das consultas usada pelas páginas.")
+    parser.add_argument('--saida', help="Arquivo CSV onde gravar as medidas.")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+
+    medidas, falhas = [], 0
+    for titulo in args.paginas:
+        pagina = buscar_pagina(titulo)
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+            medida = pool.submit(medir_pagina, titulo, args.reruns, args.motor_consultas).result()
+        medida.update(orcamento_frio_ms=pagina.orcamento_frio_ms, orcamento_rerun_ms=pagina.orcamento_rerun_ms)
+        violacoes = verificar_orcamento(medida)
+        medida['dentro_do_orcamento'] = 'não' if violacoes else 'sim'
+        medidas.append(medida)
+        logger.info(f"{titulo}: primeira execução {medida['fria_ms']} ms (orçamento {pagina.orcamento_frio_ms}), "
+                    f"rerun {medida['rerun_mediana_ms']} ms (orçamento {pagina.orcamento_rerun_ms}); "
+                    f"bibliotecas de gráficos: {medida['bibliotecas'] or 'nenhuma'}.")
+        for violacao in violacoes:
+            logger.error(f"{titulo}: acima do orçamento ({violacao}).")
+        if medida['erro']:
+            logger.error(f"{titulo}: a página exibiu um erro: {medida['erro']}")
+        falhas += bool(violacoes or medida['erro'])
+
+    if args.saida:
+        with open(args.saida, 'w', newline='', encoding='utf-8') as f:
+            escritor = csv.DictWriter(f, fieldnames=list(medidas[0]))
+            escritor.writeheader()
+            escritor.writerows(medidas)
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+
+"""
+Métricas de Execução - TransDevs Data Analysis
+
+Este módulo registra, para cada etapa do pipeline, o tempo de parede, o tempo
+de CPU, o pico de memória residente e o número de linhas de entrada e de
+saída, além das taxas de acerto da normalização (quantas linhas de cada
+coluna caíram no valor padrão, como 'Inválido' ou 'Preferiu não informar') e
+da leitura de datas. Cada execução grava um manifesto JSON com essas medidas
+e acrescenta uma linha por etapa a tabelas acumuladas, para comparar
+execuções e descobrir qual etapa piorou depois de uma nova carga de dados.
+
+Opcionalmente, cada etapa pode ser perfilada com o cProfile (um arquivo
+'.prof' por etapa) ou com um amostrador de pilhas leve, que grava as pilhas
+no formato "colapsado" aceito por ferramentas de flame graph.
+"""
+
+import os
+import sys
+import json
+import time
+import cProfile
+import platform
+import threading
+import contextvars
+from collections import Counter
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Perfiladores aceitos por `executar_medindo`.
+PERFILADORES = ('cprofile', 'amostragem')
+
+# Intervalo, em segundos, entre duas amostras do amostrador de pilhas.
+INTERVALO_AMOSTRAGEM = 0.005
+
+# Arquivos gravados por `ExecucaoMetricas.finalizar`.
+ARQUIVO_MANIFESTO = 'manifesto.json'
+TABELA_ETAPAS = 'etapas.csv'
+TABELA_NORMALIZACAO = 'normalizacao.csv'
+
+# Medidas de normalização e de datas da etapa em execução (uma por thread ou processo).
+_COLETOR = contextvars.ContextVar('coletor_metricas', default=None)
+
+
+def memoria_rss_mb() -> tuple[float, float]:
+    """Retorna a memória residente atual e o pico do processo, em MB.
+
+    No Linux, lê VmRSS e VmHWM de /proc/self/status; nos outros sistemas, o
+    pico vem de `resource.getrusage` e a memória atual não é conhecida.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            campos = dict(linha.split(':', 1) for linha in f if linha.startswith(('VmRSS', 'VmHWM')))
+        return int(campos['VmRSS'].split()[0]) / 1024, int(campos['VmHWM'].split()[0]) / 1024
+    except (OSError, KeyError):
+        if resource is None:
+            return np.nan, np.nan
+        # ru_maxrss é o pico do processo até aqui, em KiB no Linux e em bytes no macOS.
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return np.nan, pico / (2**20 if sys.platform == 'darwin' else 1024)
+
+
+def zerar_pico_rss() -> bool:
+    """Zera o pico de memória residente do processo (só no Linux); retorna False se não for possível."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def registrar_normalizacao(coluna: str, entrada: pd.Series, resultado: pd.Series, padrao: str):
+    """Registra quantas linhas da coluna foram reconhecidas e quantas caíram no valor padrão.
+
+    Só tem efeito dentro de uma etapa medida por `executar_medindo`; chamadas
+    repetidas na mesma etapa (como nos blocos do modo streaming) são somadas.
+
+    Args:
+        coluna (str): Nome da coluna normalizada.
+        entrada (pd.Series): Valores originais.
+        resultado (pd.Series): Valores padronizados.
+        padrao (str): Valor atribuído a nulos e a textos sem correspondência.
+    """
+    coletor = _COLETOR.get()
+    if coletor is None:
+        return
+    medida = coletor['normalizacao'].setdefault(str(coluna), {'padrao': padrao, 'linhas': 0, 'nulas': 0, 'no_padrao': 0})
+    medida['linhas'] += len(entrada)
+    medida['nulas'] += int(entrada.isna().sum())
+    medida['no_padrao'] += int((resultado == padrao).sum())
+
+
+def registrar_datas(coluna: str, contagem: pd.Series):
+    """Registra quantos valores de uma coluna de datas foram lidos em cada formato, inválidos e vazios."""
+    coletor = _COLETOR.get()
+    if coletor is None:
+        return
+    medida = coletor['datas'].setdefault(str(coluna), {})
+    for rotulo, n in contagem.items():
+        if n:
+            medida[rotulo] = medida.get(rotulo, 0) + int(n)
+
+
+def _linhas(objeto) -> int | None:
+    """Número de linhas de uma tabela ou série (None para outros objetos)."""
+    return len(objeto) if isinstance(objeto, (pd.DataFrame, pd.Series)) else None
+
+
+class _AmostradorPilhas(threading.Thread):
+    """Amostra periodicamente a pilha de uma thread e conta as pilhas distintas."""
+
+    def __init__(self, id_thread: int, intervalo: float = INTERVALO_AMOSTRAGEM):
+        super().__init__(daemon=True)
+        self.id_thread = id_thread
+        self.intervalo = intervalo
+        self.pilhas = Counter()
+        self._parar = threading.Event()
+
+    def run(self):
+        while not self._parar.wait(self.intervalo):
+            quadro = sys._current_frames().get(self.id_thread)
+            funcoes = []
+            while quadro is not None:
+                funcoes.append(f"{os.path.basename(quadro.f_code.co_filename)}:{quadro.f_code.co_name}")
+                quadro = quadro.f_back
+            if funcoes:
+                self.pilhas[';'.join(reversed(funcoes))] += 1
+
+    def parar(self, caminho: str):
+        """Interrompe a amostragem e grava as pilhas colapsadas ('pilha contagem' por linha)."""
+        self._parar.set()
+        self.join()
+        with open(caminho, 'w', encoding='utf-8') as f:
+            for pilha, n in self.pilhas.most_common():
+                f.write(f"{pilha} {n}\n")
+
+
+def executar_medindo(funcao, argumentos: tuple, opcoes: dict | None = None) -> tuple:
+    """Executa `funcao(*argumentos)` medindo a etapa.
+
+    Args:
+        funcao (callable): Função da etapa.
+        argumentos (tuple): Argumentos da função.
+        opcoes (dict, optional): 'isolada' (a etapa roda sozinha no seu
+                                 processo, então o pico de memória e o tempo
+                                 de CPU são só dela), 'perfilador' (um de
+                                 PERFILADORES) e 'arquivo_perfil' (caminho do
+                                 perfil, sem extensão).
+
+    Returns:
+        tuple: O resultado da função e um dicionário com 'segundos', 'cpu_s',
+               'pico_rss_mb', 'pico_rss_isolado', 'linhas_entrada',
+               'linhas_saida', 'normalizacao' e 'datas'.
+    """
+    opcoes = opcoes or {}
+    isolada = opcoes.get('isolada', False)
+    perfilador = opcoes.get('perfilador')
+    linhas_entrada = [n for n in map(_linhas, argumentos) if n is not None]
+    relogio_cpu = time.process_time if isolada else time.thread_time
+    isolada = isolada and zerar_pico_rss()
+    token = _COLETOR.set({'normalizacao': {}, 'datas': {}})
+    perfil = cProfile.Profile() if perfilador == 'cprofile' else None
+    amostrador = _AmostradorPilhas(threading.get_ident()) if perfilador == 'amostragem' else None
+    if perfil is not None:
+        perfil.enable()
+    if amostrador is not None:
+        amostrador.start()
+    inicio, inicio_cpu = time.perf_counter(), relogio_cpu()
+    try:
+        resultado = funcao(*argumentos)
+    finally:
+        segundos, cpu = time.perf_counter() - inicio, relogio_cpu() - inicio_cpu
+        if perfil is not None:
+            perfil.disable()
+            perfil.dump_stats(opcoes['arquivo_perfil'] + '.prof')
+        if amostrador is not None:
+            amostrador.parar(opcoes['arquivo_perfil'] + '.pilhas.txt')
+        coletor = _COLETOR.get()
+        _COLETOR.reset(token)
+    medida = {'segundos': segundos, 'cpu_s': cpu, 'pico_rss_mb': memoria_rss_mb()[1], 'pico_rss_isolado': isolada,
+              'linhas_entrada': sum(linhas_entrada) if linhas_entrada else None, 'linhas_saida': _linhas(resultado), **coletor}
+    return resultado, medida
+
+
+class ExecucaoMetricas:
+    """Medidas das etapas de uma execução do pipeline e o seu manifesto.
+
+    Args:
+        diretorio (str, optional): Diretório das execuções; o manifesto e os
+                                   perfis ficam em `<diretorio>/<id>/` e as
+                                   tabelas acumuladas em `<diretorio>/`. Sem
+                                   ele, as medidas são só mantidas em memória.
+        modo (str): Modo do pipeline ('completo', 'streaming' ou 'incremental').
+        perfilador (str, optional): Um de PERFILADORES, aplicado a cada etapa.
+        entradas (list): Arquivos brutos cujos tamanhos e datas de modificação
+                         vão para o manifesto.
+    """
+
+    def __init__(self, diretorio: str | None = None, modo: str = 'completo', perfilador: str | None = None, entradas: list = ()):
+        self.id = datetime.now().strftime('%Y%m%dT%H%M%S') + f'-{os.getpid()}'
+        self.diretorio = diretorio
+        self.modo = modo
+        self.perfilador = perfilador
+        self.entradas = list(entradas)
+        self.inicio = datetime.now()
+        self.etapas = []
+        self._lock = threading.Lock()
+        if perfilador and diretorio:
+            os.makedirs(self.dir_perfis, exist_ok=True)
+
+    @property
+    def dir_execucao(self) -> str:
+        return os.path.join(self.diretorio, self.id)
+
+    @property
+    def dir_perfis(self) -> str:
+        return os.path.join(self.dir_execucao, 'perfis')
+
+    def opcoes(self, etapa: str, isolada: bool) -> dict:
+        """Opções de `executar_medindo` para uma etapa."""
+        opcoes = {'isolada': isolada}
+        if self.perfilador and self.diretorio:
+            opcoes.update(perfilador=self.perfilador, arquivo_perfil=os.path.join(self.dir_perfis, etapa))
+        return opcoes
+
+    def registrar(self, etapa: str, medida: dict, origem: str = 'executada'):
+        """Guarda a medida de uma etapa (ou só a origem, para etapas reaproveitadas do cache)."""
+        with self._lock:
+            self.etapas.append({'etapa': etapa, 'origem': origem, **medida})
+
+    def medir(self, etapa: str, funcao, *argumentos):
+        """Executa e mede uma etapa no próprio processo e devolve o seu resultado."""
+        resultado, medida = executar_medindo(funcao, argumentos, self.opcoes(etapa, isolada=True))
+        self.registrar(etapa, medida)
+        return resultado
+
+    def manifesto(self, status: str) -> dict:
+        """Monta o manifesto da execução: identificação, ambiente, entradas e medidas por etapa."""
+        fim = datetime.now()
+        versoes = {nome: getattr(sys.modules[nome], '__version__', None) for nome in ('numpy', 'pandas', 'pyarrow', 'sklearn', 'scipy')
+                   if nome in sys.modules}
+        entradas = {caminho: {'bytes': os.path.getsize(caminho), 'modificado_em': datetime.fromtimestamp(os.path.getmtime(caminho)).isoformat()}
+                    for caminho in self.entradas if os.path.exists(caminho)}
+        return {'id': self.id, 'modo': self.modo, 'status': status, 'inicio': self.inicio.isoformat(), 'fim': fim.isoformat(),
+                'duracao_s': (fim - self.inicio).total_seconds(), 'argumentos': sys.argv[1:], 'perfilador': self.perfilador,
+                'ambiente': {'python': platform.python_version(), 'plataforma': platform.platform(), 'cpus': os.cpu_count(), **versoes},
+                'pico_rss_processo_mb': memoria_rss_mb()[1], 'entradas': entradas, 'etapas': self.etapas}
+
+    def tabelas(self) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """As medidas por etapa e as taxas de normalização por etapa e coluna, uma linha cada."""
+        colunas = ['etapa', 'origem', 'segundos', 'cpu_s', 'pico_rss_mb', 'pico_rss_isolado', 'linhas_entrada', 'linhas_saida']
+        etapas = pd.DataFrame(self.etapas).reindex(columns=colunas).astype({'linhas_entrada': 'Int64', 'linhas_saida': 'Int64'})
+        etapas = etapas.round({'segundos': 4, 'cpu_s': 4, 'pico_rss_mb': 1})
+        normalizacao = pd.DataFrame([{'etapa': e['etapa'], 'coluna': coluna, **medida}
+                                     for e in self.etapas for coluna, medida in e.get('normalizacao', {}).items()],
+                                    columns=['etapa', 'coluna', 'padrao', 'linhas', 'nulas', 'no_padrao'])
+        normalizacao['taxa_reconhecida'] = (1 - normalizacao['no_padrao'] / normalizacao['linhas'].where(normalizacao['linhas'] > 0)).round(4)
+        for tabela in (etapas, normalizacao):
+            tabela.insert(0, 'execucao', self.id)
+            tabela.insert(1, 'modo', self.modo)
+        return etapas, normalizacao
+
+    def finalizar(self, status: str = 'ok') -> str | None:
+        """Grava o manifesto e acrescenta as medidas às tabelas acumuladas.
+
+        Returns:
+            str | None: Caminho do manifesto, ou None se não houver diretório.
+        """
+        if not self.diretorio:
+            return None
+        os.makedirs(self.dir_execucao, exist_ok=True)
+        caminho = os.path.join(self.dir_execucao, ARQUIVO_MANIFESTO)
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(self.manifesto(status), f, ensure_ascii=False, indent=2, default=str)
+        for tabela, nome in zip(self.tabelas(), (TABELA_ETAPAS, TABELA_NORMALIZACAO)):
+            destino = os.path.join(self.diretorio, nome)
+            tabela.to_csv(destino, mode='a', header=not os.path.exists(destino), index=False)
+        return caminho
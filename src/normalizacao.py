@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+"""
+Motor de Normalização de Categorias - TransDevs Data Analysis
+
+Este módulo concentra a lógica de padronização de textos livres usada pelo
+pipeline de `analysis.py`. Em vez de aplicar uma função Python linha a linha,
+o motor fatoriza a série de entrada, normaliza apenas os valores distintos
+e devolve o resultado como um `pd.Categorical`, de forma que o custo passa a
+depender do número de grafias diferentes e não do número de inscrições.
+"""
+
+import re
+import numpy as np
+import pandas as pd
+
+# Caracteres e prefixos removidos antes da comparação com o mapa de variações.
+PADRAO_LIMPEZA = re.compile(r'\[|\]|"|etnia_|identidade_')
+
+
+class NormalizadorCategorias:
+    """Normaliza textos livres para um conjunto fechado de categorias.
+
+    As regras são as mesmas da versão linha a linha de `padronizar_categorias`:
+    valores nulos recebem o padrão, o texto é limpo e comparado primeiro por
+    igualdade exata e, em seguida, pela primeira variação (na ordem do mapa)
+    contida no texto. A busca por substring usa um único regex pré-compilado
+    cujas alternativas são lookaheads na ordem do mapa, preservando a
+    prioridade original entre variações.
+
+    Args:
+        mapa_variacoes (dict): Categorias padronizadas como chaves e listas de
+                               variações como valores.
+        padrao (str): Valor atribuído a nulos e a textos sem correspondência.
+    """
+
+    def __init__(self, mapa_variacoes: dict, padrao: str):
+        self.padrao = padrao
+        # Mapa direto de variação para categoria. Ex: {'sao paulo': 'SP', 'sp': 'SP'}
+        self.mapa_direto = {v: k for k, l in mapa_variacoes.items() for v in l}
+        # Categorias em ordem lexicográfica para que agrupamentos e ordenações
+        # sobre o Categorical sigam a mesma ordem das antigas colunas de texto.
+        self.categorias = sorted(set(mapa_variacoes) | {padrao})
+        self._indice_categoria = {c: i for i, c in enumerate(self.categorias)}
+
+        # Cada alternativa é um lookahead que procura a variação em qualquer posição;
+        # como o regex testa as alternativas em ordem, o grupo capturado indica a
+        # primeira variação do mapa presente no texto.
+        variacoes = list(self.mapa_direto)
+        self._destinos_busca = [self.mapa_direto[v] for v in variacoes]
+        self._busca = re.compile('|'.join(f'(?=.*?({re.escape(v)}))' for v in variacoes), re.DOTALL) if variacoes else None
+
+    def mapear_valor(self, valor) -> str:
+        """Mapeia um único valor não nulo para sua categoria padronizada."""
+        texto_limpo = PADRAO_LIMPEZA.sub('', str(valor).lower().strip())
+        if texto_limpo in self.mapa_direto:
+            return self.mapa_direto[texto_limpo]
+        if self._busca is not None:
+            correspondencia = self._busca.match(texto_limpo)
+            if correspondencia is not None:
+                return self._destinos_busca[correspondencia.lastindex - 1]
+        return self.padrao
+
+    def __call__(self, series: pd.Series) -> pd.Series:
+        """Padroniza uma série inteira normalizando apenas seus valores distintos.
+
+        Args:
+            series (pd.Series): A série do Pandas a ser padronizada.
+
+        Returns:
+            pd.Series: Série categórica, com o mesmo índice da entrada, cujas
+                       categorias são as chaves do mapa e o padrão.
+        """
+        codigos, unicos = pd.factorize(series)
+        codigos_unicos = np.fromiter(
+            (self._indice_categoria[self.mapear_valor(v)] for v in np.asarray(unicos, dtype=object)),
+            dtype=np.int32, count=len(unicos))
+        # O código -1 do factorize (nulos) indexa a última posição, que recebe o padrão.
+        codigos_unicos = np.append(codigos_unicos, self._indice_categoria[self.padrao])
+        categorias = pd.Categorical.from_codes(codigos_unicos[codigos], categories=self.categorias)
+        return pd.Series(categorias, index=series.index, name=series.name)
+
+
+class ResolvedorCidades:
+    """Padroniza nomes de cidades considerando o estado já padronizado.
+
+    Reproduz as regras de `padronizar_cidade_final`: cidade nula vira
+    'Não Informado'; o nome é cortado no primeiro '/', ',' ou '-'; uma cidade
+    do mapa cujo estado coincide com o estado padronizado é mantida; nomes da
+    lista de lixo ou compostos só por dígitos viram 'Inválido'; os demais são
+    capitalizados. O mapa e a lista de lixo são preparados uma única vez e a
+    resolução trabalha sobre os pares distintos (cidade, estado).
+
+    Args:
+        mapa_cidade_estado (dict): Nome de cidade em minúsculas para sigla do estado.
+        lixo (list): Valores genéricos ou inválidos que não representam uma cidade.
+    """
+
+    def __init__(self, mapa_cidade_estado: dict, lixo: list):
+        self.mapa_cidade_estado = mapa_cidade_estado
+        self.lixo = frozenset(l.lower() for l in lixo)
+
+    def __call__(self, cidade: pd.Series, estado: pd.Series) -> pd.Series:
+        """Resolve a cidade padronizada de cada linha.
+
+        Args:
+            cidade (pd.Series): Nomes de cidade como digitados na inscrição.
+            estado (pd.Series): Estado padronizado de cada linha.
+
+        Returns:
+            pd.Series: Série categórica com a cidade padronizada, com o mesmo
+                       índice de `cidade`.
+        """
+        codigos_cidade, cidades = pd.factorize(cidade)
+        codigos_estado, estados = pd.factorize(estado)
+
+        # Identifica os pares distintos (cidade, estado); o deslocamento de +1
+        # mantém os nulos (-1) como um valor válido na chave combinada.
+        n_estados = len(estados) + 1
+        chave_par = (codigos_cidade.astype(np.int64) + 1) * n_estados + (codigos_estado + 1)
+        pares, inverso = np.unique(chave_par, return_inverse=True)
+        par_cidade = pares // n_estados - 1
+        par_estado = pares % n_estados - 1
+
+        # Limpeza vetorizada apenas das cidades distintas.
+        limpas = pd.Series(np.asarray(cidades, dtype=object), dtype=object).astype(str).str.lower().str.strip()
+        limpas = limpas.str.split(r'/|,|-', n=1, regex=True).str[0].str.strip()
+        titulo = limpas.str.title().to_numpy(dtype=object)
+        invalida = (limpas.isin(self.lixo) | limpas.str.isdigit()).to_numpy(dtype=bool)
+        estado_mapeado = limpas.map(self.mapa_cidade_estado).to_numpy(dtype=object)
+
+        # Resolve cada par; o índice -1 dos nulos aponta para o sentinela final.
+        titulo_par = np.append(titulo, None)[par_cidade]
+        invalida_par = np.append(invalida, False)[par_cidade]
+        estado_cidade_par = np.append(estado_mapeado, None)[par_cidade]
+        estado_par = np.append(np.asarray(estados, dtype=object), None)[par_estado]
+        consistente = pd.notna(estado_cidade_par) & (estado_cidade_par == estado_par)
+        resultado_par = np.where(consistente | ~invalida_par, titulo_par, 'Inválido')
+        resultado_par = np.where(par_cidade < 0, 'Não Informado', resultado_par).astype(object)
+
+        categorias_par = pd.Categorical(resultado_par)
+        categorias = pd.Categorical.from_codes(categorias_par.codes[inverso.ravel()], categories=categorias_par.categories)
+        return pd.Series(categorias, index=cidade.index, name='cidade_padronizada')
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+"""
+Páginas do Dashboard - TransDevs Data Analysis
+
+Registro das páginas do dashboard. Cada página é um módulo deste pacote com
+uma função `exibir()`, importado só quando a página é aberta pela primeira
+vez no processo: as bibliotecas de gráficos (Matplotlib, Seaborn e Plotly)
+são importadas pelos módulos das páginas que as usam, e as constantes e
+funções de cada página são criadas uma única vez, e não a cada interação.
+
+Cada página tem um orçamento de latência, em milissegundos, para a primeira
+execução no processo (que inclui a importação do módulo e das bibliotecas)
+e para as execuções seguintes. O dashboard mede cada execução e registra em
+`MedicoesPaginas`; `medir_paginas.py` mede as páginas em processos novos e
+compara com os mesmos orçamentos.
+"""
+
+import logging
+import importlib
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Número de execuções recentes de cada página usadas na mediana e no máximo das medições.
+JANELA_MEDICOES = 50
+
+
+class Pagina:
+    """Uma página do dashboard e os seus orçamentos de latência.
+
+    Args:
+        titulo (str): Título exibido na navegação.
+        modulo (str): Nome do módulo da página neste pacote.
+        orcamento_frio_ms (float): Tempo máximo da primeira execução da página no
+                                   processo, incluindo as importações.
+        orcamento_rerun_ms (float): Tempo máximo das execuções seguintes.
+    """
+
+    def __init__(self, titulo: str, modulo: str, orcamento_frio_ms: float, orcamento_rerun_ms: float):
+        self.titulo = titulo
+        self.modulo = modulo
+        self.orcamento_frio_ms = orcamento_frio_ms
+        self.orcamento_rerun_ms = orcamento_rerun_ms
+
+
+# Páginas na ordem da navegação. Orçamentos medidos com `medir_paginas.py` (execução inteira do
+# script, em um processo novo para a primeira execução), com folga para máquinas mais lentas.
+PAGINAS = (
+    Pagina("Visão Geral", 'visao_geral', 6000, 600),
+    Pagina("Crescimento & Cursos", 'crescimento', 6000, 600),
+    Pagina("Perfil Demográfico", 'demografico', 6500, 900),
+    Pagina("Perfil Profissional", 'profissional', 5500, 500),
+    Pagina("Análises Cruzadas", 'cruzadas', 7000, 1500),
+    Pagina("Personas da Comunidade", 'personas', 2000, 300),
+    Pagina("Análise de Voluntariado", 'voluntariado', 5500, 600),
+    Pagina("Planejamento Estratégico", 'planejamento', 5500, 700),
+)
+
+
+def buscar_pagina(titulo: str) -> Pagina:
+    """Retorna a página registrada com o `titulo` informado.
+
+    Raises:
+        KeyError: Se nenhuma página tiver esse título.
+    """
+    for pagina in PAGINAS:
+        if pagina.titulo == titulo:
+            return pagina
+    raise KeyError(f"Página desconhecida: '{titulo}'.")
+
+
+def carregar_pagina(pagina: Pagina):
+    """Importa o módulo de uma página (só na primeira vez; depois ele vem de `sys.modules`)."""
+    return importlib.import_module(f'{__name__}.{pagina.modulo}')
+
+
+class MedicoesPaginas:
+    """Tempos de execução de cada página no processo, comparados com os orçamentos.
+
+    A primeira execução registrada de uma página é a execução fria; as
+    seguintes entram em uma janela das `JANELA_MEDICOES` mais recentes.
+    Execuções acima do orçamento são registradas no log como aviso.
+    """
+
+    def __init__(self):
+        self._medicoes = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, pagina: Pagina, importacao_ms: float, total_ms: float) -> bool:
+        """Registra uma execução da página.
+
+        Args:
+            pagina (Pagina): A página executada.
+            importacao_ms (float): Tempo de importação do módulo da página.
+            total_ms (float): Tempo da execução inteira do script.
+
+        Returns:
+            bool: True se a execução ficou dentro do orçamento.
+        """
+        with self._lock:
+            medicao = self._medicoes.get(pagina.titulo)
+            fria = medicao is None
+            if fria:
+                medicao = self._medicoes[pagina.titulo] = {'fria_ms': total_ms, 'importacao_ms': importacao_ms,
+                                                            'reruns_ms': deque(maxlen=JANELA_MEDICOES)}
+            else:
+                medicao['reruns_ms'].append(total_ms)
+        orcamento = pagina.orcamento_frio_ms if fria else pagina.orcamento_rerun_ms
+        if total_ms > orcamento:
+            logger.warning(f"Página '{pagina.titulo}' levou {total_ms:.0f} ms ({'primeira execução' if fria else 'rerun'}; "
+                           f"orçamento de {orcamento:.0f} ms).")
+            return False
+        return True
+
+    def resumo(self) -> list:
+        """Retorna uma linha por página executada, na ordem da navegação.
+
+        Returns:
+            list: Dicionários com 'pagina', 'fria_ms', 'orcamento_frio_ms',
+                  'importacao_ms', 'reruns', 'rerun_mediana_ms', 'rerun_max_ms'
+                  e 'orcamento_rerun_ms'.
+        """
+        linhas = []
+        with self._lock:
+            for pagina in PAGINAS:
+                medicao = self._medicoes.get(pagina.titulo)
+                if medicao is None:
+                    continue
+                reruns = sorted(medicao['reruns_ms'])
+                linhas.append({'pagina': pagina.titulo, 'fria_ms': round(medicao['fria_ms']), 'orcamento_frio_ms': pagina.orcamento_frio_ms,
+                               'importacao_ms': round(medicao['importacao_ms']), 'reruns': len(reruns),
+                               'rerun_mediana_ms': round(reruns[len(reruns) // 2]) if reruns else None,
+                               'rerun_max_ms': round(reruns[-1]) if reruns else None, 'orcamento_rerun_ms': pagina.orcamento_rerun_ms})
+        return linhas
+
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+
+"""
+Funções Comuns das Páginas - TransDevs Data Analysis
+
+Caminhos das tabelas, paleta de cores e fontes de consulta (cubo de
+contagens ou backend SQL) compartilhados pelas páginas do dashboard. Este
+módulo não importa bibliotecas de gráficos; os gráficos Matplotlib ficam em
+`paginas.graficos`.
+"""
+
+import os
+import hashlib
+import streamlit as st
+import pandas as pd
+from armazenamento import carregar_tabela, caminho_parquet # Leitura das tabelas em Parquet (memory map), com CSV como alternativa.
+from cubo import ConsultasCubo, ORDEM_CATEGORIAS, montar_cubo # Consultas ao cubo de contagens pré-calculado pelo 'analysis.py'.
+from cache_tabelas import CacheTabelas # Uma cópia de cada tabela para todas as sessões, com orçamento de memória.
+from consultas import ConsultasSQL, duckdb_disponivel # Backend SQL opcional (DuckDB embarcado) sobre os arquivos Parquet.
+
+# --- Definição de Caminhos ---
+# Determina o diretório raiz do projeto para localizar os arquivos de dados e relatórios.
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Caminho para a imagem do logo da TransDevs.
+LOGO_PATH = os.path.join(PROJECT_ROOT, "logo-difersificadev-light.png")
+
+# Caminhos para os arquivos de dados processados e relatórios gerados pelo script 'analysis.py'.
+# Os gráficos e indicadores das páginas são fatias do cubo de contagens (pessoas e inscrições por
+# combinação de dimensões), cujo tamanho não depende do número de pessoas.
+CUBO_PATH = os.path.join(PROJECT_ROOT, 'data', 'processed', 'cubo_contagens.csv')
+# Com o backend SQL ('MOTOR_CONSULTAS = "duckdb"' nos secrets), as mesmas consultas são executadas pelo
+# DuckDB diretamente sobre os Parquet da dimensão de pessoas e da tabela fato de inscrições.
+PESSOAS_PATH = os.path.join(PROJECT_ROOT, 'data', 'processed', 'dim_pessoas.csv')
+INSCRICOES_PATH = os.path.join(PROJECT_ROOT, 'data', 'processed', 'fato_inscricoes.csv')
+# Sem o cubo (que não é versionado), as tabelas são montadas a partir do consolidado, que é.
+CONSOLIDADO_PATH = os.path.join(PROJECT_ROOT, 'data', 'processed', 'dados_consolidados_comunidade.csv')
+PERSONA_SUMMARY_PATH = os.path.join(PROJECT_ROOT, 'reports', 'persona_summary_refinado.csv')
+PERSONA_DETAILS_PATH = os.path.join(PROJECT_ROOT, 'reports', 'persona_details_refinado.csv')
+ATUACAO_COUNT_PATH = os.path.join(PROJECT_ROOT, 'reports', 'atuacao_voluntariado_counts.csv')
+CRESCIMENTO_PATH = os.path.join(PROJECT_ROOT, 'reports', 'crescimento_mensal.csv')
+MAP_SUMMARY_PATH = os.path.join(PROJECT_ROOT, 'reports', 'mapa_resumo_estados.csv')
+BRAZIL_GEOJSON_PATH = os.path.join(PROJECT_ROOT, 'data', 'raw', 'brazil_states.geojson') # Caminho para o arquivo GeoJSON dos estados do Brasil.
+
+# --- Paleta de Cores e Estilo ---
+# Define a paleta de cores para o dashboard, otimizada para o tema escuro.
+PRIMARY_COLOR = "#C738D8" # Cor principal (roxo/magenta).
+BACKGROUND_COLOR = "#121212" # Cor de fundo escura.
+TEXT_COLOR = "#FFFFFF" # Cor do texto branco.
+SECONDARY_PALETTE = "plasma" # Paleta de cores secundária para gráficos (ex: Seaborn).
+
+# Tipos das colunas das tabelas lidas de CSV (no Parquet eles já vêm gravados): as dimensões
+# ordenadas voltam como categorias ordenadas e as listas dos detalhes das personas, como listas.
+TIPOS_COLUNAS = {coluna: pd.CategoricalDtype(ordem, ordered=True) for coluna, ordem in ORDEM_CATEGORIAS.items()}
+COLUNAS_LISTA = ('level_distribution', 'top_schooling', 'top_technologies')
+
+# Número máximo de versões dos dados mantidas nos caches de consultas e de visões derivadas.
+MAX_VERSOES_CACHE = 4
+
+# Orçamento de memória padrão do cache de tabelas, em MB ('ORCAMENTO_CACHE_MB' nos secrets o substitui).
+ORCAMENTO_CACHE_MB_PADRAO = 256
+
+def versao_arquivo(caminho_arquivo: str) -> str:
+    """Identifica a versão de uma tabela pela data de modificação e pelo tamanho dos seus arquivos (Parquet e CSV).
+
+    Args:
+        caminho_arquivo (str): O caminho CSV de referência da tabela.
+
+    Returns:
+        str: Um resumo curto dos estados dos arquivos ('' se nenhum existir).
+    """
+    estados = []
+    for arquivo in (caminho_parquet(caminho_arquivo), caminho_arquivo):
+        if os.path.exists(arquivo):
+            estado = os.stat(arquivo)
+            estados.append(f"{arquivo}:{estado.st_mtime_ns}:{estado.st_size}")
+    return hashlib.sha1("|".join(estados).encode()).hexdigest()[:16] if estados else ''
+
+def versao_dados() -> str:
+    """Identifica a versão do conjunto de tabelas processadas lidas pelas páginas.
+
+    Muda sempre que o 'analysis.py' regrava alguma das tabelas, invalidando as
+    fontes de consulta, as visões derivadas e as imagens guardadas no cache.
+
+    Returns:
+        str: Um resumo curto das versões das tabelas.
+    """
+    versoes = [versao_arquivo(caminho) for caminho in (CUBO_PATH, PESSOAS_PATH, INSCRICOES_PATH, CONSOLIDADO_PATH,
+                                                               ATUACAO_COUNT_PATH, MAP_SUMMARY_PATH)]
+    return hashlib.sha1("|".join(versoes).encode()).hexdigest()[:16]
+
+@st.cache_resource # Um único cache para o processo, compartilhado por todas as sessões.
+def cache_tabelas() -> CacheTabelas:
+    """Cria o cache de tabelas com o orçamento de memória configurado."""
+    orcamento_mb = float(st.secrets.get("ORCAMENTO_CACHE_MB", ORCAMENTO_CACHE_MB_PADRAO))
+    return CacheTabelas(int(orcamento_mb * 1024 ** 2))
+
+def ler_tabela(caminho_arquivo: str) -> pd.DataFrame:
+    """Lê uma tabela com os tipos explícitos das colunas.
+
+    Args:
+        caminho_arquivo (str): O caminho CSV de referência da tabela.
+
+    Returns:
+        pd.DataFrame or None: A tabela, ou None se nenhum dos arquivos existir.
+    """
+    df = carregar_tabela(caminho_arquivo, tipos=TIPOS_COLUNAS, colunas_lista=COLUNAS_LISTA)
+    if df is not None:
+        # Remove categorias sem ocorrência para que os gráficos não exibam barras vazias.
+        for coluna in df.select_dtypes(include='category').columns:
+            df[coluna] = df[coluna].cat.remove_unused_categories()
+    return df
+
+def carregar_tabela_dashboard(caminho_arquivo: str) -> pd.DataFrame:
+    """Carrega uma tabela gerada pelo 'analysis.py'.
+
+    Lê a versão Parquet da tabela com memory map quando ela existe, mantendo
+    as categorias ordenadas e as colunas de listas; caso contrário, lê o CSV
+    com os tipos de `TIPOS_COLUNAS` e `COLUNAS_LISTA`. Cada versão dos arquivos
+    é lida uma única vez para todas as sessões (ver `cache_tabelas`), e cada
+    chamada recebe uma cópia rasa, sem cópia dos dados; uma tabela regravada
+    pelo 'analysis.py' é lida de novo na próxima interação, sem reiniciar o
+    dashboard. Retorna None se nenhum dos arquivos for encontrado.
+
+    Args:
+        caminho_arquivo (str): O caminho CSV de referência da tabela.
+
+    Returns:
+        pd.DataFrame or None: Um DataFrame do Pandas se o arquivo for carregado com sucesso,
+                              ou None se o arquivo não existir.
+    """
+    return cache_tabelas().obter(caminho_arquivo, versao_arquivo(caminho_arquivo), ler_tabela)
+
+def montar_cubo_consolidado(caminho_consolidado: str) -> pd.DataFrame:
+    """Monta o cubo de contagens a partir do consolidado gravado pelo 'analysis.py'.
+
+    A dimensão de pessoas e a tabela fato são montadas como no pipeline
+    (`analysis.montar_dimensao_pessoas` e `analysis.montar_fato_inscricoes`).
+    O consolidado repete cada inscrição em todas as combinações de perfil e
+    voluntariado da pessoa, e as inscrições são recuperadas sem as colunas de
+    perfil e voluntariado e sem as linhas repetidas.
+
+    Args:
+        caminho_consolidado (str): O caminho CSV de referência do consolidado.
+
+    Returns:
+        pd.DataFrame or None: O cubo, ou None se o consolidado não existir.
+    """
+    # Importado só aqui: o dashboard não depende do pipeline quando o cubo já foi gravado.
+    from analysis import montar_dimensao_pessoas, montar_fato_inscricoes, COLUNAS_PERFIL, COLUNAS_VOLUNTARIADO
+    df_final = ler_tabela(caminho_consolidado)
+    if df_final is None or 'person_id' not in df_final.columns:
+        return None
+    colunas_pessoa = [*COLUNAS_PERFIL, *COLUNAS_VOLUNTARIADO, 'atuacao_tags', 'perfil_aluno', 'persona']
+    inscricoes = df_final.drop(columns=[col for col in colunas_pessoa if col in df_final.columns]).drop_duplicates()
+    return montar_cubo(montar_dimensao_pessoas(df_final), montar_fato_inscricoes(inscricoes))
+
+@st.cache_resource(max_entries=MAX_VERSOES_CACHE) # A conexão é compartilhada entre as sessões; cada consulta abre o seu próprio cursor.
+def abrir_consultas_sql(caminho_pessoas: str, caminho_inscricoes: str, versao: str) -> ConsultasSQL:
+    """Abre o backend SQL sobre os Parquet da dimensão de pessoas e da tabela fato (uma conexão por versão dos dados)."""
+    return ConsultasSQL(caminho_pessoas, caminho_inscricoes)
+
+def carregar_consultas():
+    """Retorna a fonte das consultas das páginas.
+
+    Usa o backend SQL (DuckDB) se ele estiver configurado nos secrets
+    ('MOTOR_CONSULTAS = "duckdb"'), instalado e com as tabelas em Parquet;
+    caso contrário, usa o cubo de contagens. Se o cubo não tiver sido gravado,
+    ele é montado a partir do consolidado (ver `montar_cubo_consolidado`).
+    Retorna None se nenhuma das fontes estiver disponível.
+
+    Returns:
+        ConsultasSQL or ConsultasCubo or None: A fonte das consultas.
+    """
+    if st.secrets.get("MOTOR_CONSULTAS", "cubo") == "duckdb":
+        if not duckdb_disponivel():
+            st.sidebar.warning("Backend SQL indisponível: instale o pacote 'duckdb'. Usando o cubo de contagens.")
+        else:
+            try:
+                return abrir_consultas_sql(PESSOAS_PATH, INSCRICOES_PATH, versao_dados())
+            except FileNotFoundError as e:
+                st.sidebar.warning(f"{e}. Usando o cubo de contagens.")
+    cubo = carregar_tabela_dashboard(CUBO_PATH)
+    if cubo is None:
+        # O cubo montado do consolidado fica no cache de tabelas, na entrada do cubo, até o consolidado mudar.
+        cubo = cache_tabelas().obter(CUBO_PATH, f"consolidado:{versao_arquivo(CONSOLIDADO_PATH)}",
+                                     lambda _: montar_cubo_consolidado(CONSOLIDADO_PATH))
+    return ConsultasCubo(cubo) if cubo is not None else None
+
+# Filtro das pessoas interessadas em voluntariar, usado pelas páginas de voluntariado e de planejamento.
+VOLUNTARIOS = {'is_volunteer': 'Sim'}
+
+@st.cache_data(show_spinner=False, max_entries=MAX_VERSOES_CACHE)
+def calcular_visoes(versao: str, _consultas) -> dict:
+    """Pré-calcula as visões derivadas reaproveitadas por mais de uma página.
+
+    Args:
+        versao (str): Versão dos dados (ver `versao_dados`); só entra na chave do cache.
+        _consultas (ConsultasCubo | ConsultasSQL): A fonte das consultas (não entra na chave).
+
+    Returns:
+        dict: 'total_pessoas', 'estados_brasileiros' (pessoas por estado, sem
+              'Internacional' e 'Inválido'), 'total_voluntarios' e 'generos'
+              (os gêneros presentes, em ordem).
+    """
+    return {
+        'total_pessoas': _consultas.total(),
+        'estados_brasileiros': _consultas.fatiar(['estado_padronizado']).drop(['Internacional', 'Inválido'], errors='ignore'),
+        'total_voluntarios': _consultas.total(VOLUNTARIOS) if _consultas.tem_dimensoes('is_volunteer') else 0,
+        'generos': _consultas.fatiar(['genero_padronizado']).index.tolist(),
+    }
+
+def contar(consultas, dimensao: str, normalizar: bool = False, filtros: dict | None = None) -> pd.Series:
+    """Conta as pessoas de cada valor de uma dimensão, como o `value_counts` da coluna.
+
+    Args:
+        consultas (ConsultasCubo | ConsultasSQL): A fonte das consultas (ver `carregar_consultas`).
+        dimensao (str): A dimensão contada.
+        normalizar (bool): Se True, retorna percentuais (0 a 100) em vez de contagens.
+        filtros (dict, optional): Valores aceitos em outras dimensões (ver `ConsultasCubo.fatiar`).
+
+    Returns:
+        pd.Series: As contagens em ordem decrescente.
+    """
+    contagem = consultas.fatiar([dimensao], filtros).sort_values(ascending=False, kind='stable')
+    return contagem / contagem.sum() * 100 if normalizar else contagem
+
+def tabela_cruzada(consultas, linhas: str, colunas: str, normalizar: str = 'index') -> pd.DataFrame:
+    """Cruza duas dimensões, como o `pd.crosstab` normalizado das colunas.
+
+    Args:
+        consultas (ConsultasCubo | ConsultasSQL): A fonte das consultas (ver `carregar_consultas`).
+        linhas (str): A dimensão das linhas.
+        colunas (str): A dimensão das colunas.
+        normalizar (str): 'index' (cada linha soma 1) ou 'columns' (cada coluna soma 1).
+
+    Returns:
+        pd.DataFrame: As proporções de cada combinação.
+    """
+    contagem = consultas.fatiar([linhas, colunas]).unstack(fill_value=0)
+    if normalizar == 'index':
+        return contagem.div(contagem.sum(axis=1), axis=0)
+    return contagem.div(contagem.sum(axis=0), axis=1)
+
+def moda_por(consultas, grupo: str, dimensao: str, filtros: dict | None = None) -> pd.Series:
+    """Retorna o valor mais frequente de `dimensao` em cada valor de `grupo` (empates ficam com o primeiro valor)."""
+    contagem = consultas.fatiar([grupo, dimensao], filtros).rename('n').reset_index()
+    contagem = contagem.sort_values([grupo, 'n', dimensao], ascending=[True, False, True], kind='stable')
+    return contagem.drop_duplicates(grupo).set_index(grupo)[dimensao].astype(object)
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+"""
+Página "Crescimento & Cursos" do Dashboard - TransDevs Data Analysis
+
+Crescimento mensal da comunidade e desempenho dos cursos.
+"""
+
+import streamlit as st
+import matplotlib.pyplot as plt # Biblioteca para criação de gráficos estáticos.
+import seaborn as sns # Biblioteca para visualização de dados baseada no matplotlib, com estética aprimorada.
+from paginas.comum import CRESCIMENTO_PATH, PRIMARY_COLOR, BACKGROUND_COLOR, carregar_consultas, carregar_tabela_dashboard
+from paginas.graficos import exibir_figura, clean_spines
+
+def exibir():
+    """Exibe a página."""
+    st.title("Análise de Crescimento e Cursos")
+    st.markdown("Acompanhe a evolução da comunidade e entenda a performance de cada iniciativa educacional.")
+    st.markdown("---")
+    st.subheader("Crescimento da Comunidade ao Longo do Tempo")
+    df_growth = carregar_tabela_dashboard(CRESCIMENTO_PATH) # Carrega os dados de crescimento.
+    if df_growth is not None:
+        df_growth = df_growth.set_index('periodo') # Define 'periodo' como índice.
+        col1, col2 = st.columns(2) # Divide a página em duas colunas.
+        with col1:
+            st.write("**Novas Pessoas por Mês**")
+            st.bar_chart(df_growth['novas_pessoas'], color=PRIMARY_COLOR) # Gráfico de barras para novas pessoas.
+        with col2:
+            st.write("**Total Acumulado de Pessoas**")
+            st.line_chart(df_growth['total_acumulado'], color=PRIMARY_COLOR) # Gráfico de linha para o total acumulado.
+    else:
+        st.warning("Dados de crescimento não encontrados. Execute 'analysis.py' para gerá-los e atualize o repositório.")
+    
+    consultas = carregar_consultas() # Fonte das contagens (cubo ou backend SQL).
+    if consultas is not None and consultas.tem_dimensoes('curso_titulo'):
+        st.markdown("---")
+        st.subheader("Análise de Performance dos Cursos")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("**Popularidade (Total de Inscrições)**")
+            popularidade = consultas.fatiar(['curso_titulo'], medida='n_inscricoes').sort_values(ascending=False).rename('inscrições') # Inscrições por título de curso.
+            st.dataframe(popularidade)
+        with col2:
+            st.markdown("**Alcance (Pessoas Únicas)**")
+            alcance = consultas.fatiar(['curso_titulo']).sort_values(ascending=False).rename('pessoas') # Pessoas únicas por curso.
+            st.dataframe(alcance)
+        
+        st.markdown("---")
+        st.subheader("Engajamento: Inscrições por Pessoa")
+        # Gráfico mostrando quantas pessoas se inscrevem em múltiplos cursos.
+        def desenhar_inscricoes_por_pessoa():
+            inscricoes_por_pessoa = consultas.fatiar(['cursos_inscritos']).sort_index()
+            inscricoes_por_pessoa.index = inscricoes_por_pessoa.index.astype(int)
+            fig, ax = plt.subplots(figsize=(10, 6))
+            sns.barplot(x=inscricoes_por_pessoa.index, y=inscricoes_por_pessoa.values, ax=ax, color=PRIMARY_COLOR, edgecolor=BACKGROUND_COLOR)
+            ax.set_title("Quantas Pessoas se Inscrevem em Múltiplos Cursos?")
+            ax.set_xlabel("Número de Cursos Inscritos")
+            ax.set_ylabel("Número de Pessoas")
+            clean_spines(ax)
+            for c in ax.containers:
+                ax.bar_label(c) # Adiciona rótulos de contagem nas barras.
+            return fig
+        exibir_figura('cursos_inscricoes_por_pessoa', desenhar_inscricoes_por_pessoa)
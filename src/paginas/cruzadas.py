@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+"""
+Página "Análises Cruzadas" do Dashboard - TransDevs Data Analysis
+
+Barras empilhadas do nível profissional e da situação de trabalho por
+região, gênero, faixa etária e etnia. Não usa o Seaborn.
+"""
+
+import streamlit as st
+from paginas.comum import carregar_consultas, tabela_cruzada
+from paginas.graficos import exibir_figura, figura_barras_empilhadas
+
+def exibir():
+    """Exibe a página."""
+    st.title("Análises Cruzadas e Insights Aprofundados")
+    consultas = carregar_consultas() # Fonte das contagens (cubo ou backend SQL).
+    if consultas is not None:
+        st.subheader("Composição do Nível Profissional por Região")
+        # Gráfico de barras empilhadas horizontal para nível profissional por região.
+        exibir_figura('cruzadas_regiao_nivel', lambda: figura_barras_empilhadas(
+            tabela_cruzada(consultas, 'regiao', 'professional_level_padronizado'), True, 'viridis', (14, 8), 'Nível Profissional'))
+        
+        st.subheader("Composição do Nível Profissional por Gênero")
+        # Gráfico de barras empilhadas horizontal para nível profissional por gênero.
+        exibir_figura('cruzadas_genero_nivel', lambda: figura_barras_empilhadas(
+            tabela_cruzada(consultas, 'genero_padronizado', 'professional_level_padronizado'), True, 'plasma', (14, 8), 'Nível Profissional'))
+        
+        st.subheader("Proporção de Pessoas Trabalhando na Área por Faixa Etária")
+        # Gráfico de barras empilhadas para status de trabalho por faixa etária.
+        exibir_figura('cruzadas_idade_trabalho', lambda: figura_barras_empilhadas(
+            tabela_cruzada(consultas, 'faixa_etaria', 'working'), False, 'viridis', (12, 8), 'Trabalhando na área?'))
+        
+        st.subheader("Proporção de Pessoas Trabalhando na Área por Etnia")
+        # Gráfico de barras empilhadas para status de trabalho por etnia.
+        exibir_figura('cruzadas_etnia_trabalho', lambda: figura_barras_empilhadas(
+            tabela_cruzada(consultas, 'etnia_padronizada', 'working'), False, 'plasma', (12, 8), 'Trabalhando na área?'))
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+"""
+Página "Perfil Demográfico" do Dashboard - TransDevs Data Analysis
+
+Distribuição da comunidade por faixa etária, etnia, acesso a computador e gênero.
+"""
+
+import streamlit as st
+import matplotlib.pyplot as plt # Biblioteca para criação de gráficos estáticos.
+import seaborn as sns # Biblioteca para visualização de dados baseada no matplotlib, com estética aprimorada.
+import matplotlib.ticker as mtick # Módulo para formatar rótulos de eixos em gráficos.
+from paginas.comum import PRIMARY_COLOR, BACKGROUND_COLOR, SECONDARY_PALETTE, carregar_consultas, contar
+from paginas.graficos import exibir_figura, clean_spines
+
+def exibir():
+    """Exibe a página."""
+    st.title("Análise do Perfil Demográfico (%)")
+    consultas = carregar_consultas() # Fonte das contagens (cubo ou backend SQL).
+    if consultas is not None:
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            st.subheader("Por Faixa Etária")
+            # Gráfico de barras horizontal para distribuição por faixa etária.
+            def desenhar_faixa_etaria():
+                fig1, ax1 = plt.subplots(figsize=(10, 6))
+                counts = contar(consultas, 'faixa_etaria', normalizar=True)
+                sns.barplot(y=counts.index, x=counts.values, order=counts.index, ax=ax1, color=PRIMARY_COLOR, orient='h', edgecolor=BACKGROUND_COLOR)
+                ax1.set_xlabel("Percentual (%)")
+                ax1.set_ylabel("Faixa Etária")
+                ax1.xaxis.set_major_formatter(mtick.PercentFormatter())
+                clean_spines(ax1)
+                for c in ax1.containers:
+                    ax1.bar_label(c, fmt=' %.1f%%')
+                return fig1
+            exibir_figura('demografico_faixa_etaria', desenhar_faixa_etaria)
+            
+            st.subheader("Por Etnia")
+            # Gráfico de barras horizontal para distribuição por etnia.
+            def desenhar_etnia():
+                fig2, ax2 = plt.subplots(figsize=(10, 6))
+                counts = contar(consultas, 'etnia_padronizada', normalizar=True)
+                sns.barplot(y=counts.index, x=counts.values, order=counts.index, ax=ax2, color=PRIMARY_COLOR, orient='h', edgecolor=BACKGROUND_COLOR)
+                ax2.set_xlabel("Percentual (%)")
+                ax2.set_ylabel("Etnia")
+                ax2.xaxis.set_major_formatter(mtick.PercentFormatter())
+                clean_spines(ax2)
+                for c in ax2.containers:
+                    ax2.bar_label(c, fmt=' %.1f%%')
+                return fig2
+            exibir_figura('demografico_etnia', desenhar_etnia)
+        
+        with col2:
+            st.subheader("Acesso a Computador")
+            # Gráfico de pizza para acesso a computador.
+            def desenhar_computador():
+                fig_comp, ax_comp = plt.subplots()
+                counts_comp = contar(consultas, 'computador_acesso')
+                ax_comp.pie(counts_comp, labels=counts_comp.index, autopct='%.1f%%', startangle=90, colors=[PRIMARY_COLOR, 'grey', '#8A2BE2'])
+                return fig_comp
+            exibir_figura('demografico_computador', desenhar_computador)
+        
+        st.subheader("Por Gênero")
+        # Gráfico de barras para distribuição por gênero.
+        def desenhar_genero():
+            fig3, ax3 = plt.subplots(figsize=(12, 6))
+            counts = contar(consultas, 'genero_padronizado', normalizar=True)
+            sns.barplot(x=counts.index, y=counts.values, order=counts.index, ax=ax3, palette=SECONDARY_PALETTE, edgecolor=BACKGROUND_COLOR)
+            ax3.set_xlabel("Gênero")
+            ax3.set_ylabel("Percentual (%)")
+            ax3.yaxis.set_major_formatter(mtick.PercentFormatter())
+            clean_spines(ax3)
+            for c in ax3.containers:
+                ax3.bar_label(c, fmt='%.1f%%')
+            plt.setp(ax3.get_xticklabels(), rotation=45, ha='right') # Rotaciona os rótulos do eixo X.
+            return fig3
+        exibir_figura('demografico_genero', desenhar_genero)
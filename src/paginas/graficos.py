@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+"""
+Gráficos Matplotlib das Páginas - TransDevs Data Analysis
+
+Estilo, cache de imagens e gráficos reaproveitados pelas páginas que
+desenham com o Matplotlib. Importado apenas por essas páginas, para que o
+Matplotlib só seja carregado quando uma delas é aberta.
+"""
+
+import io # Buffer em memória para as imagens dos gráficos.
+import streamlit as st
+import pandas as pd
+import matplotlib.pyplot as plt # Biblioteca para criação de gráficos estáticos.
+import matplotlib.ticker as mtick # Módulo para formatar rótulos de eixos em gráficos.
+from paginas.comum import BACKGROUND_COLOR, TEXT_COLOR, versao_dados
+
+# Atualiza os parâmetros de estilo padrão do Matplotlib para harmonizar com o tema do dashboard.
+plt.rcParams.update({
+    'text.color': TEXT_COLOR,
+    'axes.labelcolor': TEXT_COLOR,
+    'xtick.color': TEXT_COLOR,
+    'ytick.color': TEXT_COLOR,
+    'axes.edgecolor': TEXT_COLOR,
+    'figure.facecolor': BACKGROUND_COLOR,
+    'axes.facecolor': BACKGROUND_COLOR,
+    'savefig.facecolor': BACKGROUND_COLOR,
+})
+
+# Número máximo de imagens de gráficos guardadas no cache (cada combinação de gráfico, versão e filtros é uma entrada).
+MAX_FIGURAS_CACHE = 256
+
+@st.cache_data(show_spinner=False, max_entries=MAX_FIGURAS_CACHE) # Compartilhado entre as sessões.
+def renderizar_figura(id_grafico: str, versao: str, filtros: tuple, _desenhar) -> bytes:
+    """Desenha um gráfico Matplotlib e retorna a imagem PNG.
+
+    O resultado fica no cache indexado pelo gráfico, pela versão dos dados e
+    pelos filtros; `_desenhar` (que começa com '_') não entra na chave. A
+    figura é fechada depois de convertida, para não acumular na memória.
+
+    Args:
+        id_grafico (str): Identificador único do gráfico no dashboard.
+        versao (str): Versão dos dados (ver `versao_dados`).
+        filtros (tuple): Valores selecionados pela pessoa usuária dos quais o gráfico depende.
+        _desenhar (callable): Função sem argumentos que consulta os dados e retorna a figura.
+
+    Returns:
+        bytes: A imagem PNG do gráfico.
+    """
+    fig = _desenhar()
+    try:
+        buffer = io.BytesIO()
+        # Mesmos parâmetros usados pelo `st.pyplot`.
+        fig.savefig(buffer, format='png', dpi=200, bbox_inches='tight')
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+def exibir_figura(id_grafico: str, desenhar, *filtros):
+    """Exibe um gráfico Matplotlib, desenhando-o apenas se a imagem não estiver no cache.
+
+    Args:
+        id_grafico (str): Identificador único do gráfico no dashboard.
+        desenhar (callable): Função sem argumentos que consulta os dados e retorna a figura.
+        *filtros: Valores selecionados dos quais o gráfico depende (listas viram tuplas).
+    """
+    filtros = tuple(tuple(f) if isinstance(f, list) else f for f in filtros)
+    st.image(renderizar_figura(id_grafico, versao_dados(), filtros, desenhar), width='stretch')
+
+def rotular_barras_empilhadas(ax: plt.Axes, proporcoes: pd.DataFrame, horizontal: bool):
+    """Escreve o percentual de cada segmento (acima de 5%) no centro das barras empilhadas.
+
+    Args:
+        ax (matplotlib.axes.Axes): O gráfico de barras empilhadas.
+        proporcoes (pd.DataFrame): As proporções plotadas, uma barra por linha.
+        horizontal (bool): Se True, as barras são horizontais ('barh').
+    """
+    # Início de cada segmento: a soma dos segmentos anteriores da mesma barra, calculada de uma vez.
+    centros = proporcoes.cumsum(axis=1) - proporcoes / 2
+    for n, (valores, centro) in enumerate(zip(proporcoes.to_numpy(), centros.to_numpy())):
+        for val, meio in zip(valores, centro):
+            if val * 100 > 5: # Exibe rótulo apenas se a porcentagem for significativa.
+                x, y = (meio, n) if horizontal else (n, meio)
+                ax.text(x, y, f'{val*100:.0f}%', ha='center', va='center', color='white', fontsize=9, weight='bold')
+
+def figura_barras_empilhadas(proporcoes: pd.DataFrame, horizontal: bool, colormap: str, figsize: tuple, titulo_legenda: str) -> plt.Figure:
+    """Desenha as barras empilhadas de uma tabela cruzada normalizada, com os percentuais de cada segmento.
+
+    Args:
+        proporcoes (pd.DataFrame): As proporções (0 a 1), uma barra por linha (ver `tabela_cruzada`).
+        horizontal (bool): Se True, as barras são horizontais.
+        colormap (str): O mapa de cores dos segmentos.
+        figsize (tuple): O tamanho da figura.
+        titulo_legenda (str): O título da legenda.
+
+    Returns:
+        matplotlib.figure.Figure: A figura desenhada.
+    """
+    fig, ax = plt.subplots(figsize=figsize)
+    proporcoes.plot(kind='barh' if horizontal else 'bar', stacked=True, ax=ax, colormap=colormap)
+    # Adiciona rótulos de porcentagem dentro das barras empilhadas.
+    rotular_barras_empilhadas(ax, proporcoes, horizontal)
+    formatador = mtick.PercentFormatter(1.0)
+    if horizontal:
+        ax.set_xlabel('Proporção (%)')
+        ax.set_ylabel('')
+        ax.xaxis.set_major_formatter(formatador)
+    else:
+        ax.set_xlabel('')
+        ax.set_ylabel('Proporção (%)')
+        ax.yaxis.set_major_formatter(formatador)
+        plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+    clean_spines(ax)
+    legend = ax.legend(title=titulo_legenda, bbox_to_anchor=(1.05, 1), loc='upper left', frameon=False)
+    plt.setp(legend.get_title(), color=TEXT_COLOR)
+    return fig
+
+def clean_spines(ax: plt.Axes):
+    """Remove as molduras superior e direita de um gráfico Matplotlib e define a cor.
+
+    Args:
+        ax (matplotlib.axes.Axes): O objeto Axes do Matplotlib a ser limpo.
+    """
+    ax.spines['top'].set_visible(False) # Torna a moldura superior invisível.
+    ax.spines['right'].set_visible(False) # Torna a moldura direita invisível.
+    ax.spines['bottom'].set_color(TEXT_COLOR) # Define a cor da moldura inferior.
+    ax.spines['left'].set_color(TEXT_COLOR) # Define a cor da moldura esquerda.
+    ax.tick_params(axis='both', which='both', length=0) # Remove os ticks dos eixos.
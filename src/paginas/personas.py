@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+"""
+Página "Personas da Comunidade" do Dashboard - TransDevs Data Analysis
+
+Resumo e detalhes das personas encontradas pelo clustering. Não desenha
+gráficos e, por isso, não importa nenhuma biblioteca de gráficos.
+"""
+
+import ast # Módulo para avaliar strings contendo estruturas de dados Python de forma segura.
+import streamlit as st
+from paginas.comum import PERSONA_SUMMARY_PATH, PERSONA_DETAILS_PATH, carregar_tabela_dashboard
+
+def exibir_detalhes_persona(coluna_detalhes: str):
+    """Exibe detalhes de uma persona formatados com barras de progresso.
+
+    Espera uma lista de strings no formato "label: X.X%" (lida do Parquet) ou
+    uma string que pode ser convertida nessa lista (lida do CSV).
+
+    Args:
+        coluna_detalhes (list or str): Os detalhes da persona (ex: ["Python: 70.0%", "SQL: 20.0%"]).
+    """
+    try:
+        # Converte a string para uma lista de itens apenas quando a tabela veio do CSV.
+        items = ast.literal_eval(coluna_detalhes) if isinstance(coluna_detalhes, str) else coluna_detalhes
+        for item in items:
+            label, percent_str = item.split(': ') # Divide o item em label e string de porcentagem.
+            value = float(percent_str.replace('%', '')) # Converte a porcentagem para um float.
+            st.markdown(f"**{label}**") # Exibe o label em negrito.
+            st.progress(int(value)) # Exibe uma barra de progresso com o valor inteiro da porcentagem.
+    except (ValueError, SyntaxError):
+        st.text("Dados indisponíveis.") # Mensagem de erro se a string não puder ser avaliada.
+
+def exibir():
+    """Exibe a página."""
+    st.title("Personas da Comunidade (Análise de Cluster)")
+    df_summary = carregar_tabela_dashboard(PERSONA_SUMMARY_PATH) # Carrega o resumo das personas.
+    df_details = carregar_tabela_dashboard(PERSONA_DETAILS_PATH) # Carrega os detalhes das personas.
+    if df_summary is not None and df_details is not None:
+        st.markdown("### Resumo das Personas")
+        st.dataframe(df_summary, hide_index=True) # Exibe o DataFrame de resumo.
+        
+        st.markdown("---")
+        st.markdown("### Quem são Elas? Uma Análise Detalhada")
+        # Descrição das personas (texto pré-definido com base nos insights da análise).
+        st.subheader("Persona 1: Talentos em Transição (25-34 anos, Iniciante)")
+        st.write("Nosso maior grupo, composto por profissionais maduros (25-34 anos) que estão fazendo uma transição de carreira para a tecnologia. Embora classificados como 'Iniciantes', sua formação (muitos com ensino superior) e interesse em tecnologias como Python e Node.js sugerem uma busca por posições de desenvolvimento web back-end ou full-stack. Eles são a principal força de novos talentos qualificados no mercado.")
+        st.subheader("Persona 2: Novos Horizontes (35+ anos, Iniciante)")
+        st.write("Representando a coragem da reinvenção, esta persona inclui profissionais mais experientes (35+ anos) que estão entrando na área de tecnologia. Concentrados fora do eixo Sudeste (predominantemente no Norte), seu foco em tecnologias fundamentais como HTML, SQL e CSS indica a construção de uma nova base de carreira, possivelmente voltada para desenvolvimento web ou análise de dados.")
+        st.subheader("Persona 3: Jovens Promessas (18-24 anos, Iniciante)")
+        st.write("A nova geração de talentos da comunidade. Este grupo, mais jovem, tem um foco claro em desenvolvimento front-end (HTML, CSS, Javascript). Vindo do ensino médio ou do início da faculdade, sua principal necessidade é transformar o conhecimento teórico em experiência prática através de projetos, estágios e mentoria.")
+        st.subheader("Persona 4: Profissionais Qualificados (25-34 anos, Pleno)")
+        st.write("Este grupo representa a espinha dorsal de experiência técnica da comunidade. Embora a maioria seja de nível Pleno, há uma diversidade de senioridade, incluindo juniores e iniciantes em ascensão. Com foco em tecnologias como Python, eles provavelmente buscam consolidar suas carreiras, especializar-se ou assumir posições de maior responsabilidade, sendo um ativo valioso para empresas que buscam talentos com experiência comprovada.")
+        
+        st.markdown("---")
+        st.markdown("### Detalhes Técnicos por Persona")
+        # Itera sobre os detalhes das personas para exibi-los em expanders.
+        for index, row in df_details.iterrows():
+            persona_id = row['persona']
+            # Tenta encontrar a linha correspondente no df_summary para obter informações adicionais.
+            summary_row = df_summary[df_summary['persona'] == persona_id].iloc[0]
+            with st.expander(f"**Persona {summary_row['persona']}: {summary_row['faixa_etaria_moda']} - {summary_row['nivel_profissional_moda']}**"):
+                col1, col2, col3 = st.columns(3) # Divide o expander em três colunas para os detalhes.
+                with col1:
+                    st.markdown("**Senioridade**")
+                    exibir_detalhes_persona(row['level_distribution']) # Exibe a distribuição de senioridade.
+                with col2:
+                    st.markdown("**Escolaridade (Top 3)**")
+                    exibir_detalhes_persona(row['top_schooling']) # Exibe a top 3 escolaridade.
+                with col3:
+                    st.markdown("**Tecnologias (Top 3)**")
+                    exibir_detalhes_persona(row['top_technologies']) # Exibe a top 3 tecnologias.
+
+        st.markdown("---")
+        st.subheader("Insights Acionáveis")
+        # Sugestões de ações baseadas na análise das personas.
+        st.info("""- **Trilhas de Carreira Direcionadas:** Os focos tecnológicos claros de cada persona permitem a criação de programas específicos. **Persona 3** se beneficiaria de um 'Bootcamp de Front-End', enquanto a **Persona 1** teria mais proveito de uma 'Trilha de Desenvolvimento Back-End com Python/Node.js'.\n- **Aceleração para Profissionais Qualificados:** A **Persona 4**, com sua diversidade de senioridade, necessita de mais do que apenas networking. Oferecer 'Workshops de Arquitetura de Software' ou 'Mentorias de Liderança Técnica' pode ajudá-los a alcançar o nível Sênior e além.\n- **Inclusão Geográfica e de Habilidades Fundamentais:** A **Persona 2** (Novos Horizontes) reforça a necessidade de vagas remotas. Além disso, seu foco em SQL e web básico sugere que cursos de 'Análise de Dados com SQL e Python' poderiam ser uma porta de entrada de alto impacto para este grupo.""")
+    else:
+        st.warning("Arquivos de resumo das personas não encontrados. Execute 'analysis.py' novamente.")
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+"""
+Página "Planejamento Estratégico" do Dashboard - TransDevs Data Analysis
+
+Recorte racial por gênero e identificação de potenciais mentores/as/es.
+"""
+
+import streamlit as st
+import matplotlib.pyplot as plt # Biblioteca para criação de gráficos estáticos.
+import seaborn as sns # Biblioteca para visualização de dados baseada no matplotlib, com estética aprimorada.
+from paginas.comum import PRIMARY_COLOR, BACKGROUND_COLOR, SECONDARY_PALETTE, VOLUNTARIOS, carregar_consultas, calcular_visoes, contar, versao_dados
+from paginas.graficos import exibir_figura, clean_spines
+
+def exibir():
+    """Exibe a página."""
+    st.title("Planejamento Estratégico Baseado em Dados")
+    st.markdown("Use os dados da comunidade para tomar decisões sobre novas iniciativas, identificar talentos e entender a capacidade de nossos programas.")
+    consultas = carregar_consultas() # Fonte das contagens (cubo ou backend SQL).
+    if consultas is not None:
+        st.markdown("---")
+        st.subheader("Análise de Recorte de Diversidade")
+        # Permite selecionar um gênero para analisar a distribuição racial dentro desse grupo.
+        generos = calcular_visoes(versao_dados(), consultas)['generos']
+        genero_selecionado = st.selectbox("Selecione um Gênero para analisar o recorte racial:", generos)
+        if genero_selecionado:
+            total_no_grupo = consultas.total({'genero_padronizado': genero_selecionado})
+            st.metric(f"Total de Pessoas no Grupo '{genero_selecionado}'", total_no_grupo)
+            if total_no_grupo > 0:
+                # Gráfico de barras horizontal para distribuição por etnia no gênero selecionado.
+                def desenhar_etnia_no_genero():
+                    fig, ax = plt.subplots(figsize=(10, 6))
+                    counts = contar(consultas, 'etnia_padronizada', normalizar=True, filtros={'genero_padronizado': genero_selecionado})
+                    sns.barplot(y=counts.index, x=counts.values, order=counts.index, ax=ax, color=PRIMARY_COLOR, orient='h')
+                    ax.set_xlabel("Percentual (%)")
+                    ax.set_ylabel("Etnia")
+                    clean_spines(ax)
+                    for c in ax.containers:
+                        ax.bar_label(c, fmt=' %.1f%%')
+                    return fig
+                exibir_figura('planejamento_etnia_no_genero', desenhar_etnia_no_genero, genero_selecionado)
+        st.info("**Nota sobre 'Pessoas Ativas':** Os dados atuais refletem o total de *inscrições*. Para medir a 'atividade', seria necessário integrar dados de engajamento da plataforma de cursos.")
+        
+        st.markdown("---")
+        st.subheader("Identificação de Talentos para Mentorias")
+        # Permite filtrar por gênero para identificar potenciais mentores.
+        available_genders = generos
+        desired_defaults = ['Mulher Trans', 'Homem Trans', 'Não-Binárie', 'Travesti']
+        actual_defaults = [g for g in desired_defaults if g in available_genders] # Garante que os defaults existam.
+        generos_mentoria = st.multiselect("Filtre por Gênero para encontrar potenciais mentores/as/es:", options=available_genders, default=actual_defaults)
+        
+        if generos_mentoria:
+            # Filtra por níveis de experiência mais altos e por voluntários.
+            niveis_experientes = ['Pleno', 'Sênior', 'Especialista', 'Liderança']
+            filtros_mentoria = {'genero_padronizado': generos_mentoria, 'professional_level_padronizado': niveis_experientes, **VOLUNTARIOS}
+            total_mentores = consultas.total(filtros_mentoria)
+            st.metric("Total de Potenciais Mentores/as/es Encontrados:", total_mentores)
+            if total_mentores > 0:
+                # Gráfico de barras para a distribuição de gênero entre os potenciais mentores.
+                def desenhar_mentores():
+                    fig, ax = plt.subplots(figsize=(10, 6))
+                    counts = contar(consultas, 'genero_padronizado', filtros=filtros_mentoria)
+                    sns.barplot(x=counts.index, y=counts.values, order=counts.index, ax=ax, palette=SECONDARY_PALETTE, edgecolor=BACKGROUND_COLOR)
+                    ax.set_ylabel("Número de Pessoas")
+                    clean_spines(ax)
+                    for c in ax.containers:
+                        ax.bar_label(c)
+                    return fig
+                exibir_figura('planejamento_mentores', desenhar_mentores, generos_mentoria)
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+"""
+Página "Perfil Profissional" do Dashboard - TransDevs Data Analysis
+
+Distribuição da comunidade por nível de experiência.
+"""
+
+import streamlit as st
+import matplotlib.pyplot as plt # Biblioteca para criação de gráficos estáticos.
+import seaborn as sns # Biblioteca para visualização de dados baseada no matplotlib, com estética aprimorada.
+import matplotlib.ticker as mtick # Módulo para formatar rótulos de eixos em gráficos.
+from paginas.comum import BACKGROUND_COLOR, SECONDARY_PALETTE, carregar_consultas, contar
+from paginas.graficos import exibir_figura, clean_spines
+
+def exibir():
+    """Exibe a página."""
+    st.title("Análise do Perfil Profissional (%)")
+    consultas = carregar_consultas() # Fonte das contagens (cubo ou backend SQL).
+    if consultas is not None:
+        st.subheader("Distribuição por Nível de Experiência")
+        # Gráfico de barras horizontal para distribuição por nível profissional.
+        def desenhar_nivel():
+            fig, ax = plt.subplots(figsize=(12, 8))
+            counts = contar(consultas, 'professional_level_padronizado', normalizar=True).sort_index()
+            sns.barplot(y=counts.index, x=counts.values, order=counts.index, ax=ax, palette=SECONDARY_PALETTE, orient='h', edgecolor=BACKGROUND_COLOR)
+            ax.set_xlabel("Percentual (%)")
+            ax.set_ylabel("Nível Profissional")
+            ax.xaxis.set_major_formatter(mtick.PercentFormatter())
+            clean_spines(ax)
+            for c in ax.containers:
+                ax.bar_label(c, fmt=' %.1f%%')
+            return fig
+        exibir_figura('profissional_nivel', desenhar_nivel)
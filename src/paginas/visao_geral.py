@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+"""
+Página "Visão Geral" do Dashboard - TransDevs Data Analysis
+
+Indicadores chave, perfil da comunidade, distribuição por região e o
+mapa de concentração por estado. Única página que usa o Plotly.
+"""
+
+import streamlit as st
+import matplotlib.pyplot as plt # Biblioteca para criação de gráficos estáticos.
+import seaborn as sns # Biblioteca para visualização de dados baseada no matplotlib, com estética aprimorada.
+import matplotlib.ticker as mtick # Módulo para formatar rótulos de eixos em gráficos.
+import plotly.express as px # Biblioteca para criar gráficos interativos.
+from paginas.comum import (MAP_SUMMARY_PATH, PRIMARY_COLOR, BACKGROUND_COLOR, TEXT_COLOR, carregar_consultas,
+                           carregar_tabela_dashboard, calcular_visoes, contar, versao_dados)
+from paginas.graficos import exibir_figura, clean_spines
+
+@st.cache_data(show_spinner=False)
+def especificacao_mapa(versao: str) -> dict | None:
+    """Monta o mapa de bolhas dos estados e retorna a sua especificação Plotly.
+
+    Args:
+        versao (str): Versão dos dados (ver `versao_dados`); só entra na chave do cache.
+
+    Returns:
+        dict or None: A figura como dicionário, ou None se o resumo do mapa não existir.
+    """
+    df_mapa = carregar_tabela_dashboard(MAP_SUMMARY_PATH) # Carrega os dados de resumo do mapa.
+    if df_mapa is None:
+        return None
+    # Cria um mapa de dispersão interativo usando Plotly Express.
+    fig_map = px.scatter_map(df_mapa, lat="latitude", lon="longitude", size="size_sqrt", 
+                             color_discrete_sequence=[PRIMARY_COLOR], hover_name="estado_padronizado", 
+                             hover_data={"n_de_pessoas": True, "latitude": False, "longitude": False, "size_sqrt": False}, 
+                             map_style="carto-darkmatter", center={"lat": -14.2350, "lon": -51.9253}, zoom=3.5, 
+                             labels={'n_de_pessoas':'Nº de Pessoas'})
+    fig_map.update_layout(margin={"r":0,"t":0,"l":0,"b":0}) # Ajusta as margens do mapa.
+    return fig_map.to_dict()
+
+def exibir():
+    """Exibe a página."""
+    st.title("Visão Geral do Impacto da TransDevs")
+    consultas = carregar_consultas() # Fonte das contagens (cubo ou backend SQL).
+    
+    if consultas is not None:
+        visoes = calcular_visoes(versao_dados(), consultas) # Indicadores compartilhados entre as páginas.
+        col1, col2 = st.columns([2, 1]) # Divide a página em duas colunas.
+        with col1:
+            st.markdown("### Indicadores Chave")
+            kpi1, kpi2, kpi3 = st.columns(3) # Divide a coluna 1 em três KPIs.
+            
+            # KPI: Total de pessoas únicas analisadas.
+            total_pessoas = visoes['total_pessoas']
+            kpi1.metric("Pessoas Únicas Analisadas", f"{total_pessoas}")
+            
+            # KPI: Estados brasileiros alcançados.
+            # Filtra por estados brasileiros, excluindo 'Internacional' e 'Inválido'.
+            estados_alcancados = len(visoes['estados_brasileiros'])
+            kpi2.metric("Estados Brasileiros Alcançados", f"{estados_alcancados}")
+            
+            # KPI: Taxa de empregabilidade na área.
+            # Conta as pessoas que responderam 'sim' ou 'empregade' para 'working'.
+            working = consultas.fatiar(['working'])
+            trabalhando_count = working[working.index.astype(str).str.lower().str.contains('sim|empregade')].sum()
+            taxa_empregabilidade = (trabalhando_count / total_pessoas) * 100 if total_pessoas > 0 else 0
+            kpi3.metric("Taxa de Empregabilidade na Área", f"{taxa_empregabilidade:.1f}%")
+        
+        with col2:
+            st.markdown("### Perfil da Comunidade")
+            # Exibe um gráfico de pizza da distribuição de alunos vs. comunidade geral.
+            if consultas.tem_dimensoes('perfil_aluno'):
+                def desenhar_perfil_aluno():
+                    fig_pie, ax_pie = plt.subplots(figsize=(5, 3))
+                    counts_pie = contar(consultas, 'perfil_aluno')
+                    ax_pie.pie(counts_pie, labels=counts_pie.index, autopct='%.1f%%', startangle=90, colors=[PRIMARY_COLOR, 'grey'])
+                    return fig_pie
+                exibir_figura('visao_geral_perfil_aluno', desenhar_perfil_aluno)
+        
+        def desenhar_regioes():
+            # Gráfico de barras mostrando a proporção de pessoas por região do Brasil.
+            fig, ax = plt.subplots(figsize=(12, 7))
+            counts = contar(consultas, 'regiao', normalizar=True)
+            sns.barplot(x=counts.index, y=counts.values, order=counts.index, ax=ax, color=PRIMARY_COLOR, edgecolor=BACKGROUND_COLOR)
+            ax.set_title("Proporção de Pessoas por Região do Brasil", fontsize=18)
+            ax.set_xlabel("Região")
+            ax.set_ylabel("Percentual (%)")
+            ax.yaxis.set_major_formatter(mtick.PercentFormatter()) # Formata os rótulos do eixo Y como porcentagem.
+            clean_spines(ax) # Limpa as molduras do gráfico.
+            for container in ax.containers:
+                ax.bar_label(container, fmt='%.1f%%', color=TEXT_COLOR, fontsize=10) # Adiciona rótulos de porcentagem nas barras.
+            return fig
+
+        st.markdown("---")
+        st.subheader("Distribuição da Comunidade por Região (%)")
+        exibir_figura('visao_geral_regioes', desenhar_regioes)
+        
+        st.markdown("---")
+        st.subheader("Mapa de Concentração da Comunidade por Estado")
+        st.info("O mapa abaixo exibe a distribuição da comunidade pelos estados brasileiros. O **tamanho da bolha** é proporcional ao **número de pessoas** em cada estado. Passe o mouse sobre uma bolha para ver os detalhes.")
+        spec_mapa = especificacao_mapa(versao_dados()) # Especificação do mapa, guardada em cache por versão dos dados.
+        if spec_mapa is not None:
+            st.plotly_chart(spec_mapa, use_container_width=True) # Exibe o mapa.
+        else:
+            st.warning("Arquivo de resumo do mapa não encontrado. Execute 'analysis.py' atualizado.")
+
+        # Re-exibe a distribuição por região, parece ser uma duplicação. Mantido conforme o original
+        # (a segunda exibição reaproveita a imagem do cache).
+        st.markdown("---")
+        st.subheader("Distribuição da Comunidade por Região (%)")
+        exibir_figura('visao_geral_regioes', desenhar_regioes)
+    else:
+        st.error("Arquivo de dados principal não encontrado. Execute o script 'analysis.py' e atualize o repositório.")
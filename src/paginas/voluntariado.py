@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+"""
+Página "Análise de Voluntariado" do Dashboard - TransDevs Data Analysis
+
+Taxa de voluntariado, áreas de atuação, nível profissional de quem
+voluntaria e o perfil das personas voluntárias.
+"""
+
+import streamlit as st
+import pandas as pd
+import matplotlib.pyplot as plt # Biblioteca para criação de gráficos estáticos.
+import seaborn as sns # Biblioteca para visualização de dados baseada no matplotlib, com estética aprimorada.
+import matplotlib.ticker as mtick # Módulo para formatar rótulos de eixos em gráficos.
+from paginas.comum import (ATUACAO_COUNT_PATH, PRIMARY_COLOR, BACKGROUND_COLOR, TEXT_COLOR, VOLUNTARIOS, carregar_consultas,
+                           carregar_tabela_dashboard, calcular_visoes, tabela_cruzada, moda_por, versao_dados)
+from paginas.graficos import exibir_figura, clean_spines
+
+def exibir():
+    """Exibe a página."""
+    st.title("Análise do Perfil de Voluntariado")
+    consultas = carregar_consultas() # Fonte das contagens (cubo ou backend SQL).
+    if consultas is not None and consultas.tem_dimensoes('is_volunteer'):
+        # Calcula e exibe a taxa de voluntariado na comunidade.
+        visoes = calcular_visoes(versao_dados(), consultas)
+        voluntario_count = visoes['total_voluntarios']
+        total_pessoas = visoes['total_pessoas']
+        taxa_voluntariado = (voluntario_count / total_pessoas) * 100
+        st.metric("Taxa de Voluntariado na Comunidade", f"{taxa_voluntariado:.1f}%")
+        st.markdown("---")
+        
+        st.subheader("Quem são as Pessoas Interessadas no Voluntariado?")
+        st.write("A análise das pessoas que se inscreveram para o voluntariado revela um perfil de **protagonismo e engajamento da base**. Longe de ser um grupo dominado pela senioridade, o interesse em voluntariar é majoritariamente expressado por profissionais em **nível Iniciante**. Isso demonstra uma incrível cultura de 'construir a comunidade que queremos', onde as pessoas que estão começando a carreira são as mais motivadas a doar seu tempo. A diversidade de personas interessadas, com destaque para **'Talentos em Transição' (Persona 1)** e **'Profissionais Qualificados' (Persona 4)**, mostra que o desejo de contribuir permeia todos os níveis de experiência.")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.subheader("Frequência de Áreas de Atuação")
+            df_atuacao = carregar_tabela_dashboard(ATUACAO_COUNT_PATH) # Carrega os dados de contagem de atuação.
+            if df_atuacao is not None:
+                # Gráfico de barras horizontal para as 10 principais áreas de atuação.
+                def desenhar_atuacao():
+                    fig, ax = plt.subplots(figsize=(10, 6))
+                    sns.barplot(y='atuacao', x='count', data=df_atuacao.nlargest(10, 'count'), ax=ax, color=PRIMARY_COLOR, orient='h', edgecolor=BACKGROUND_COLOR)
+                    ax.set_xlabel("Nº de Menções")
+                    ax.set_ylabel("Área de Atuação (Tags)")
+                    clean_spines(ax)
+                    return fig
+                exibir_figura('voluntariado_atuacao', desenhar_atuacao)
+        with col2:
+            st.subheader("Nível Profissional: Comparativo")
+            # Gráfico de barras empilhadas horizontal comparando o nível profissional de voluntários e não-voluntários.
+            def desenhar_nivel_voluntariado():
+                fig2, ax2 = plt.subplots(figsize=(10, 6))
+                crosstab_vol_level = tabela_cruzada(consultas, 'professional_level_padronizado', 'is_volunteer', normalizar='columns').mul(100)
+                crosstab_vol_level.plot(kind='barh', ax=ax2, color=['grey', PRIMARY_COLOR])
+                ax2.set_xlabel("Percentual (%)")
+                ax2.set_ylabel("")
+                ax2.xaxis.set_major_formatter(mtick.PercentFormatter())
+                clean_spines(ax2)
+                legend = ax2.legend(title='Grupo', frameon=False)
+                plt.setp(legend.get_title(), color=TEXT_COLOR)
+                return fig2
+            exibir_figura('voluntariado_nivel', desenhar_nivel_voluntariado)
+        
+        st.markdown("---")
+        st.subheader("Perfil Detalhado das Personas Voluntárias")
+        if consultas.tem_dimensoes('persona'):
+            # Conta os voluntários com personas atribuídas.
+            n_por_persona = consultas.fatiar(['persona'], VOLUNTARIOS)
+            if not n_por_persona.empty:
+                # Resume as características das personas voluntárias pelo valor mais frequente de cada dimensão.
+                vol_persona_summary = pd.DataFrame({
+                    'n_de_pessoas': n_por_persona,
+                    'regiao_moda': moda_por(consultas, 'persona', 'regiao', VOLUNTARIOS),
+                    'nivel_profissional_moda': moda_por(consultas, 'persona', 'professional_level_padronizado', VOLUNTARIOS),
+                    'atuacao_principal_moda': moda_por(consultas, 'persona', 'atuacao_principal', VOLUNTARIOS),
+                }).fillna('N/A').rename_axis('persona').reset_index()
+                st.dataframe(vol_persona_summary, hide_index=True)
+
+                st.markdown("---")
+                st.markdown("### Quem são Elas? Uma Análise das Personas Voluntárias")
+                # Descrições detalhadas das personas voluntárias.
+                st.subheader("Persona 1 (Talentos em Transição): O Desejo de Crescer Junto")
+                st.write("Sendo o maior grupo entre os interessados, estas pessoas veem o voluntariado não apenas como uma forma de ajudar, mas também como uma oportunidade de ganhar experiência prática e construir portfólio. Sua principal área de interesse é **Tecnologia**, indicando um forte desejo de aplicar seus novos conhecimentos em projetos reais da comunidade.")
+                st.subheader("Persona 2 (Novos Horizontes): Compartilhando a Experiência de Vida")
+                st.write("Representando a maturidade e a coragem da reinvenção, o interesse deste grupo no voluntariado é particularmente inspirador. Vindos majoritariamente da região Norte e focados na área de **Tecnologia**, eles buscam aplicar suas novas habilidades e, ao mesmo tempo, compartilhar a vasta experiência profissional e de vida que acumularam em outras carreiras. Sua participação enriquece a comunidade com diversidade de pensamento e resiliência.")
+                st.subheader("Persona 3 (Jovens Promessas): Energia e Novas Ideias")
+                st.write("Este grupo traz a energia da nova geração. Seu interesse se concentra em **Engajamento**, sugerindo um desejo de atuar na linha de frente da comunidade, organizando eventos, gerenciando redes sociais e garantindo que o ambiente seja acolhedor e vibrante. Eles são a voz e o coração da comunidade.")
+                st.subheader("Persona 4 (Profissionais Qualificados): A Vontade de Retribuir")
+                st.write("Este grupo, composto por profissionais mais experientes, demonstra o clássico desejo de 'retribuir'. Eles são a espinha dorsal técnica do voluntariado, também focando na área de **Tecnologia**. Sua presença é vital para a mentoria de pessoas mais novas e para a viabilidade de projetos mais complexos.")
+            else:
+                st.info("Ainda não há dados suficientes para cruzar personas e voluntariado.")
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+"""
+Armazém de Tags - TransDevs Data Analysis
+
+Os campos multivalorados dos arquivos brutos ('professional_technologies',
+'professional_tools' e 'atuacao') chegam como listas em texto, no formato
+'["python","sql"]'. Este módulo separa cada texto distinto em tags uma única
+vez e monta, para cada campo, uma matriz esparsa linha × tag (uma linha por
+linha do consolidado, identificada pelo `person_id`) sobre um vocabulário de
+tags compartilhado entre os campos. As contagens dos relatórios (tags de
+atuação, tecnologias por persona) são somas de colunas dessas matrizes, e o
+armazém é gravado em disco ao lado do consolidado.
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Campos multivalorados guardados no armazém.
+CAMPOS_TAGS = ('professional_technologies', 'professional_tools', 'atuacao')
+
+# Arquivo com o vocabulário e os campos do armazém gravado.
+ARQUIVO_VOCABULARIO = 'vocabulario.json'
+
+
+def _como_categorias(textos: pd.Series) -> pd.Series:
+    """Retorna a coluna como categórica, para que cada texto distinto seja tratado uma única vez."""
+    return textos if isinstance(textos.dtype, pd.CategoricalDtype) else textos.astype('category')
+
+
+def separar_tags(textos: pd.Series) -> pd.DataFrame:
+    """Separa cada texto distinto da coluna em tags.
+
+    Colchetes e aspas são removidos, o texto é separado nas vírgulas e cada
+    tag vai para minúsculas e sem espaços nas pontas (uma lista vazia, '[]',
+    resulta na tag vazia).
+
+    Args:
+        textos (pd.Series): Coluna com listas em texto.
+
+    Returns:
+        pd.DataFrame: Uma linha por tag de cada texto distinto, com 'codigo'
+                      (o código categórico do texto), 'tag' e 'posicao' (a
+                      posição da tag na lista).
+    """
+    categorias = pd.Series(_como_categorias(textos).cat.categories, dtype=object)
+    tags = categorias.str.lower().str.replace(r'\[|\]|"', '', regex=True).str.split(',').explode().str.strip()
+    return pd.DataFrame({'codigo': tags.index.to_numpy(), 'tag': tags.to_numpy(dtype=object),
+                         'posicao': tags.groupby(level=0).cumcount().to_numpy()})
+
+
+def primeira_tag(textos: pd.Series, padrao: str = 'Não informado') -> pd.Series:
+    """Retorna a primeira tag de cada linha, ou `padrao` para linhas sem texto."""
+    textos = _como_categorias(textos)
+    primeiras = separar_tags(textos).drop_duplicates('codigo').set_index('codigo')['tag']
+    codigos = textos.cat.codes.to_numpy()
+    valores = np.where(codigos >= 0, primeiras.reindex(np.maximum(codigos, 0)).to_numpy(), padrao)
+    return pd.Series(valores, index=textos.index, dtype=object)
+
+
+class ArmazemTags:
+    """Matrizes esparsas linha × tag dos campos multivalorados, com vocabulário compartilhado.
+
+    Args:
+        person_id (np.ndarray): `person_id` de cada linha das matrizes.
+        vocabulario (pd.Index): Tags de todos os campos, em ordem alfabética.
+        matrizes (dict): Matriz CSR (linhas × tags) de cada campo, com o número
+                         de ocorrências de cada tag na linha.
+    """
+
+    def __init__(self, person_id: np.ndarray, vocabulario: pd.Index, matrizes: dict):
+        self.person_id = person_id
+        self.vocabulario = vocabulario
+        self.matrizes = matrizes
+
+    @classmethod
+    def de_tabela(cls, df: pd.DataFrame, campos: tuple = CAMPOS_TAGS) -> 'ArmazemTags':
+        """Monta o armazém a partir dos campos presentes na tabela.
+
+        Cada texto distinto vira uma linha de uma matriz texto × tag; a matriz
+        de cada campo é essa matriz indexada pelo código categórico de cada linha.
+        """
+        campos = [campo for campo in campos if campo in df.columns]
+        textos = {campo: _como_categorias(df[campo]) for campo in campos}
+        tags = {campo: separar_tags(textos[campo]) for campo in campos}
+        vocabulario = pd.Index(sorted(set().union(*(t['tag'] for t in tags.values()))), dtype=object)
+
+        matrizes = {}
+        for campo in campos:
+            codigos = textos[campo].cat.codes.to_numpy()
+            n_textos = len(textos[campo].cat.categories)
+            # A última linha, vazia, é a das linhas sem texto (código -1).
+            por_texto = sparse.csr_matrix((np.ones(len(tags[campo]), dtype=np.int32),
+                                           (tags[campo]['codigo'].to_numpy(), vocabulario.get_indexer(tags[campo]['tag']))),
+                                          shape=(n_textos + 1, len(vocabulario)))
+            matrizes[campo] = por_texto[np.where(codigos >= 0, codigos, n_textos)]
+        return cls(df['person_id'].to_numpy() if 'person_id' in df.columns else np.arange(len(df)), vocabulario, matrizes)
+
+    def somar(self, campo: str, linhas: np.ndarray | None = None) -> pd.Series:
+        """Conta as ocorrências de cada tag do campo (soma das colunas da matriz).
+
+        Args:
+            campo (str): O campo multivalorado.
+            linhas (np.ndarray, optional): Máscara booleana das linhas somadas (padrão: todas).
+
+        Returns:
+            pd.Series: Contagem de cada tag presente, em ordem decrescente
+                       (empates em ordem alfabética).
+        """
+        matriz = self.matrizes[campo]
+        if linhas is not None:
+            matriz = matriz[np.flatnonzero(linhas)]
+        contagem = pd.Series(np.asarray(matriz.sum(axis=0)).ravel(), index=self.vocabulario.rename(campo), name='count')
+        return contagem[contagem > 0].sort_values(ascending=False, kind='stable')
+
+    def somar_por_grupo(self, campo: str, grupos: pd.Series) -> pd.DataFrame:
+        """Conta as ocorrências de cada tag do campo em cada grupo de linhas.
+
+        Args:
+            campo (str): O campo multivalorado.
+            grupos (pd.Series): Grupo de cada linha (ex: 'persona'); linhas com NaN são ignoradas.
+
+        Returns:
+            pd.DataFrame: Uma linha por grupo (em ordem) e uma coluna por tag do vocabulário.
+        """
+        codigos, ids = pd.factorize(grupos, sort=True)
+        validas = np.flatnonzero(codigos >= 0)
+        indicadora = sparse.csr_matrix((np.ones(len(validas), dtype=np.int32), (codigos[validas], validas)),
+                                       shape=(len(ids), len(codigos)))
+        contagens = (indicadora @ self.matrizes[campo]).toarray()
+        return pd.DataFrame(contagens, index=ids, columns=self.vocabulario)
+
+    def salvar(self, diretorio: str):
+        """Grava as matrizes (.npz), o vocabulário e o `person_id` de cada linha."""
+        os.makedirs(diretorio, exist_ok=True)
+        for campo, matriz in self.matrizes.items():
+            sparse.save_npz(os.path.join(diretorio, f'{campo}.npz'), matriz)
+        np.save(os.path.join(diretorio, 'person_id.npy'), self.person_id)
+        with open(os.path.join(diretorio, ARQUIVO_VOCABULARIO), 'w', encoding='utf-8') as f:
+            json.dump({'campos': list(self.matrizes), 'vocabulario': self.vocabulario.tolist()}, f, ensure_ascii=False)
+
+    @classmethod
+    def carregar(cls, diretorio: str) -> 'ArmazemTags | None':
+        """Carrega um armazém gravado por `salvar`, ou None se ele não existir."""
+        caminho = os.path.join(diretorio, ARQUIVO_VOCABULARIO)
+        if not os.path.exists(caminho):
+            return None
+        with open(caminho, encoding='utf-8') as f:
+            meta = json.load(f)
+        matrizes = {campo: sparse.load_npz(os.path.join(diretorio, f'{campo}.npz')).tocsr() for campo in meta['campos']}
+        return cls(np.load(os.path.join(diretorio, 'person_id.npy')), pd.Index(meta['vocabulario'], dtype=object), matrizes)
+
+
+def arquivos_armazem(diretorio: str, campos: tuple = CAMPOS_TAGS) -> list:
+    """Lista os arquivos gravados por `ArmazemTags.salvar` (campos ausentes da tabela não são gravados)."""
+    nomes = [ARQUIVO_VOCABULARIO, 'person_id.npy'] + [f'{campo}.npz' for campo in campos]
+    return [os.path.join(diretorio, nome) for nome in nomes]